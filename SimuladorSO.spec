@@ -1,5 +1,10 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Build em pasta (onedir): o executável de arquivo único extrai todas as bibliotecas para uma pasta temporária a cada
+# abertura, antes do menu aparecer. Na pasta, as bibliotecas já estão no disco, sem compressão UPX para descompactar.
+# As ferramentas de linha de comando que a interface não usa (varredura, monte_carlo...) e o NumPy não entram.
+# Medir a partida: python benchmark.py --importacao --sem-arquivos --tamanhos (fora do pacote).
+
 
 a = Analysis(
     ['main.py'],
@@ -10,7 +15,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['numpy', 'solucao_vetorial', 'varredura', 'monte_carlo', 'multinucleo', 'benchmark', 'gerador_carga', 'tabela_texto'],
     noarchive=False,
     optimize=0,
 )
@@ -19,16 +24,13 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='SimuladorSO',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +38,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='SimuladorSO',
+)
@@ -0,0 +1,340 @@
+# Benchmark do motor de simulação
+#
+# Mede, para cada algoritmo de Escalonador.algoritmos_disponiveis e cada carga (arquivos de teste do
+# repositório e cargas sintéticas de gerador_carga com 10^3 a 10^6 tarefas):
+# - tempo total e ticks por segundo, no modo orientado a eventos (run_to_completion) e tick a tick (executar_tick)
+# - pico de memória: RSS do processo e pico do tracemalloc (medido numa execução à parte, pois o tracemalloc
+#   deixa o motor bem mais lento)
+# - custo do histórico por tick: deepcopy do sistema inteiro (abordagem antiga) x quadros-chave de HistoricoSimulacao
+# - com --importacao: tempo de importação do motor, do lote e da interface e o tempo até o menu aparecer, cada um num
+#   interpretador novo; aponta também se o motor carregou algum módulo de interface (customtkinter, tkinter, PIL)
+#
+# Cada medição roda num processo novo, para que o pico de RSS de uma não contamine a outra.
+# Os resultados podem ser salvos em JSON e usados como referência (baseline) nas execuções seguintes,
+# que apontam as regressões acima da tolerância.
+#
+# Uso:
+#   python benchmark.py --saida baseline.json
+#   python benchmark.py --baseline baseline.json --tolerancia 0.3
+#   python benchmark.py --tamanhos 1000 1000000 --algoritmos rr srtf --modos eventos
+#   python benchmark.py --importacao --sem-arquivos --tamanhos
+
+import argparse
+import copy
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+try:
+    import resource  # Só existe em sistemas Unix
+except ImportError:
+    resource = None
+
+import registro
+from escalonador import Escalonador
+from gerador_carga import ParametrosCarga, escrever_carga
+from historico import HistoricoSimulacao
+from sistema_operacional import SistemaOperacional
+
+VERSAO_BASELINE = 1
+MODOS = ("eventos", "tick")
+PADRAO_ARQUIVOS = ("caso-teste-*.txt", "config_livro_*.txt")
+
+# Medição de importação: alvo -> código executado num interpretador novo (o tempo vai do início ao fim do código)
+ALVOS_IMPORTACAO = {
+    "motor": "import sistema_operacional",
+    "lote": "import lote",
+    "interface": "import main",
+    "menu": "import main; app = main.App(); app.update(); app.destroy()",
+}
+MODULOS_INTERFACE = ("customtkinter", "tkinter", "PIL")
+
+# Carga sintética: utilização da CPU perto de 80%, com I/O e alguma disputa por mutex
+PARAMETROS_SINTETICOS = ParametrosCarga(
+    taxa_chegada=0.15, densidade_io=0.05, n_mutexes=4, fracao_mutex=0.2, contencao="concentrada"
+)
+
+
+def _linhas_com_algoritmo(caminho: str, algoritmo: str):
+    """Linhas do arquivo com o algoritmo do cabeçalho trocado (quantum e alpha do arquivo são mantidos)."""
+    with open(caminho) as arquivo:
+        cabecalho = arquivo.readline().split(";")
+        cabecalho[0] = algoritmo
+        yield ";".join(cabecalho)
+        yield from arquivo
+
+
+def _criar_sistema(caminho: str, algoritmo: str, sob_demanda: bool) -> SistemaOperacional:
+    if sob_demanda:
+        return SistemaOperacional(_linhas_com_algoritmo(caminho, algoritmo), sob_demanda=True, ao_finalizar=lambda tarefa: None, semente=0)
+    return SistemaOperacional(_linhas_com_algoritmo(caminho, algoritmo), semente=0)  # Mesmos sorteios em todas as medições
+
+
+def _pico_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024  # bytes no macOS, KB no Linux
+
+
+def _medir_execucao(caminho: str, algoritmo: str, modo: str, sob_demanda: bool, com_tracemalloc: bool) -> dict:
+    """Executa a simulação até o fim (num processo novo) e mede tempo e memória."""
+    registro.desligar()
+    if com_tracemalloc:
+        tracemalloc.start()
+
+    inicio = time.perf_counter()
+    so = _criar_sistema(caminho, algoritmo, sob_demanda)
+    if modo == "eventos":
+        so.run_to_completion()
+    else:
+        while not so.simulacao_terminada():
+            so.executar_tick()
+    segundos = time.perf_counter() - inicio
+
+    resultado = {"ticks": so.relogio, "segundos": segundos, "pico_rss_mb": _pico_rss_mb()}
+    if com_tracemalloc:
+        resultado["pico_tracemalloc_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return resultado
+
+
+def _medir_historico(caminho: str, algoritmo: str, max_ticks: int) -> dict:
+    """
+    Custo médio por tick (ms) nos primeiros max_ticks ticks: do tick em si, de um deepcopy do sistema
+    antes de cada tick (como o histórico antigo fazia) e dos quadros-chave de HistoricoSimulacao.
+    """
+    registro.desligar()
+
+    # 1. Só os ticks
+    so = _criar_sistema(caminho, algoritmo, sob_demanda=False)
+    ticks = 0
+    inicio = time.perf_counter()
+    while ticks < max_ticks and not so.simulacao_terminada():
+        so.executar_tick()
+        ticks += 1
+    tempo_tick = time.perf_counter() - inicio
+
+    # 2. deepcopy antes de cada tick (só o tempo: guardar as cópias esgotaria a memória nas cargas maiores)
+    so = _criar_sistema(caminho, algoritmo, sob_demanda=False)
+    tempo_deepcopy = 0.0
+    for _ in range(ticks):
+        inicio = time.perf_counter()
+        copy.deepcopy(so)
+        tempo_deepcopy += time.perf_counter() - inicio
+        so.executar_tick()
+
+    # 3. Quadros-chave: só o que o histórico acrescenta ao tick
+    so = _criar_sistema(caminho, algoritmo, sob_demanda=False)
+    inicio = time.perf_counter()
+    historico = HistoricoSimulacao(so)
+    for _ in range(ticks):
+        historico.avancar()
+    tempo_historico = time.perf_counter() - inicio - tempo_tick
+
+    ticks = max(ticks, 1)
+    return {
+        "ticks": ticks,
+        "tick_ms": tempo_tick * 1000 / ticks,
+        "deepcopy_ms_por_tick": tempo_deepcopy * 1000 / ticks,
+        "quadros_ms_por_tick": max(tempo_historico, 0.0) * 1000 / ticks,
+        "quadros_mb": historico.bytes_usados / (1024 * 1024),
+    }
+
+
+def _em_processo_novo(funcao, *args):
+    """Roda funcao(*args) num processo recém-criado e retorna o resultado."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(funcao, *args).result()
+
+
+def _contar_tarefas(caminho: str) -> int:
+    with open(caminho) as arquivo:
+        return sum(1 for linha in arquivo if linha.strip()) - 1
+
+
+def _medir_importacao(alvo: str, pasta: str) -> dict:
+    """
+    Executa o código do alvo num interpretador novo: segundos = tempo do código dentro do processo,
+    processo_segundos = tempo total do processo (inclui a partida do interpretador).
+    """
+    codigo = (f"import sys, time; inicio = time.perf_counter(); {ALVOS_IMPORTACAO[alvo]}; "
+              f"print(time.perf_counter() - inicio, any(modulo in sys.modules for modulo in {MODULOS_INTERFACE!r}))")
+    inicio = time.perf_counter()
+    processo = subprocess.run([sys.executable, "-c", codigo], cwd=pasta, capture_output=True, text=True, timeout=120)
+    processo_segundos = time.perf_counter() - inicio
+    if processo.returncode != 0:
+        linhas = processo.stderr.strip().splitlines()
+        return {"erro": linhas[-1] if linhas else f"código de saída {processo.returncode}"}
+    segundos, carrega_interface = processo.stdout.split()[-2:]
+    return {"segundos": float(segundos), "processo_segundos": processo_segundos, "carrega_interface": carrega_interface == "True"}
+
+
+def medir_importacao(repeticoes: int = 1, saida=sys.stderr) -> list[dict]:
+    """Tempo de importação (e até o menu aparecer) de cada alvo de ALVOS_IMPORTACAO; vale a melhor de `repeticoes` medições."""
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    resultados = []
+    for alvo in ALVOS_IMPORTACAO:
+        medidas = [_medir_importacao(alvo, pasta) for _ in range(repeticoes)]
+        resultado = {"carga": "importacao", "tarefas": 0, "algoritmo": alvo, "modo": "importacao"}
+        if any("erro" in medida for medida in medidas):
+            resultado["erro"] = next(medida["erro"] for medida in medidas if "erro" in medida)
+            print(f"{'importacao':>24} {alvo:>9}: erro ({resultado['erro']})", file=saida)
+        else:
+            resultado.update(min(medidas, key=lambda medida: medida["segundos"]))
+            print(f"{'importacao':>24} {alvo:>9}: {resultado['segundos'] * 1000:8.1f} ms "
+                  f"(processo {resultado['processo_segundos'] * 1000:.1f} ms)"
+                  f"{', carrega módulos de interface' if resultado['carrega_interface'] else ''}", file=saida)
+        resultados.append(resultado)
+    return resultados
+
+
+def executar_benchmark(cargas: list[tuple[str, str]], algoritmos, modos, repeticoes: int = 1, sob_demanda: bool = False,
+                       limite_tarefas_historico: int = 1000, ticks_historico: int = 100, saida=sys.stderr) -> list[dict]:
+    """
+    Mede cada (carga, algoritmo, modo). cargas: lista de (nome, caminho do arquivo).
+    O tempo é o melhor de `repeticoes` execuções; o histórico só é medido nas cargas com até limite_tarefas_historico tarefas.
+    """
+    resultados = []
+    for nome, caminho in cargas:
+        n_tarefas = _contar_tarefas(caminho)
+        for algoritmo in algoritmos:
+            for modo in modos:
+                execucoes = [
+                    _em_processo_novo(_medir_execucao, caminho, algoritmo, modo, sob_demanda, False)
+                    for _ in range(repeticoes)
+                ]
+                melhor = min(execucoes, key=lambda execucao: execucao["segundos"])
+                memoria = _em_processo_novo(_medir_execucao, caminho, algoritmo, modo, sob_demanda, True)
+                resultado = {
+                    "carga": nome, "tarefas": n_tarefas, "algoritmo": algoritmo, "modo": modo,
+                    "ticks": melhor["ticks"], "segundos": melhor["segundos"],
+                    "ticks_por_segundo": melhor["ticks"] / melhor["segundos"] if melhor["segundos"] > 0 else None,
+                    "pico_rss_mb": max((execucao["pico_rss_mb"] or 0) for execucao in execucoes) or None,
+                    "pico_tracemalloc_mb": memoria["pico_tracemalloc_mb"],
+                }
+                resultados.append(resultado)
+                print(f"{nome:>24} {algoritmo:>9} {modo:>8}: {resultado['ticks']:>9} ticks em {resultado['segundos']:8.3f} s "
+                      f"({resultado['ticks_por_segundo'] or 0:>11,.0f} ticks/s), tracemalloc {resultado['pico_tracemalloc_mb']:8.1f} MB",
+                      file=saida)
+
+            if n_tarefas <= limite_tarefas_historico:
+                medida = _em_processo_novo(_medir_historico, caminho, algoritmo, ticks_historico)
+                resultados.append({"carga": nome, "tarefas": n_tarefas, "algoritmo": algoritmo, "modo": "historico", **medida})
+                print(f"{nome:>24} {algoritmo:>9} historico: tick {medida['tick_ms']:.4f} ms, deepcopy {medida['deepcopy_ms_por_tick']:.4f} ms, "
+                      f"quadros-chave {medida['quadros_ms_por_tick']:.4f} ms por tick", file=saida)
+    return resultados
+
+
+# Métricas comparadas com a baseline: (campo, True se maior é melhor)
+METRICAS_COMPARADAS = {
+    "eventos": (("ticks_por_segundo", True), ("pico_tracemalloc_mb", False)),
+    "tick": (("ticks_por_segundo", True), ("pico_tracemalloc_mb", False)),
+    "historico": (("quadros_ms_por_tick", False),),
+    "importacao": (("segundos", False),),
+}
+
+
+def comparar_com_baseline(resultados: list[dict], baseline: dict, tolerancia: float) -> list[str]:
+    """Regressões em relação à baseline: métricas que pioraram mais que a tolerância (0.2 = 20%)."""
+    chave = lambda resultado: (resultado["carga"], resultado["algoritmo"], resultado["modo"])
+    referencia = {chave(resultado): resultado for resultado in baseline["resultados"]}
+
+    regressoes = []
+    for resultado in resultados:
+        anterior = referencia.get(chave(resultado))
+        if anterior is None:
+            continue
+        for campo, maior_melhor in METRICAS_COMPARADAS.get(resultado["modo"], ()):
+            atual, base = resultado.get(campo), anterior.get(campo)
+            if not atual or not base:
+                continue
+            variacao = (base - atual) / base if maior_melhor else (atual - base) / base
+            if variacao > tolerancia:
+                regressoes.append(f"{'/'.join(map(str, chave(resultado)))}: {campo} {base:.4g} -> {atual:.4g} "
+                                  f"({variacao:+.0%} pior)")
+    return regressoes
+
+
+def main(argv=None) -> int:
+    algoritmos_disponiveis = list(Escalonador("fifo").algoritmos_disponiveis)
+
+    parser = argparse.ArgumentParser(description="Mede ticks/s, tempo e memória do simulador por algoritmo e tamanho de carga.")
+    parser.add_argument("--tamanhos", type=int, nargs="*", default=[1000, 10000, 100000],
+                        help="números de tarefas das cargas sintéticas (padrão: 1000 10000 100000)")
+    parser.add_argument("--sem-arquivos", action="store_true", help="não mede os arquivos de teste do repositório")
+    parser.add_argument("--algoritmos", nargs="*", choices=algoritmos_disponiveis, default=algoritmos_disponiveis)
+    parser.add_argument("--modos", nargs="*", choices=MODOS, default=list(MODOS))
+    parser.add_argument("--repeticoes", type=int, default=1, help="execuções por medição de tempo (vale a melhor)")
+    parser.add_argument("--sob-demanda", action="store_true",
+                        help="lê as tarefas sob demanda e descarta as finalizadas (memória limitada às tarefas ativas)")
+    parser.add_argument("--limite-historico", type=int, default=1000,
+                        help="mede o custo do histórico só nas cargas com até este número de tarefas")
+    parser.add_argument("--ticks-historico", type=int, default=100, help="ticks medidos no custo do histórico")
+    parser.add_argument("--semente", type=int, default=0, help="semente das cargas sintéticas")
+    parser.add_argument("--importacao", action="store_true",
+                        help="mede também o tempo de importação e até o menu aparecer (abre a janela da interface por um instante)")
+    parser.add_argument("--saida", help="grava os resultados em JSON (pode servir de baseline)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para apontar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.3, help="piora aceita antes de apontar regressão (0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    pasta_base = os.path.dirname(os.path.abspath(__file__))
+    cargas = []
+    if not args.sem_arquivos:
+        for padrao in PADRAO_ARQUIVOS:
+            for caminho in sorted(glob.glob(os.path.join(pasta_base, padrao))):
+                cargas.append((os.path.basename(caminho), caminho))
+
+    with tempfile.TemporaryDirectory() as pasta_cargas:
+        for n_tarefas in args.tamanhos:
+            caminho = os.path.join(pasta_cargas, f"sintetica-{n_tarefas}.txt")
+            escrever_carga(caminho, PARAMETROS_SINTETICOS._replace(n_tarefas=n_tarefas), args.semente)
+            cargas.append((f"sintetica-{n_tarefas}", caminho))
+
+        resultados = executar_benchmark(
+            cargas, args.algoritmos, args.modos, repeticoes=max(1, args.repeticoes), sob_demanda=args.sob_demanda,
+            limite_tarefas_historico=args.limite_historico, ticks_historico=args.ticks_historico,
+        )
+    if args.importacao:
+        resultados.extend(medir_importacao(repeticoes=max(1, args.repeticoes)))
+
+    dados = {
+        "versao": VERSAO_BASELINE,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "sob_demanda": args.sob_demanda,
+        "semente": args.semente,
+        "resultados": resultados,
+    }
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+    else:
+        json.dump(dados, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            baseline = json.load(arquivo)
+        regressoes = comparar_com_baseline(resultados, baseline, args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}", file=sys.stderr)
+        if regressoes:
+            return 1
+        print(f"Nenhuma regressão acima de {args.tolerancia:.0%} em relação a {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+# Cache em disco dos resultados de simulação
+#
+# A simulação é determinística dada a configuração e a semente, então o resultado de uma configuração já simulada
+# pode ser lido do disco em vez de simulado de novo. Cada entrada é endereçada pelo conteúdo: a chave é o SHA-256
+# da configuração normalizada (algoritmo, quantum, alpha e, em ordem, cada tarefa com seus eventos), da semente
+# e da versão do motor. Partes de uma entrada, cada uma num arquivo <chave>.<parte>:
+#   json     resultado final (lote.resultado_simulacao: escalonamento, métricas e dados de cada tarefa)
+#   rastro   rastro binário da simulação (rastro_binario.py)
+#   inicial  estado do sistema operacional no tick 0 (pickle), para a interface não precisar ler o arquivo de novo
+#   final    estado do sistema operacional ao fim da simulação (pickle), para "Avançar até o fim" da interface
+# Só o json é obrigatório; as outras partes são gravadas por quem as tiver (a interface grava todas, o lote só o
+# json e, com --rastros, o rastro).
+#
+# Para achar a entrada sem ler a configuração, o hash do conteúdo bruto do arquivo (+ semente e versão) aponta
+# para a chave num apelido (apelidos/<hash>). Arquivos diferentes com a mesma configuração normalizada (espaços,
+# comentários) têm apelidos diferentes e compartilham a entrada.
+#
+# Invalidação: a versão do motor é o hash do código dos módulos que definem o resultado (leitura da configuração,
+# escalonador, filas, mutex, sistema operacional, métricas, rastro e o formato do resultado). Qualquer mudança
+# neles muda todas as chaves, e as entradas antigas deixam de ser encontradas até saírem pelo LRU.
+#
+# Espaço: o tamanho total é limitado (limite_bytes). Cada processo mantém o total da pasta (contado uma vez e
+# somado a cada gravação), então gravar não percorre a pasta. Só quando o total passa do limite a pasta é
+# recontada (o que inclui o que outros processos gravaram) e as entradas usadas há mais tempo (data de
+# modificação do json, renovada a cada acerto) são apagadas até o total voltar a FRACAO_APOS_DESPEJO do limite,
+# para as gravações seguintes não despejarem uma entrada cada. Os apelidos órfãos só são apagados nesse despejo.
+#
+# Simulações sem semente que fizeram sorteios de desempate não são determinísticas e não entram no cache.
+#
+# Uso:
+#   python cache_resultados.py
+#   python cache_resultados.py --limpar
+#   python cache_resultados.py --pasta /tmp/cache --limite-mb 64
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+from sistema_operacional import SistemaOperacional
+
+# Módulos cujo código decide o resultado de uma simulação (ver versao_motor)
+MODULOS_MOTOR = ["tcb", "config_handler", "escalonador", "fila_prontas", "fila_io", "gerenciador_mutex",
+                 "sistema_operacional", "metricas", "rastro_binario", "lote"]
+
+PARTES = ("json", "rastro", "inicial", "final")
+
+LIMITE_PADRAO = 256 * 1024 * 1024
+FRACAO_APOS_DESPEJO = 0.9  # Um despejo apaga entradas até o total ficar nesta fração do limite
+
+_versao_motor: str | None = None
+_totais: dict[str, int] = {}  # Pasta do cache (caminho absoluto) -> bytes das entradas, como este processo o conhece
+
+
+def versao_motor() -> str:
+    """Hash do código dos módulos do motor (o fonte, ou o bytecode quando o fonte não acompanha o executável)."""
+    global _versao_motor
+    if _versao_motor is None:
+        resumo = hashlib.sha256()
+        for nome in MODULOS_MOTOR:
+            spec = importlib.util.find_spec(nome)
+            codigo = spec.loader.get_source(nome)
+            if codigo is not None:
+                resumo.update(codigo.encode("utf-8"))
+            else:
+                resumo.update(marshal.dumps(spec.loader.get_code(nome)))
+        _versao_motor = resumo.hexdigest()[:16]
+    return _versao_motor
+
+
+def pasta_padrao() -> str:
+    """Pasta do cache: $SIMULADOR_SO_CACHE, ou simulador_so dentro da pasta de cache do usuário."""
+    if os.environ.get("SIMULADOR_SO_CACHE"):
+        return os.environ["SIMULADOR_SO_CACHE"]
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "simulador_so")
+
+
+def config_normalizada(so: SistemaOperacional) -> list:
+    """
+    Configuração de um sistema operacional em forma canônica. Só usa o que a simulação não altera
+    (nem prioridade dinâmica, nem tempo restante), então vale em qualquer tick, inclusive depois do fim.
+    """
+    tarefas = [
+        [tarefa.id, tarefa.cor, tarefa.ingresso, tarefa.duracao, tarefa.prioridade,
+         [[evento.tipo, evento.inicio, evento.duracao, evento.mutex_id] for evento in tarefa.lista_eventos]]
+        for tarefa in so.tarefas
+    ]
+    return [so.nome_escalonador, so.quantum, so.alpha, tarefas]
+
+
+def cacheavel(so: SistemaOperacional, semente: int | None) -> bool:
+    """O resultado só depende da configuração e da semente: com semente, ou sem nenhum sorteio de desempate."""
+    return semente is not None or not so.ticks_com_sorteio
+
+
+def _escrever_atomico(caminho: str, dados: bytes):
+    """Grava num temporário da mesma pasta e renomeia, para nenhum leitor (ou processo paralelo) ver o arquivo pela metade."""
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(dados)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.remove(temporario)
+        raise
+
+
+class CacheResultados:
+    def __init__(self, pasta: str | None = None, limite_bytes: int = LIMITE_PADRAO):
+        self.pasta = pasta_padrao() if pasta is None else pasta
+        self.limite_bytes = limite_bytes
+        self.pasta_apelidos = os.path.join(self.pasta, "apelidos")
+        os.makedirs(self.pasta_apelidos, exist_ok=True)
+        self._pasta_absoluta = os.path.abspath(self.pasta)
+
+    # --- Chaves ---
+
+    def chave(self, so: SistemaOperacional, semente: int | None) -> str:
+        """Chave da entrada: configuração normalizada + semente + versão do motor."""
+        texto = json.dumps([versao_motor(), semente, config_normalizada(so)], separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+    def apelido(self, config_file: str, semente: int | None) -> str:
+        """Hash do conteúdo bruto do arquivo (+ semente e versão do motor), para achar a chave sem ler a configuração."""
+        resumo = hashlib.sha256(f"{versao_motor()}:{semente}:".encode("utf-8"))
+        with open(config_file, "rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+                resumo.update(bloco)
+        return resumo.hexdigest()
+
+    def resolver_apelido(self, apelido: str) -> str | None:
+        """Chave apontada pelo apelido, se a entrada ainda existe."""
+        try:
+            with open(os.path.join(self.pasta_apelidos, apelido), encoding="ascii") as arquivo:
+                chave = arquivo.read().strip()
+        except OSError:
+            return None
+        return chave if os.path.exists(self._caminho(chave, "json")) else None
+
+    # --- Leitura ---
+
+    def _caminho(self, chave: str, parte: str) -> str:
+        return os.path.join(self.pasta, f"{chave}.{parte}")
+
+    def buscar(self, chave: str) -> dict | None:
+        """Resultado guardado na entrada (None se não há); um acerto renova a entrada no LRU."""
+        caminho = self._caminho(chave, "json")
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                resultado = json.load(arquivo)
+            os.utime(caminho)
+        except (OSError, ValueError):
+            return None
+        return resultado
+
+    def caminho_parte(self, chave: str, parte: str) -> str | None:
+        """Caminho de uma parte da entrada, se ela foi gravada."""
+        caminho = self._caminho(chave, parte)
+        return caminho if os.path.exists(caminho) else None
+
+    def ler_parte(self, chave: str, parte: str) -> bytes | None:
+        try:
+            with open(self._caminho(chave, parte), "rb") as arquivo:
+                return arquivo.read()
+        except OSError:
+            return None
+
+    def carregar_estado(self, chave: str, parte: str) -> SistemaOperacional | None:
+        """
+        Estado serializado da entrada ("inicial" ou "final"). O pickle depende da versão do Python e das classes, não só
+        do código do motor: se ele não puder ser lido, a entrada inteira sai do cache e o retorno é None, como se não houvesse.
+        """
+        dados = self.ler_parte(chave, parte)
+        if dados is None:
+            return None
+        try:
+            return pickle.loads(dados)
+        except Exception:
+            self.remover(chave)
+            return None
+
+    def copiar_rastro(self, chave: str, destino: str) -> bool:
+        """Copia o rastro guardado para destino (o leitor mapeia o arquivo, e o LRU pode apagar o original)."""
+        try:
+            shutil.copyfile(self._caminho(chave, "rastro"), destino)
+        except OSError:
+            return False
+        return True
+
+    # --- Gravação ---
+
+    def guardar(self, chave: str, resultado: dict | None = None, apelido: str | None = None,
+                caminho_rastro: str | None = None, inicial: bytes | None = None, final: bytes | None = None):
+        """
+        Grava as partes informadas da entrada (as já gravadas continuam lá) e o apelido, e depois aplica o limite de espaço.
+        caminho_rastro é copiado para o cache; inicial e final são estados serializados com pickle.
+        """
+        total = self.total_bytes()
+        anterior = self._tamanho_entrada(chave)
+        if resultado is not None:
+            _escrever_atomico(self._caminho(chave, "json"), json.dumps(resultado, ensure_ascii=False).encode("utf-8"))
+        if caminho_rastro is not None:
+            temporario = self._caminho(chave, "rastro") + ".tmp"
+            shutil.copyfile(caminho_rastro, temporario)
+            os.replace(temporario, self._caminho(chave, "rastro"))
+        if inicial is not None:
+            _escrever_atomico(self._caminho(chave, "inicial"), inicial)
+        if final is not None:
+            _escrever_atomico(self._caminho(chave, "final"), final)
+        if apelido is not None:
+            _escrever_atomico(os.path.join(self.pasta_apelidos, apelido), chave.encode("ascii"))
+        _totais[self._pasta_absoluta] = total + self._tamanho_entrada(chave) - anterior
+        if _totais[self._pasta_absoluta] > self.limite_bytes:
+            self.despejar()
+
+    def _tamanho_entrada(self, chave: str) -> int:
+        tamanho = 0
+        for parte in PARTES:
+            try:
+                tamanho += os.path.getsize(self._caminho(chave, parte))
+            except OSError:
+                pass
+        return tamanho
+
+    def total_bytes(self) -> int:
+        """Bytes das entradas do cache; a pasta só é percorrida na primeira vez em cada processo (ver despejar)."""
+        if self._pasta_absoluta not in _totais:
+            _totais[self._pasta_absoluta] = sum(tamanho for _, tamanho, _ in self.entradas())
+        return _totais[self._pasta_absoluta]
+
+    def entradas(self) -> list[tuple[float, int, str]]:
+        """(último uso, bytes, chave) de cada entrada, da usada há mais tempo para a mais recente."""
+        tamanhos: dict[str, int] = {}
+        usos: dict[str, float] = {}
+        with os.scandir(self.pasta) as iterador:
+            for item in iterador:
+                chave, _, parte = item.name.partition(".")
+                if parte not in PARTES:
+                    continue
+                try:
+                    info = item.stat()
+                except OSError:
+                    continue  # Apagado por outro processo
+                tamanhos[chave] = tamanhos.get(chave, 0) + info.st_size
+                if parte == "json":
+                    usos[chave] = info.st_mtime
+        # Partes sem json (gravação interrompida) saem primeiro
+        return sorted((usos.get(chave, 0.0), tamanho, chave) for chave, tamanho in tamanhos.items())
+
+    def despejar(self):
+        """
+        Reconta o cache e, se o total passa de limite_bytes, apaga as entradas usadas há mais tempo até ele ficar em
+        FRACAO_APOS_DESPEJO do limite; depois, os apelidos órfãos.
+        """
+        entradas = self.entradas()
+        _totais[self._pasta_absoluta] = sum(tamanho for _, tamanho, _ in entradas)
+        if _totais[self._pasta_absoluta] <= self.limite_bytes:
+            return
+        alvo = int(self.limite_bytes * FRACAO_APOS_DESPEJO)
+        for _, _, chave in entradas:
+            if _totais[self._pasta_absoluta] <= alvo:
+                break
+            self.remover(chave)
+        self._remover_apelidos_orfaos()
+
+    def remover(self, chave: str):
+        for parte in PARTES:
+            caminho = self._caminho(chave, parte)
+            try:
+                tamanho = os.path.getsize(caminho)
+                os.remove(caminho)
+            except OSError:
+                continue
+            if self._pasta_absoluta in _totais:
+                _totais[self._pasta_absoluta] -= tamanho
+
+    def _remover_apelidos_orfaos(self):
+        with os.scandir(self.pasta_apelidos) as iterador:
+            for item in iterador:
+                if self.resolver_apelido(item.name) is None:
+                    try:
+                        os.remove(item.path)
+                    except OSError:
+                        pass
+
+    def limpar(self):
+        """Apaga todas as entradas e apelidos."""
+        for _, _, chave in self.entradas():
+            self.remover(chave)
+        self._remover_apelidos_orfaos()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mostra o tamanho do cache em disco dos resultados de simulação, aplica o limite ou limpa o cache.")
+    parser.add_argument("--pasta", help=f"pasta do cache (padrão: {pasta_padrao()})")
+    parser.add_argument("--limite-mb", type=int, default=LIMITE_PADRAO // (1024 * 1024), help="tamanho máximo do cache em MB")
+    parser.add_argument("--limpar", action="store_true", help="apaga todas as entradas")
+    args = parser.parse_args(argv)
+
+    cache = CacheResultados(args.pasta, limite_bytes=args.limite_mb * 1024 * 1024)
+    if args.limpar:
+        cache.limpar()
+    else:
+        cache.despejar()  # Aplica o limite informado
+
+    entradas = cache.entradas()
+    print(f"Pasta: {cache.pasta}")
+    print(f"Versão do motor: {versao_motor()}")
+    print(f"Entradas: {len(entradas)} ({sum(tamanho for _, tamanho, _ in entradas) / (1024 * 1024):.1f} MB de {args.limite_mb} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,9 +13,10 @@ def cria_tarefa_padrao() -> TCB:
         duracao=5,
         prioridade=1,
         prioridade_dinamica=1,
+        epoca_envelhecimento=None,
         tempo_restante=5,
-        tempos_de_execucao=[],
         lista_eventos=[],
+        indice_proximo_evento=0,
         evento_io_ativo=None
     )
 
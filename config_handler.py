@@ -1,106 +1,198 @@
-from tcb import TCB
+# Leitura do arquivo de configuração
+#
+# Formato:
+#   linha 1: escalonador;quantum[;alpha]
+#   demais:  id;cor;ingresso;duracao;prioridade[;evento;evento...]
+#
+# O arquivo é lido linha a linha: abrir_config devolve um gerador que produz uma tarefa por vez,
+# então arquivos enormes não precisam caber na memória (ver SistemaOperacional com leitura sob demanda).
+# Em vez do caminho de um arquivo, também se pode passar um iterável de linhas (ex.: gerador_carga).
+# Erros de formato levantam ErroConfiguracao com a linha e a coluna do campo inválido.
 
+import os
+from collections.abc import Iterable, Iterator
 
-def read_config(config_file):
-    # Lê o arquivo de configuração e retorna um dicionário com os dados
-    with open(config_file, 'r') as file:
-        lines = file.readlines()
+import registro
+from tcb import TCB, Evento
+
+
+class ErroConfiguracao(ValueError):
+    """Erro de formato no arquivo de configuração, com a posição do problema (linha e coluna começam em 1)."""
+
+    def __init__(self, mensagem: str, linha: int, coluna: int | None = None):
+        self.linha = linha
+        self.coluna = coluna
+        posicao = f"linha {linha}" if coluna is None else f"linha {linha}, coluna {coluna}"
+        super().__init__(f"{posicao}: {mensagem}")
 
-    # Processa a primeira linha para obter o nome do escalonador e o quantum
-    nome_escalonador = lines[0].split(";")[0].strip().lower()
-    quantum = int(lines[0].split(";")[1].strip())
+
+def _campos(linha: str) -> list[tuple[str, int]]:
+    """Campos não vazios da linha separados por ';', cada um com a coluna em que começa."""
+    campos = []
+    coluna = len(linha) - len(linha.lstrip()) + 1
+    for campo in linha.strip().split(";"):
+        if campo.strip():
+            campos.append((campo, coluna))
+        coluna += len(campo) + 1
+    return campos
+
+
+def _inteiro(texto: str, nome: str, numero_linha: int, coluna: int, minimo: int | None = None) -> int:
+    """Converte o campo para int, levantando ErroConfiguracao com a posição se não for um inteiro válido."""
     try:
-        alpha = int(lines[0].split(";")[2].strip())
-    except IndexError:
-        alpha = 1
-
-
-    # Processa as linhas seguintes para obter as tarefas
-    tarefas: list[TCB] = []
-    for line in lines[1:]:
-        parts = line.strip().split(';')
-        parts = [p for p in parts if p.strip()]
-        duracao_tarefa = int(parts[3])
-        tam_config = len(parts)
-        lista_eventos = []
-        if tam_config > 5:
-            for i in range(5, tam_config):
-                evento_str = parts[i].strip()
-                print(evento_str)
-                
-                # Verifica o tipo de evento
-                if evento_str.startswith("IO"):
-                    # Formato: IO:xx-yy (inicio-duracao)
-                    evento_name = "IO"
-                    evento_info = evento_str.split(':')[1].split('-')
-                    evento = {
-                        "tipo": evento_name,
-                        "inicio": int(evento_info[0]),
-                        "duracao": int(evento_info[1]),
-                        "tempo_restante": int(evento_info[1]),
-                        "mutex_id": -1,  # Não aplicável para IO
-                    }
-                elif evento_str.startswith("ML"):
-                    # Formato: MLxx:00 (mutex_id:tempo)
-                    # Extrai o ID do mutex (após "ML" e antes de ":")
-                    evento_name = "ML"
-                    partes = evento_str[2:].split(':')  # Remove "ML" do início
-                    mutex_id = int(partes[0])
-                    inicio = int(partes[1])
-                    evento = {
-                        "tipo": evento_name,
-                        "inicio": inicio,
-                        "duracao": 0,
-                        "tempo_restante": 0,
-                        "mutex_id": mutex_id,
-                    }
-                elif evento_str.startswith("MU"):
-                    # Formato: MUxx:00 (mutex_id:tempo)
-                    # Extrai o ID do mutex (após "MU" e antes de ":")
-                    evento_name = "MU"
-                    partes = evento_str[2:].split(':')  # Remove "MU" do início
-                    mutex_id = int(partes[0])
-                    inicio = int(partes[1])
-                    evento = {
-                        "tipo": evento_name,
-                        "inicio": inicio,
-                        "duracao": 0,
-                        "tempo_restante": 0,
-                        "mutex_id": mutex_id,
-                    }
-                else:
-                    # Formato antigo genérico (fallback)
-                    evento_name = evento_str.split(':')[0]
-                    evento_info = evento_str.split(':')[1].split('-')
-                    evento = {
-                        "tipo": evento_name,
-                        "inicio": int(evento_info[0]),
-                        "duracao": int(evento_info[1]),
-                        "tempo_restante": int(evento_info[1]),
-                        "mutex_id": -1,
-                    }
-                    
-                print(f"Evento parsed: {evento}")
-                lista_eventos.append(evento)
-        prioridade_tarefa = int(parts[4])
-        tarefa = TCB(
-            id=parts[0],
-            cor=parts[1],
-            ingresso=int(parts[2]),
-            duracao=duracao_tarefa,
-            prioridade=prioridade_tarefa,
-            prioridade_dinamica=prioridade_tarefa,  # Inicializa com a prioridade estática
-            tempo_restante=duracao_tarefa, # Importante para SRTF
-            tempos_de_execucao=[],
-            lista_eventos=lista_eventos,
-            evento_io_ativo=None,  # Nenhum evento de I/O ativo inicialmente
+        valor = int(texto)
+    except ValueError:
+        raise ErroConfiguracao(f"{nome} deve ser um número inteiro, encontrado '{texto.strip()}'", numero_linha, coluna) from None
+    if minimo is not None and valor < minimo:
+        raise ErroConfiguracao(f"{nome} deve ser pelo menos {minimo}, encontrado {valor}", numero_linha, coluna)
+    return valor
+
+
+def _ler_cabecalho(linha: str) -> dict:
+    """Lê a primeira linha: escalonador;quantum[;alpha]."""
+    campos = linha.split(";")
+    nome_escalonador = campos[0].strip().lower()
+    if not nome_escalonador:
+        raise ErroConfiguracao("nome do escalonador ausente", 1, 1)
+    if len(campos) < 2:
+        raise ErroConfiguracao("quantum ausente (formato: escalonador;quantum[;alpha])", 1, len(linha.rstrip("\r\n")) + 1)
+
+    coluna_quantum = len(campos[0]) + 2
+    quantum = _inteiro(campos[1], "quantum", 1, coluna_quantum, minimo=1)
+    alpha = 1
+    if len(campos) > 2:
+        alpha = _inteiro(campos[2], "alpha", 1, coluna_quantum + len(campos[1]) + 1)
+
+    return {"nome_escalonador": nome_escalonador, "quantum": quantum, "alpha": alpha}
+
+
+def _ler_evento(evento_str: str, numero_linha: int, coluna: int) -> Evento:
+    """Lê um evento: IO:inicio-duracao, MLxx:inicio ou MUxx:inicio."""
+    try:
+        if evento_str.startswith("IO"):
+            # Formato: IO:xx-yy (inicio-duracao)
+            evento_info = evento_str.split(':')[1].split('-')
+            return Evento(
+                tipo="IO",
+                inicio=int(evento_info[0]),
+                duracao=int(evento_info[1]),
+                tempo_restante=int(evento_info[1]),
+                mutex_id=-1,  # Não aplicável para IO
+            )
+        elif evento_str.startswith("ML") or evento_str.startswith("MU"):
+            # Formato: MLxx:00 / MUxx:00 (mutex_id:tempo)
+            partes = evento_str[2:].split(':')  # Remove "ML"/"MU" do início
+            return Evento(
+                tipo=evento_str[:2],
+                inicio=int(partes[1]),
+                duracao=0,
+                tempo_restante=0,
+                mutex_id=int(partes[0]),
+            )
+        else:
+            # Formato antigo genérico (fallback)
+            evento_info = evento_str.split(':')[1].split('-')
+            return Evento(
+                tipo=evento_str.split(':')[0],
+                inicio=int(evento_info[0]),
+                duracao=int(evento_info[1]),
+                tempo_restante=int(evento_info[1]),
+                mutex_id=-1,
+            )
+    except (IndexError, ValueError):
+        raise ErroConfiguracao(
+            f"evento inválido '{evento_str}' (formatos: IO:inicio-duracao, MLxx:inicio, MUxx:inicio)", numero_linha, coluna
+        ) from None
+
+
+def _ler_tarefa(linha: str, numero_linha: int) -> TCB:
+    """Lê uma linha de tarefa: id;cor;ingresso;duracao;prioridade[;eventos]."""
+    campos = _campos(linha)
+    if len(campos) < 5:
+        nomes = ("id", "cor", "ingresso", "duracao", "prioridade")
+        raise ErroConfiguracao(
+            f"campo {nomes[len(campos)]} ausente (formato: id;cor;ingresso;duracao;prioridade[;eventos])",
+            numero_linha, len(linha.rstrip("\r\n")) + 1
         )
-        tarefas.append(tarefa)
-    
-
-    return {
-        "nome_escalonador": nome_escalonador,
-        "quantum": quantum,
-        "alpha": alpha,
-        "tarefas": tarefas
-    }
\ No newline at end of file
+
+    ingresso = _inteiro(campos[2][0], "ingresso", numero_linha, campos[2][1], minimo=0)
+    duracao_tarefa = _inteiro(campos[3][0], "duracao", numero_linha, campos[3][1], minimo=1)
+
+    lista_eventos = []
+    for evento_campo, coluna in campos[5:]:
+        evento_str = evento_campo.strip()
+        registro.info("parse", "%s", evento_str)
+        evento = _ler_evento(evento_str, numero_linha, coluna)
+        registro.info("parse", "Evento parsed: %s", evento)
+        lista_eventos.append(evento)
+    # Ordena os eventos por instante (ordenação estável: eventos no mesmo instante mantêm a ordem do arquivo)
+    lista_eventos.sort(key=lambda evento: evento.inicio)
+
+    prioridade_tarefa = _inteiro(campos[4][0], "prioridade", numero_linha, campos[4][1])
+    return TCB(
+        id=campos[0][0],
+        cor=campos[1][0],
+        ingresso=ingresso,
+        duracao=duracao_tarefa,
+        prioridade=prioridade_tarefa,
+        prioridade_dinamica=prioridade_tarefa,  # Inicializa com a prioridade estática
+        epoca_envelhecimento=None,
+        tempo_restante=duracao_tarefa, # Importante para SRTF
+        lista_eventos=lista_eventos,
+        indice_proximo_evento=0,
+        evento_io_ativo=None,  # Nenhum evento de I/O ativo inicialmente
+    )
+
+
+def _linhas(config_file: str | os.PathLike | Iterable[str]) -> Iterator[str]:
+    """Linhas da configuração: do arquivo, se config_file for um caminho, ou do próprio iterável."""
+    if isinstance(config_file, (str, os.PathLike)):
+        with open(config_file, 'r') as file:
+            yield from file
+    else:
+        yield from config_file
+
+
+def _tarefas(linhas: Iterator[str], ordenado_por_ingresso: bool) -> Iterator[TCB]:
+    """Gera as tarefas das linhas seguintes ao cabeçalho, ignorando linhas em branco (a primeira é a linha 2 do arquivo)."""
+    ultimo_ingresso = 0
+    try:
+        for numero_linha, linha in enumerate(linhas, start=2):
+            if not linha.strip():
+                continue
+            tarefa = _ler_tarefa(linha, numero_linha)
+            if ordenado_por_ingresso:
+                if tarefa.ingresso < ultimo_ingresso:
+                    raise ErroConfiguracao(
+                        f"tarefas fora da ordem de ingresso ({tarefa.ingresso} depois de {ultimo_ingresso}); "
+                        "a leitura sob demanda exige o arquivo ordenado por ingresso",
+                        numero_linha, _campos(linha)[2][1]
+                    )
+                ultimo_ingresso = tarefa.ingresso
+            yield tarefa
+    finally:
+        linhas.close()  # Fecha o arquivo mesmo se o gerador for abandonado no meio
+
+
+def abrir_config(config_file, ordenado_por_ingresso: bool = False) -> tuple[dict, Iterator[TCB]]:
+    """
+    Lê o cabeçalho e devolve ({"nome_escalonador", "quantum", "alpha"}, gerador das tarefas), numa única passada.
+    Com ordenado_por_ingresso, uma tarefa com ingresso menor que o da anterior é um erro.
+    """
+    linhas = _linhas(config_file)
+    try:
+        primeira_linha = next(linhas, "")
+        if not primeira_linha.strip():
+            raise ErroConfiguracao("arquivo vazio ou sem a linha do escalonador", 1)
+        cabecalho = _ler_cabecalho(primeira_linha)
+    except Exception:
+        linhas.close()
+        raise
+    return cabecalho, _tarefas(linhas, ordenado_por_ingresso)
+
+
+def read_config(config_file):
+    # Lê o arquivo de configuração e retorna um dicionário com os dados (todas as tarefas em memória)
+    dados_config, tarefas = abrir_config(config_file)
+    dados_config["tarefas"] = list(tarefas)
+    return dados_config
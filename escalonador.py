@@ -1,4 +1,6 @@
+import registro
 from tcb import TCB
+from fila_prontas import FilaEnvelhecimento, FilaFIFO, FilaHeap, FilaPrioridade, FilaSRTF
 import random
 
 # Para adicionar um novo algoritmo de escalonamento:
@@ -6,6 +8,7 @@ import random
 # 2. Adicione a função ao dicionário self.algoritmos_disponiveis com a chave sendo o nome do algoritmo em minúsculas.
 # 3. deve_preemptar() deve ser atualizado se o novo algoritmo causar preempção na chegada de novas tarefas.
 # 4. get_preempcao_chegada() e get_preempcao_quantum() devem ser atualizados conforme necessário.
+# 5. _criar_fila_prontas() deve devolver a estrutura de fila adequada (ver fila_prontas.py).
 class Escalonador:
     def __init__(self, nome_escalonador: str, alpha: int = 1):
         self.nome_escalonador = nome_escalonador.strip().lower()
@@ -20,12 +23,23 @@ class Escalonador:
         }
 
         self.alpha = alpha  # Fator de envelhecimento para algoritmos que o utilizam
+        self.epoca_envelhecimento = 0  # Quantas vezes o envelhecimento já foi aplicado (ver get_prioridade_dinamica)
         self.tarefa_atual = None  # Referência à tarefa atualmente em execução (para desempate)
         self.ultimo_sorteio = False  # Flag para indicar se houve sorteio no último escalonamento
+        self.gerador: random.Random | None = None  # Gerador próprio dos sorteios (ver SistemaOperacional.semear); None usa o global
 
         # Escolhe a estrutura de dados correta para a fila de prontas
-        # Usamos lista para todos os algoritmos para evitar problemas com copy.deepcopy()
-        self.fila_tarefas_prontas = []  # Lista funciona para FIFO, SRTF e outros
+        self.fila_tarefas_prontas = self._criar_fila_prontas()
+
+    def _criar_fila_prontas(self):
+        """Deque para FIFO/RR e heap para SRTF, PRIOP e PRIOPEnv."""
+        if self.nome_escalonador == "srtf":
+            return FilaSRTF()
+        elif self.nome_escalonador == "priop":
+            return FilaPrioridade()
+        elif self.nome_escalonador == "priopenv":
+            return FilaEnvelhecimento(self.alpha)
+        return FilaFIFO()
 
     def set_tarefa_atual(self, tarefa: TCB | None):
         """Define a tarefa atualmente em execução (usado para regras de desempate)."""
@@ -36,49 +50,61 @@ class Escalonador:
         if self.nome_escalonador in self.algoritmos_disponiveis:
             return self.algoritmos_disponiveis[self.nome_escalonador]()
         else:
-            print(f"Escalonador '{self.nome_escalonador}' não reconhecido. Usando FIFO como padrão.")
+            registro.aviso("sched", "Escalonador '%s' não reconhecido. Usando FIFO como padrão.", self.nome_escalonador)
             return self.fifo()
         
     def adicionar_tarefa_pronta(self, tarefa: TCB):
-        self.fila_tarefas_prontas.append(tarefa)
         # Não reseta prioridade dinâmica aqui - só quando é escalonada
+        # (tarefas acordadas de um mutex continuam envelhecendo de onde pararam)
+        self.iniciar_envelhecimento(tarefa)
+        self.fila_tarefas_prontas.adicionar(tarefa)
 
-    def _desempatar(self, candidatas: list[TCB], usar_prioridade_estatica: bool = False) -> TCB:
+    def _escolher_do_heap(self, n_criterios_principais: int = 1) -> TCB | None:
         """
-        Aplica regras de desempate conforme requisitos:
+        Retira da fila a próxima tarefa aplicando as regras de desempate conforme requisitos:
         Para PRIOPEnv: (1) maior prioridade estática, (2) tarefa já executando, (3) ingresso mais antigo, (4) menor duração, (5) sorteio
         Para outros: (1) tarefa já executando, (2) ingresso mais antigo, (3) menor duração, (4) sorteio
+        A chave do heap já segue a ordem (critério principal, ingresso, duração), então basta tratar a tarefa
+        já executando e o sorteio. n_criterios_principais indica quantos componentes da chave vêm antes
+        do critério "tarefa já executando".
         """
+        fila: FilaHeap = self.fila_tarefas_prontas
+        if not fila:
+            return None
+
+        # Critério: Tarefa já executando (evita troca de contexto desnecessária)
+        if self.tarefa_atual is not None and self.tarefa_atual in fila:
+            principal_topo = fila.chave_topo()[:n_criterios_principais]
+            if fila.chave_de(self.tarefa_atual)[:n_criterios_principais] == principal_topo:
+                fila.remover(self.tarefa_atual)
+                return self.tarefa_atual
+
+        # Demais critérios já estão na chave; só há sorteio se a chave inteira empatar
+        candidatas = fila.empatadas_no_topo()
         if len(candidatas) == 1:
-            return candidatas[0]
-        
-        # Critério 1 (só para PRIOPEnv): Maior prioridade estática
-        if usar_prioridade_estatica:
-            max_prioridade = max(t['prioridade'] for t in candidatas)
-            candidatas = [t for t in candidatas if t['prioridade'] == max_prioridade]
-            if len(candidatas) == 1:
-                return candidatas[0]
-        
-        # Critério 2: Tarefa já executando (evita troca de contexto desnecessária)
-        if self.tarefa_atual and self.tarefa_atual in candidatas:
-            return self.tarefa_atual
-        
-        # Critério 3: Ingresso mais antigo (quem chegou antes)
-        min_ingresso = min(t['ingresso'] for t in candidatas)
-        candidatas = [t for t in candidatas if t['ingresso'] == min_ingresso]
-        if len(candidatas) == 1:
-            return candidatas[0]
-        
-        # Critério 4: Menor duração
-        min_duracao = min(t['duracao'] for t in candidatas)
-        candidatas = [t for t in candidatas if t['duracao'] == min_duracao]
-        if len(candidatas) == 1:
-            return candidatas[0]
-        
-        # Critério 5: Sorteio
-        self.ultimo_sorteio = True
-        print(f"Desempate por sorteio entre: {[t['id'] for t in candidatas]}")
-        return random.choice(candidatas)
+            tarefa_escolhida = candidatas[0]
+        else:
+            self.ultimo_sorteio = True
+            registro.info("sched", "Desempate por sorteio entre: %s", [t.id for t in candidatas])
+            gerador = random if self.gerador is None else self.gerador
+            tarefa_escolhida = gerador.choice(candidatas)
+
+        fila.remover(tarefa_escolhida)
+        return tarefa_escolhida
+
+    def ceder_tarefa(self) -> TCB | None:
+        """
+        Retira uma tarefa da fila de prontas para outro núcleo (balanceamento na simulação multinúcleo):
+        na FIFO/RR a última que chegou, que esperaria mais aqui; nas filas por chave, a do topo.
+        """
+        fila = self.fila_tarefas_prontas
+        if not fila:
+            return None
+        if isinstance(fila, FilaFIFO):
+            return fila.retirar_ultima()
+        tarefa = fila.topo()
+        fila.remover(tarefa)
+        return tarefa
 
     def deve_preemptar(self, tarefa_atual: TCB) -> bool:
         """Verifica se a tarefa atual deve ser preemptada por alguma tarefa na fila de prontas."""
@@ -87,42 +113,29 @@ class Escalonador:
         if self.nome_escalonador in ["fifo", "rr"]:
             return False
         elif self.nome_escalonador == "srtf":
-            menor_tempo = min(t['tempo_restante'] for t in self.fila_tarefas_prontas)
-            return menor_tempo < tarefa_atual['tempo_restante']
+            menor_tempo = self.fila_tarefas_prontas.topo().tempo_restante
+            return menor_tempo < tarefa_atual.tempo_restante
         elif self.nome_escalonador == "priop":
-            maior_prioridade = max(t['prioridade'] for t in self.fila_tarefas_prontas)
-            return maior_prioridade > tarefa_atual['prioridade']
+            maior_prioridade = self.fila_tarefas_prontas.topo().prioridade
+            return maior_prioridade > tarefa_atual.prioridade
         elif self.nome_escalonador == "priopenv":
             # NÃO aplica envelhecimento aqui - isso é feito no sistema_operacional
             # Apenas verifica se alguma tarefa tem prioridade dinâmica maior
-            maior_prioridade_din = max(t['prioridade_dinamica'] for t in self.fila_tarefas_prontas)
-            return maior_prioridade_din > tarefa_atual['prioridade_dinamica']
+            maior_prioridade_din = self.get_prioridade_dinamica(self.fila_tarefas_prontas.topo())
+            return maior_prioridade_din > self.get_prioridade_dinamica(tarefa_atual)
 
         return False
 
     def fifo(self):
         """Algoritmo FIFO/RR (First In, First Out / Round Robin):"""
-        if self.fila_tarefas_prontas:
-            tarefa = self.fila_tarefas_prontas.pop(0)  # Remove do início (índice 0)
-            return tarefa
-        return None
+        return self.fila_tarefas_prontas.retirar()  # Remove do início da deque
 
     def srtf(self):
         """
         Algoritmo SRTF (Shortest Remaining Time First): Escolhe a tarefa com MENOR tempo restante.
         Desempate: (1) tarefa já executando, (2) ingresso mais antigo, (3) menor duração, (4) sorteio
         """
-        if not self.fila_tarefas_prontas:
-            return None
-        
-        # Encontra o menor tempo restante
-        menor_tempo = min(t['tempo_restante'] for t in self.fila_tarefas_prontas)
-        candidatas = [t for t in self.fila_tarefas_prontas if t['tempo_restante'] == menor_tempo]
-        
-        # Aplica regras de desempate
-        tarefa_escolhida = self._desempatar(candidatas, usar_prioridade_estatica=False)
-        self.fila_tarefas_prontas.remove(tarefa_escolhida)
-        return tarefa_escolhida
+        return self._escolher_do_heap()
 
     def prioridade_preemptiva(self):
         """
@@ -130,17 +143,7 @@ class Escalonador:
         Escolhe a tarefa com MAIOR prioridade (maior número = maior prioridade).
         Desempate: (1) tarefa já executando, (2) ingresso mais antigo, (3) menor duração, (4) sorteio
         """
-        if not self.fila_tarefas_prontas:
-            return None
-        
-        # Encontra a maior prioridade
-        maior_prioridade = max(t['prioridade'] for t in self.fila_tarefas_prontas)
-        candidatas = [t for t in self.fila_tarefas_prontas if t['prioridade'] == maior_prioridade]
-        
-        # Aplica regras de desempate (sem usar prioridade estática pois já é o critério principal)
-        tarefa_escolhida = self._desempatar(candidatas, usar_prioridade_estatica=False)
-        self.fila_tarefas_prontas.remove(tarefa_escolhida)
-        return tarefa_escolhida
+        return self._escolher_do_heap()
     
     def prioridade_envelhecimento(self):
         """
@@ -149,19 +152,12 @@ class Escalonador:
         Desempate: (1) maior prioridade estática, (2) tarefa já executando, (3) ingresso mais antigo, (4) menor duração, (5) sorteio
         Reseta a prioridade dinâmica da tarefa escolhida para a prioridade estática.
         """
-        if not self.fila_tarefas_prontas:
-            return None
-        
-        # Encontra a maior prioridade dinâmica
-        maior_prioridade_din = max(t['prioridade_dinamica'] for t in self.fila_tarefas_prontas)
-        candidatas = [t for t in self.fila_tarefas_prontas if t['prioridade_dinamica'] == maior_prioridade_din]
-        
-        # Aplica regras de desempate (usa prioridade estática como primeiro critério)
-        tarefa_escolhida = self._desempatar(candidatas, usar_prioridade_estatica=True)
-        self.fila_tarefas_prontas.remove(tarefa_escolhida)
+        tarefa_escolhida = self._escolher_do_heap(n_criterios_principais=2)
         
         # Reseta a prioridade dinâmica para a prioridade estática
-        tarefa_escolhida['prioridade_dinamica'] = tarefa_escolhida['prioridade']
+        if tarefa_escolhida is not None:
+            tarefa_escolhida.prioridade_dinamica = tarefa_escolhida.prioridade
+            tarefa_escolhida.epoca_envelhecimento = None
         
         return tarefa_escolhida
     
@@ -172,12 +168,26 @@ class Escalonador:
         # PRIOPEnv também usa quantum para limitar tempo de execução contínua
         return self.nome_escalonador in ["fifo", "rr", "priopenv"]
     
-    def aplicar_envelhecimento(self):
-        """Aplica envelhecimento (aging) a todas as tarefas na fila de prontas.
-        Deve ser chamado uma vez por tick pelo sistema operacional."""
+    def aplicar_envelhecimento(self, n_vezes: int = 1):
+        """Aplica envelhecimento (aging) a todas as tarefas que estão envelhecendo (prontas e bloqueadas por mutex).
+        Deve ser chamado uma vez por tick pelo sistema operacional.
+        O envelhecimento é preguiçoso: só a época global avança, em O(1); ver get_prioridade_dinamica()."""
         if self.nome_escalonador == "priopenv":
-            for tarefa in self.fila_tarefas_prontas:
-                tarefa['prioridade_dinamica'] += self.alpha
+            self.epoca_envelhecimento += n_vezes
+
+    def iniciar_envelhecimento(self, tarefa: TCB):
+        """Marca o início do envelhecimento da tarefa, se ela ainda não estiver envelhecendo."""
+        if tarefa.epoca_envelhecimento is None:
+            tarefa.epoca_envelhecimento = self.epoca_envelhecimento
+
+    def get_prioridade_dinamica(self, tarefa: TCB) -> int:
+        """
+        Prioridade dinâmica atual da tarefa: o valor guardado mais alpha para cada envelhecimento
+        aplicado desde que ela começou a esperar (epoca_envelhecimento é None se ela não está esperando).
+        """
+        if tarefa.epoca_envelhecimento is None:
+            return tarefa.prioridade_dinamica
+        return tarefa.prioridade_dinamica + self.alpha * (self.epoca_envelhecimento - tarefa.epoca_envelhecimento)
     
     def houve_sorteio(self) -> bool:
         """Retorna True se o último escalonamento foi decidido por sorteio."""
@@ -0,0 +1,69 @@
+# Fila de tarefas bloqueadas em I/O
+#
+# Em vez de decrementar o tempo restante de cada tarefa a cada tick, guarda o tick absoluto
+# em que cada operação termina num heap e só retira as entradas vencidas.
+
+import heapq
+
+from tcb import TCB
+
+
+class FilaIO:
+    """
+    Tarefas bloqueadas em I/O, ordenadas por (tick de conclusão, ordem de entrada).
+    Tarefas que concluem no mesmo tick saem na ordem em que entraram na fila, como na antiga lista fila_IO.
+    """
+
+    def __init__(self):
+        self.heap: list[list] = []  # Entradas [tick_conclusao, sequencia, tarefa]
+        self.tarefas: dict[TCB, None] = {}  # tarefas, em ordem de entrada (pela TCB: ids podem se repetir)
+        self.conclusao: dict[TCB, int | None] = {}  # tarefa -> tick em que o I/O termina
+        self.sequencia = 0
+
+    def adicionar(self, tarefa: TCB, relogio: int):
+        """
+        Bloqueia a tarefa no evento_io_ativo dela, iniciado no tick relogio.
+        O I/O é descontado a partir do tick seguinte, então termina no tick relogio + duração.
+        Uma operação com duração <= 0 nunca termina (mesmo comportamento do contador por tick).
+        """
+        duracao = tarefa.evento_io_ativo.tempo_restante
+        self.tarefas[tarefa] = None
+        if duracao > 0:
+            tick_conclusao = relogio + duracao
+            heapq.heappush(self.heap, [tick_conclusao, self.sequencia, tarefa])
+            self.sequencia += 1
+            self.conclusao[tarefa] = tick_conclusao
+        else:
+            self.conclusao[tarefa] = None
+
+    def retirar_concluidas(self, relogio: int) -> list[TCB]:
+        """Remove e retorna, na ordem em que devem voltar à fila de prontas, as tarefas cujo I/O termina até relogio."""
+        concluidas = []
+        while self.heap and self.heap[0][0] <= relogio:
+            tarefa = heapq.heappop(self.heap)[2]
+            del self.tarefas[tarefa]
+            del self.conclusao[tarefa]
+            tarefa.evento_io_ativo.tempo_restante = 0
+            tarefa.evento_io_ativo = None
+            concluidas.append(tarefa)
+        return concluidas
+
+    def proxima_conclusao(self) -> int | None:
+        """Tick da próxima conclusão de I/O (usado pelo modo orientado a eventos)."""
+        return self.heap[0][0] if self.heap else None
+
+    def tempo_restante(self, tarefa: TCB, relogio: int) -> int:
+        """Ticks de I/O que ainda faltam para a tarefa, vistos antes de executar o tick relogio."""
+        tick_conclusao = self.conclusao[tarefa]
+        if tick_conclusao is None:
+            return tarefa.evento_io_ativo.tempo_restante
+        return tick_conclusao - relogio + 1
+
+    def __len__(self) -> int:
+        return len(self.tarefas)
+
+    def __iter__(self):
+        return iter(list(self.tarefas))
+
+    def __contains__(self, tarefa) -> bool:
+        return tarefa in self.tarefas
@@ -0,0 +1,164 @@
+# Estruturas de dados para a fila de tarefas prontas do Escalonador
+#
+# - FilaFIFO: deque, usada por FIFO e RR (retira sempre do início em O(1))
+# - FilaHeap: heap binário com remoção preguiçosa, usado pelos algoritmos que escolhem pela menor chave.
+#   A chave segue a mesma ordem de desempate do Escalonador (critério principal, ingresso, duração),
+#   e o último componente é um número de sequência que reproduz a ordem de chegada na fila.
+#
+# Os índices são chaveados pela própria tarefa (TCB compara por identidade), não pelo id: o arquivo de
+# configuração pode ter duas tarefas com o mesmo id.
+
+import heapq
+from collections import deque
+
+from tcb import TCB
+
+
+class FilaFIFO:
+    """Fila de prontas em ordem de chegada."""
+
+    def __init__(self):
+        self.tarefas: deque[TCB] = deque()
+        self.ocorrencias: dict[TCB, int] = {}  # tarefa -> quantas vezes está na fila (para o "in" em O(1))
+
+    def adicionar(self, tarefa: TCB):
+        self.tarefas.append(tarefa)
+        self.ocorrencias[tarefa] = self.ocorrencias.get(tarefa, 0) + 1
+
+    def retirar(self) -> TCB | None:
+        if self.tarefas:
+            tarefa = self.tarefas.popleft()
+            if self.ocorrencias[tarefa] == 1:
+                del self.ocorrencias[tarefa]
+            else:
+                self.ocorrencias[tarefa] -= 1
+            return tarefa
+        return None
+
+    def retirar_ultima(self) -> TCB | None:
+        """Retira a tarefa do fim da fila (a que chegou por último)."""
+        if self.tarefas:
+            tarefa = self.tarefas.pop()
+            if self.ocorrencias[tarefa] == 1:
+                del self.ocorrencias[tarefa]
+            else:
+                self.ocorrencias[tarefa] -= 1
+            return tarefa
+        return None
+
+    def __len__(self) -> int:
+        return len(self.tarefas)
+
+    def __iter__(self):
+        return iter(self.tarefas)
+
+    def __contains__(self, tarefa) -> bool:
+        return self.ocorrencias.get(tarefa, 0) > 0
+
+
+class FilaHeap:
+    """
+    Fila de prontas ordenada por chave(tarefa), com seleção e inspeção do topo em O(log n).
+    Subclasses definem chave(). Cada entrada do heap é [*chave, sequencia, tarefa];
+    uma entrada removida fora do topo tem a tarefa trocada por None e é descartada quando chega ao topo.
+    """
+
+    def __init__(self):
+        self.heap: list[list] = []
+        self.entradas: dict[TCB, list] = {}  # tarefa -> entrada válida no heap
+        self.sequencia = 0  # Ordem de inserção (equivale à posição na antiga lista de prontas)
+
+    def chave(self, tarefa: TCB) -> tuple:
+        raise NotImplementedError
+
+    def adicionar(self, tarefa: TCB):
+        entrada = [*self.chave(tarefa), self.sequencia, tarefa]
+        self.sequencia += 1
+        self.entradas[tarefa] = entrada
+        heapq.heappush(self.heap, entrada)
+
+    def _limpar_topo(self):
+        """Descarta entradas removidas que estejam no topo do heap."""
+        while self.heap and self.heap[0][-1] is None:
+            heapq.heappop(self.heap)
+
+    def topo(self) -> TCB | None:
+        """Tarefa com a menor chave, sem removê-la."""
+        self._limpar_topo()
+        return self.heap[0][-1] if self.heap else None
+
+    def chave_topo(self) -> tuple | None:
+        """Chave (sem o número de sequência) da tarefa no topo."""
+        self._limpar_topo()
+        return tuple(self.heap[0][:-2]) if self.heap else None
+
+    def chave_de(self, tarefa: TCB) -> tuple:
+        """Chave (sem o número de sequência) com que a tarefa foi inserida."""
+        return tuple(self.entradas[tarefa][:-2])
+
+    def remover(self, tarefa: TCB):
+        entrada = self.entradas.pop(tarefa)
+        self._limpar_topo()
+        if self.heap and self.heap[0] is entrada:
+            heapq.heappop(self.heap)
+        else:
+            entrada[-1] = None
+            # Reconstrói o heap se as entradas removidas passarem a ser maioria
+            if len(self.heap) > 2 * len(self.entradas) + 16:
+                self.heap = [e for e in self.heap if e[-1] is not None]
+                heapq.heapify(self.heap)
+
+    def empatadas_no_topo(self) -> list[TCB]:
+        """Tarefas cuja chave completa empata com a do topo, na ordem em que entraram na fila."""
+        chave = self.chave_topo()
+        if chave is None:
+            return []
+        n = len(chave)
+        retiradas = []
+        while self.heap and (self.heap[0][-1] is None or self.heap[0][:n] == list(chave)):
+            entrada = heapq.heappop(self.heap)
+            if entrada[-1] is not None:
+                retiradas.append(entrada)
+        for entrada in retiradas:
+            heapq.heappush(self.heap, entrada)
+        return [entrada[-1] for entrada in retiradas]
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def __iter__(self):
+        # Percorre em ordem de escalonamento (usado apenas para exibição)
+        return iter([entrada[-1] for entrada in sorted(self.entradas.values())])
+
+    def __contains__(self, tarefa) -> bool:
+        return tarefa in self.entradas
+
+
+class FilaSRTF(FilaHeap):
+    """Menor tempo restante primeiro; desempate por ingresso e duração."""
+
+    def chave(self, tarefa: TCB) -> tuple:
+        return (tarefa.tempo_restante, tarefa.ingresso, tarefa.duracao)
+
+
+class FilaPrioridade(FilaHeap):
+    """Maior prioridade estática primeiro; desempate por ingresso e duração."""
+
+    def chave(self, tarefa: TCB) -> tuple:
+        return (-tarefa.prioridade, tarefa.ingresso, tarefa.duracao)
+
+
+class FilaEnvelhecimento(FilaHeap):
+    """
+    Maior prioridade dinâmica primeiro; desempate por prioridade estática, ingresso e duração.
+    Todas as tarefas que esperam envelhecem alpha por época, então ordenar pela prioridade dinâmica
+    descontada da época em que cada uma começou a esperar dá a mesma ordem que a prioridade atual.
+    """
+
+    def __init__(self, alpha: int):
+        super().__init__()
+        self.alpha = alpha
+
+    def chave(self, tarefa: TCB) -> tuple:
+        prioridade_base = tarefa.prioridade_dinamica - self.alpha * tarefa.epoca_envelhecimento
+        return (-prioridade_base, -tarefa.prioridade, tarefa.ingresso, tarefa.duracao)
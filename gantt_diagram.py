@@ -2,6 +2,11 @@ import customtkinter
 
 
 class GanttDiagram(customtkinter.CTkFrame):
+    # O diagrama vive a sessão inteira: a cada tick só a nova coluna é desenhada (ver atualizar).
+    # Itens que dependem do eixo do tempo têm a tag "tempo" e são reescalados juntos com canvas.scale;
+    # os itens de cada barra também levam a tag "tarefa_<id>".
+    # Na simulação multinúcleo (tarefas com nucleos_execucao), cada trecho executado mostra o núcleo (C0, C1, ...).
+
     def __init__(self, master, current_time, tarefas, ticks_com_sorteio=None):
         super().__init__(master)
 
@@ -21,6 +26,18 @@ class GanttDiagram(customtkinter.CTkFrame):
         # O tempo máximo deve ser usado para definir a escala do diagrama, e atualizado conforme necessário
         self.max_time = current_time 
 
+        # Geometria do último desenho completo (None enquanto o canvas não foi desenhado)
+        self.cell_width = None
+        self.cell_height = None
+        self.usable_width = None
+        self.font_size = None
+        self.tick_height = None
+        self.canvas_height = None
+        self.linhas = {}  # id da tarefa -> estado do fim da barra (linha, último tick desenhado, último retângulo, executando)
+        self.marcadores_sorteio = {}  # tick -> (círculo, texto) do marcador de sorteio
+        self.tick_marcado = None  # Tick destacado pela linha do tempo do rastro (None = nenhum)
+        self.redesenho_pendente = None  # Redesenho agendado após redimensionar a janela
+
         self.canvas = customtkinter.CTkCanvas(self, bg="white", highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
         
@@ -29,12 +46,50 @@ class GanttDiagram(customtkinter.CTkFrame):
         self.after_idle(self.draw_grid)
 
     def _on_canvas_resize(self, event):
-        # Redraw when canvas is resized
+        # Durante o arraste da janela chegam vários eventos: redesenha só quando eles param
+        if self.redesenho_pendente is not None:
+            self.after_cancel(self.redesenho_pendente)
+        self.redesenho_pendente = self.after(80, self._redesenhar_apos_redimensionar)
+
+    def _redesenhar_apos_redimensionar(self):
+        self.redesenho_pendente = None
         self.draw_grid()
 
+    def atualizar(self, current_time, tarefas, ticks_com_sorteio=None):
+        """
+        Atualiza o diagrama para o novo estado da simulação.
+        Se o relógio avançou exatamente um tick e nenhuma tarefa nova entrou, só acrescenta a nova coluna;
+        caso contrário (regressão, salto, chegada de tarefa) redesenha tudo.
+        """
+        incremental = (
+            self.cell_width is not None
+            and current_time == self.max_time + 1
+            and [tarefa["id"] for tarefa in tarefas] == [tarefa["id"] for tarefa in self.tarefas]
+        )
+
+        self.tarefas = tarefas
+        self.n_tarefas = len(tarefas)
+        self.ticks_com_sorteio = ticks_com_sorteio or set()
+
+        if incremental:
+            self._acrescentar_coluna(current_time)
+        else:
+            self.max_time = current_time
+            self.draw_grid()
+
+    def _geometria_eixo(self, cell_width):
+        """Tamanho da fonte dos números e altura das marcas do eixo para uma largura de célula."""
+        # Ajusta o tamanho da fonte com base na largura das células
+        font_size = max(8, min(32, int(cell_width * 0.5)))  # Entre 12 e 32
+        tick_height = min(16, cell_width / 3)  # Ajusta altura do tick
+        return font_size, tick_height
+
     def draw_grid(self):
         # Limpa o canvas antes de desenhar a grade
         self.canvas.delete("all")
+        self.linhas = {}
+        self.marcadores_sorteio = {}
+        self.cell_width = None
 
         # Calcula dimensões do canvas
         canvas_width = self.canvas.winfo_width()
@@ -52,11 +107,8 @@ class GanttDiagram(customtkinter.CTkFrame):
         cell_width = usable_width / max(self.max_time, 1)
         cell_height = usable_height / max(self.n_tarefas, 1)
 
-        # Ajusta o tamanho da fonte com base na largura das células
-        font_size = max(8, min(32, int(cell_width * 0.5)))  # Entre 12 e 32
-        
-        # Ajusta a distância dos números com base no tamanho da fonte
-        text_offset = 20 + (font_size / 4)
+        self.font_size, self.tick_height = self._geometria_eixo(cell_width)
+        self.canvas_height = canvas_height
 
         # Desenha linhas horizontais
         for i in range(self.n_tarefas + 1):
@@ -66,30 +118,85 @@ class GanttDiagram(customtkinter.CTkFrame):
         
         # Desenha linhas verticais
         for j in range(self.max_time + 1):
-            x = self.margin_left + j * cell_width
-            if j == 0:
-                self.canvas.create_line(x, self.margin_top, x, canvas_height - self.margin_bottom, fill="black", width=2)
-            else:
-                # Outras linha: cinza e pontilhada
-                self.canvas.create_line(x, self.margin_top, x, canvas_height - self.margin_bottom, fill="gray", dash=(5, 3))
-
-            # Desenha a linha preta dos ticks dos números
-            tick_height = min(16, cell_width / 3)  # Ajusta altura do tick
-            self.canvas.create_line(x, canvas_height - self.margin_bottom, x, 
-                                    canvas_height - self.margin_bottom + tick_height, fill="black", width=2)
-
-            # Adiciona o número abaixo de cada coluna com fonte ajustável
-            self.canvas.create_text(
-                x, 
-                canvas_height - self.margin_bottom + text_offset, 
-                text=str(j), 
-                fill="black", 
-                font=("Arial", font_size)
-            )
+            self._desenhar_coluna_grade(j, cell_width)
+
+        self.draw_tarefas(self.tarefas, cell_width, cell_height)
+
+        # A atualização incremental só é possível com uma célula de largura positiva
+        if cell_width > 0:
+            self.usable_width = usable_width
+            self.cell_width = cell_width
+            self.cell_height = cell_height
+            self.marcar_tick(self.tick_marcado)
+
+    def marcar_tick(self, tick):
+        """Destaca a coluna do tick com um retângulo tracejado (tick None remove o destaque)."""
+        self.canvas.delete("marcador_tick")
+        self.tick_marcado = tick
+        if tick is None or self.cell_width is None:
+            return
+        x0 = self.margin_left + tick * self.cell_width
+        self.canvas.create_rectangle(
+            x0, self.margin_top - 10, x0 + self.cell_width, self.margin_top + self.n_tarefas * self.cell_height + 10,
+            outline="#E91E63", width=3, dash=(6, 4), tags=("tempo", "marcador_tick")
+        )
+
+    def _desenhar_coluna_grade(self, j, cell_width):
+        """Desenha a linha vertical, a marca e o número do tick j (com a fonte e a altura de marca atuais)."""
+        canvas_height = self.canvas_height
+        x = self.margin_left + j * cell_width
+        if j == 0:
+            self.canvas.create_line(x, self.margin_top, x, canvas_height - self.margin_bottom, fill="black", width=2, tags="tempo")
+        else:
+            # Outras linha: cinza e pontilhada
+            self.canvas.create_line(x, self.margin_top, x, canvas_height - self.margin_bottom, fill="gray", dash=(5, 3), tags="tempo")
+
+        # Desenha a linha preta dos ticks dos números
+        self.canvas.create_line(x, canvas_height - self.margin_bottom, x, 
+                                canvas_height - self.margin_bottom + self.tick_height, fill="black", width=2,
+                                tags=("tempo", "marca_tick"))
+
+        # Adiciona o número abaixo de cada coluna com fonte ajustável
+        # (a distância dos números depende do tamanho da fonte)
+        self.canvas.create_text(
+            x, 
+            canvas_height - self.margin_bottom + 20 + (self.font_size / 4), 
+            text=str(j), 
+            fill="black", 
+            font=("Arial", self.font_size),
+            tags=("tempo", "numero_tick")
+        )
 
-        self.draw_tarefas(self.tarefas)
+    def _acrescentar_coluna(self, novo_max_time):
+        """Estende o diagrama em um tick: reescala o eixo do tempo e desenha só a nova coluna."""
+        cell_width_anterior = self.cell_width
+        self.max_time = novo_max_time
+        self.cell_width = self.usable_width / max(self.max_time, 1)
+
+        # 1. Reescala horizontalmente tudo o que depende do tempo (grade, números, barras)
+        if self.cell_width != cell_width_anterior:
+            self.canvas.scale("tempo", self.margin_left, 0, self.cell_width / cell_width_anterior, 1)
+
+        # 2. Ajusta fonte, posição dos números e altura das marcas se mudaram com a nova largura
+        font_size, tick_height = self._geometria_eixo(self.cell_width)
+        if font_size != self.font_size:
+            self.canvas.itemconfigure("numero_tick", font=("Arial", font_size))
+            self.canvas.move("numero_tick", 0, (font_size - self.font_size) / 4)
+            self.font_size = font_size
+        if tick_height != self.tick_height:
+            self.canvas.scale("marca_tick", 0, self.canvas_height - self.margin_bottom, 1, tick_height / self.tick_height)
+            self.tick_height = tick_height
+
+        # 3. Nova linha da grade e nova célula de cada barra
+        self._desenhar_coluna_grade(self.max_time, self.cell_width)
+        tempo = self.max_time - 1
+        for tarefa in self.tarefas:
+            self._acrescentar_celula(tarefa, tempo)
+
+        # 4. Reposiciona os marcadores de sorteio (não são reescalados para o círculo não deformar)
+        self.draw_sorteio_markers()
 
-    def draw_tarefas(self, tarefas):
+    def draw_tarefas(self, tarefas, cell_width, cell_height):
         n_linhas = len(tarefas)
         for i, tarefa in enumerate(tarefas):
             self.draw_tarefa_bar(
@@ -98,13 +205,18 @@ class GanttDiagram(customtkinter.CTkFrame):
                 ingresso=tarefa["ingresso"],
                 duracao=tarefa["duracao"],
                 cor=tarefa["cor"],
-                tempos_de_execucao=tarefa["tempos_de_execucao"]
+                intervalos_execucao=tarefa["intervalos_execucao"],
+                tempo_executado=tarefa["tempo_executado"],
+                cell_width=cell_width,
+                cell_height=cell_height,
+                nucleos_execucao=tarefa.get("nucleos_execucao")
             )
         
         # Desenha indicadores de sorteio
-        self.draw_sorteio_markers()
+        self.draw_sorteio_markers(cell_width)
 
-    def draw_tarefa_bar(self, linha, id, ingresso, duracao, cor, tempos_de_execucao):
+    def draw_tarefa_bar(self, linha, id, ingresso, duracao, cor, intervalos_execucao, tempo_executado, cell_width, cell_height,
+                        nucleos_execucao=None):
 
         tempo_atual = self.max_time - 1
         
@@ -112,24 +224,10 @@ class GanttDiagram(customtkinter.CTkFrame):
         if cor and not cor.startswith('#'):
             cor = '#' + cor
 
-        # Obtém as dimensões reais do canvas
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-
-        # Calcula o tamanho útil do canvas
-        usable_width = canvas_width - self.margin_left - self.margin_right
-        usable_height = canvas_height - self.margin_top - self.margin_bottom
-
-        # Calcula o tamanho de cada célula
-        cell_width = usable_width / max(self.max_time, 1)
-        cell_height = usable_height / max(self.n_tarefas, 1)
-
-        bar_margin = 24
-
-        tarefa_foi_concluida = duracao == len(tempos_de_execucao)
+        tarefa_foi_concluida = duracao == tempo_executado
 
         if tarefa_foi_concluida:
-            tempo_termino = tempos_de_execucao[-1]
+            tempo_termino = intervalos_execucao[-1][1] - 1
         else:
             tempo_termino = tempo_atual
 
@@ -140,91 +238,141 @@ class GanttDiagram(customtkinter.CTkFrame):
             y_center, 
             text=format_id_with_subscript(self, id), 
             fill="black", 
-            font=("Arial", 36, "bold")
+            font=("Arial", 36, "bold"),
+            tags=f"tarefa_{id}"
         )
 
-        # Desenha retângulos para cada unidade de tempo desde ingresso até término
-        for tempo in range(ingresso, tempo_termino + 1):
-            x0 = self.margin_left + tempo * cell_width
-            y0 = (self.margin_top + linha * cell_height) + bar_margin
-            x1 = x0 + cell_width
-            y1 = (y0 + cell_height - (2 * bar_margin))
-            
-            # Se o tempo está na lista de execução, preenche com a cor, senão com branco
-            if tempo in tempos_de_execucao:
-                fill_color = cor
+        # Estado do fim da barra, usado para acrescentar as próximas colunas
+        estado = {"linha": linha, "cor": cor, "ultimo_tempo": ingresso - 1, "retangulo": None, "executando": False,
+                  "rotulos_nucleo": []}
+        self.linhas[id] = estado
+
+        # Desenha um retângulo por trecho contíguo de execução ou espera, desde o ingresso até o término:
+        # o número de itens no canvas cresce com as trocas de contexto, não com o tempo simulado
+        self._desenhar_trechos(id, estado, segmentos_barra(ingresso, tempo_termino, intervalos_execucao),
+                               cell_width, cell_height)
+        self._desenhar_nucleos(id, estado, intervalos_execucao, nucleos_execucao, cell_width, cell_height)
+
+    def _desenhar_nucleos(self, id, estado, intervalos_execucao, nucleos_execucao, cell_width, cell_height):
+        """
+        Escreve o núcleo no meio de cada intervalo de execução (só na simulação multinúcleo).
+        Rótulos já desenhados são mantidos; o último é reposicionado porque o intervalo pode ter crescido.
+        """
+        if not nucleos_execucao:
+            return
+        rotulos = estado["rotulos_nucleo"]
+        y = self.margin_top + estado["linha"] * cell_height + cell_height / 2
+        for i in range(max(len(rotulos) - 1, 0), len(nucleos_execucao)):
+            inicio, fim = intervalos_execucao[i]
+            x = self.margin_left + (inicio + min(fim, self.max_time)) / 2 * cell_width
+            if i < len(rotulos):
+                self.canvas.coords(rotulos[i], x, y)
+            else:
+                rotulos.append(self.canvas.create_text(
+                    x, y, text=f"C{nucleos_execucao[i]}", fill="black", font=("Arial", 12, "bold"),
+                    tags=("tempo", f"tarefa_{id}")
+                ))
+
+    def _desenhar_trechos(self, id, estado, trechos, cell_width, cell_height):
+        """
+        Desenha os trechos (inicio, fim_exclusivo, executando) no fim da barra da tarefa.
+        Um trecho que continua o último retângulo da barra (mesmo estado) apenas o estende.
+        """
+        bar_margin = 24
+        border_width = 6
+
+        y0 = (self.margin_top + estado["linha"] * cell_height) + bar_margin
+        y1 = (y0 + cell_height - (2 * bar_margin))
+
+        for inicio_trecho, fim_trecho, executando in trechos:
+            x1 = self.margin_left + fim_trecho * cell_width
+
+            if estado["retangulo"] is not None and estado["executando"] == executando:
+                x0 = self.canvas.coords(estado["retangulo"])[0]
+                self.canvas.coords(estado["retangulo"], x0, y0, x1, y1)
             else:
-                fill_color = "white"
-            
-            border_width = 6
-
-            # Cria o retângulo sem borda
-            self.canvas.create_rectangle(x0, y0, x1, y1, fill=fill_color, outline="")
-            
-            # Adiciona borda esquerda no primeiro retângulo
-            if (tempo == ingresso) or number_in_start_sequence(tempo, tempos_de_execucao):
-                self.canvas.create_line(x0, y0, x0, y1, fill='black', width=border_width)
-            
-            # Adiciona borda direita no último retângulo
-            if (tempo == tempo_termino) or number_in_end_sequence(tempo, tempos_de_execucao):
-                self.canvas.create_line(x1, y0, x1, y1, fill='black', width=border_width)
-            
-            # Adiciona bordas superior e inferior em todos
-            self.canvas.create_line(x0, y0, x1, y0, fill='black', width=border_width)  # Top
-            self.canvas.create_line(x0, y1, x1, y1, fill='black', width=border_width)  # Bottom
-
-    def draw_sorteio_markers(self):
-        """Desenha marcadores '?' nos ticks onde houve sorteio para desempate."""
+                # Se a tarefa estava executando, preenche com a cor, senão com branco.
+                # A borda de cada retângulo marca o ingresso, o término e o início/fim de cada execução
+                fill_color = estado["cor"] if executando else "white"
+                x0 = self.margin_left + inicio_trecho * cell_width
+                estado["retangulo"] = self.canvas.create_rectangle(
+                    x0, y0, x1, y1, fill=fill_color, outline="black", width=border_width,
+                    tags=("tempo", f"tarefa_{id}")
+                )
+
+            estado["executando"] = executando
+            estado["ultimo_tempo"] = fim_trecho - 1
+
+    def _acrescentar_celula(self, tarefa, tempo):
+        """Estende a barra da tarefa até o tick tempo (ou até o término, se ela terminou antes dele)."""
+        estado = self.linhas.get(tarefa["id"])
+        if estado is None:
+            return
+
+        intervalos = tarefa["intervalos_execucao"]
+        if tarefa["duracao"] == tarefa["tempo_executado"]:
+            tempo = min(tempo, intervalos[-1][1] - 1)
+
+        # Normalmente só falta a última célula; segmentos_barra também cobre barras que ficaram paradas enquanto
+        # a tarefa parecia concluída (I/O no instante igual à duração, seguido de um tick extra de execução)
+        self._desenhar_trechos(tarefa["id"], estado, segmentos_barra(estado["ultimo_tempo"] + 1, tempo, intervalos),
+                               self.cell_width, self.cell_height)
+        self._desenhar_nucleos(tarefa["id"], estado, intervalos, tarefa.get("nucleos_execucao"), self.cell_width, self.cell_height)
+
+    def draw_sorteio_markers(self, cell_width=None):
+        """Desenha (ou reposiciona) marcadores '?' nos ticks onde houve sorteio para desempate."""
         if not self.ticks_com_sorteio:
             return
         
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        usable_width = canvas_width - self.margin_left - self.margin_right
-        cell_width = usable_width / max(self.max_time, 1)
+        if cell_width is None:
+            cell_width = self.cell_width
         
         for tick in self.ticks_com_sorteio:
             if tick < self.max_time:
                 # Posiciona o '?' acima do tick correspondente
                 x = self.margin_left + tick * cell_width + cell_width / 2
                 y = self.margin_top - 30
+                r = 15
+
+                if tick in self.marcadores_sorteio:
+                    circulo, texto = self.marcadores_sorteio[tick]
+                    self.canvas.coords(circulo, x - r, y - r, x + r, y + r)
+                    self.canvas.coords(texto, x, y)
+                    continue
                 
                 # Desenha um círculo de fundo
-                r = 15
-                self.canvas.create_oval(
+                circulo = self.canvas.create_oval(
                     x - r, y - r, x + r, y + r,
                     fill="#FFA500", outline="#FF8C00", width=2
                 )
                 
                 # Desenha o '?'
-                self.canvas.create_text(
+                texto = self.canvas.create_text(
                     x, y,
                     text="?",
                     fill="white",
                     font=("Arial", 16, "bold")
                 )
-
-
-def number_in_start_sequence(x, seq):
-    index_x = seq.index(x) if x in seq else -1
-    if index_x == -1:
-        return False
-    
-    if (index_x == 0) or (seq[index_x - 1] < x-1):
-        return True
-
-    return False
-
-def number_in_end_sequence(x, seq):
-    index_x = seq.index(x) if x in seq else -1
-    if index_x == -1:
-        return False
-    
-    if (index_x == len(seq)-1) or (seq[index_x + 1] > x+1):
-        return True
-
-    return False
+                self.marcadores_sorteio[tick] = (circulo, texto)
+
+
+def segmentos_barra(ingresso, tempo_termino, intervalos_execucao):
+    """
+    Divide os ticks [ingresso, tempo_termino] da barra de uma tarefa em trechos contíguos
+    (inicio, fim_exclusivo, executando), a partir dos intervalos de execução [inicio, fim).
+    """
+    tempo = ingresso
+    for inicio, fim in intervalos_execucao:
+        inicio = max(inicio, ingresso)
+        fim = min(fim, tempo_termino + 1)
+        if fim <= inicio:
+            continue
+        if tempo < inicio:
+            yield (tempo, inicio, False)
+        yield (inicio, fim, True)
+        tempo = fim
+    if tempo <= tempo_termino:
+        yield (tempo, tempo_termino + 1, False)
 
 
 # Apenas para embelezar o display do ID
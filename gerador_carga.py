@@ -0,0 +1,256 @@
+# Gerador de cargas sintéticas para testar o simulador em escala
+#
+# Produz tarefas no formato do arquivo de configuração (escalonador;quantum;alpha e
+# id;cor;ingresso;duracao;prioridade;eventos), uma linha por vez e já em ordem de ingresso:
+# milhões de tarefas podem ser gravadas num arquivo ou passadas direto ao SistemaOperacional
+# com leitura sob demanda, sem montar o texto inteiro na memória.
+#
+# A geração usa um random.Random próprio: a mesma semente e os mesmos parâmetros geram sempre a mesma carga,
+# sem interferir nos sorteios de desempate do simulador.
+#
+# Uso:
+#   python gerador_carga.py carga.txt --tarefas 1000000 --chegada rajadas --densidade-io 0.05 --semente 42
+#   python gerador_carga.py --executar --tarefas 100000 --mutexes 4 --fracao-mutex 0.3   (todos os algoritmos)
+
+import argparse
+import math
+import random
+import sys
+import time
+from collections.abc import Iterator
+from itertools import accumulate
+from typing import NamedTuple
+
+import registro
+from escalonador import Escalonador
+from sistema_operacional import SistemaOperacional
+
+CHEGADAS = ("poisson", "rajadas")
+DISTRIBUICOES_DURACAO = ("uniforme", "exponencial")
+CONTENCOES = ("uniforme", "concentrada")
+
+
+class ParametrosCarga(NamedTuple):
+    n_tarefas: int = 1000
+    algoritmo: str = "rr"
+    quantum: int = 3
+    alpha: int = 1
+
+    # Chegadas: "poisson" (intervalos exponenciais, taxa_chegada tarefas por tick em média) ou
+    # "rajadas" (grupos de tamanho médio tamanho_rajada chegando juntos, mesma taxa média de tarefas)
+    chegada: str = "poisson"
+    taxa_chegada: float = 0.5
+    tamanho_rajada: float = 10.0
+
+    # Duração: "uniforme" entre duracao_min e duracao_max ou "exponencial" com média duracao_media (mínimo duracao_min)
+    duracao: str = "uniforme"
+    duracao_min: int = 1
+    duracao_max: int = 10
+    duracao_media: float = 5.0
+
+    prioridade_min: int = 1
+    prioridade_max: int = 10
+
+    # I/O: probabilidade de começar um I/O em cada instante de execução da tarefa, com duração entre 1 e duracao_io_max
+    densidade_io: float = 0.0
+    duracao_io_max: int = 5
+
+    # Mutex: fração das tarefas com uma seção crítica (ML/MU). Contenção "uniforme" sorteia o mutex
+    # entre os n_mutexes; "concentrada" segue uma distribuição de Zipf (o mutex 1 é o mais disputado)
+    n_mutexes: int = 0
+    fracao_mutex: float = 0.0
+    contencao: str = "uniforme"
+
+
+def _validar(parametros: ParametrosCarga):
+    if parametros.chegada not in CHEGADAS:
+        raise ValueError(f"Chegada desconhecida: {parametros.chegada} (opções: {', '.join(CHEGADAS)})")
+    if parametros.duracao not in DISTRIBUICOES_DURACAO:
+        raise ValueError(f"Distribuição de duração desconhecida: {parametros.duracao} (opções: {', '.join(DISTRIBUICOES_DURACAO)})")
+    if parametros.contencao not in CONTENCOES:
+        raise ValueError(f"Contenção desconhecida: {parametros.contencao} (opções: {', '.join(CONTENCOES)})")
+    if parametros.taxa_chegada <= 0:
+        raise ValueError("taxa_chegada deve ser positiva")
+    if parametros.tamanho_rajada < 1:
+        raise ValueError("tamanho_rajada deve ser pelo menos 1 (tarefas por rajada, em média)")
+    if not 1 <= parametros.duracao_min <= parametros.duracao_max:
+        raise ValueError("É preciso 1 <= duracao_min <= duracao_max")
+    if parametros.prioridade_min > parametros.prioridade_max:
+        raise ValueError("prioridade_min deve ser <= prioridade_max")
+    if parametros.fracao_mutex > 0 and parametros.n_mutexes < 1:
+        raise ValueError("fracao_mutex > 0 exige n_mutexes >= 1")
+
+
+def _instantes_chegada(parametros: ParametrosCarga, gerador: random.Random) -> Iterator[int]:
+    """Ingresso de cada tarefa, em ordem crescente."""
+    tempo = 0.0
+    if parametros.chegada == "poisson":
+        while True:
+            yield int(tempo)
+            tempo += gerador.expovariate(parametros.taxa_chegada)
+    else:
+        # Rajadas chegam como um processo de Poisson; o tamanho de cada uma é geométrico com a média pedida
+        taxa_rajadas = parametros.taxa_chegada / parametros.tamanho_rajada
+        p_fim_rajada = 1 / parametros.tamanho_rajada
+        while True:
+            instante = int(tempo)
+            yield instante
+            while gerador.random() >= p_fim_rajada:
+                yield instante
+            tempo += gerador.expovariate(taxa_rajadas)
+
+
+def _duracao(parametros: ParametrosCarga, gerador: random.Random) -> int:
+    if parametros.duracao == "uniforme":
+        return gerador.randint(parametros.duracao_min, parametros.duracao_max)
+    return parametros.duracao_min + int(gerador.expovariate(1 / max(parametros.duracao_media - parametros.duracao_min, 1e-9)))
+
+
+def _eventos(parametros: ParametrosCarga, gerador: random.Random, duracao: int, pesos_mutex) -> list[str]:
+    """
+    Eventos da tarefa, em ordem de instante. Os instantes ficam entre 1 e duracao - 1:
+    eventos no instante 0 nunca disparam e um I/O no último instante atrasaria o término.
+    """
+    eventos = []  # (instante, texto)
+
+    if parametros.densidade_io > 0 and duracao > 1:
+        if parametros.densidade_io >= 1:
+            instantes_io = range(1, duracao)
+        else:
+            # Salta direto para o próximo instante com I/O (distribuição geométrica) em vez de sortear instante a instante
+            instantes_io = []
+            log_nao_io = math.log(1 - parametros.densidade_io)
+            instante = 0
+            while True:
+                instante += 1 + int(math.log(1 - gerador.random()) / log_nao_io)
+                if instante >= duracao:
+                    break
+                instantes_io.append(instante)
+        for instante in instantes_io:
+            eventos.append((instante, f"IO:{instante:02d}-{gerador.randint(1, parametros.duracao_io_max):02d}"))
+
+    if pesos_mutex is not None and duracao > 2 and gerador.random() < parametros.fracao_mutex:
+        mutex_id = gerador.choices(range(1, parametros.n_mutexes + 1), cum_weights=pesos_mutex)[0]
+        lock = gerador.randint(1, duracao - 2)
+        unlock = gerador.randint(lock + 1, duracao - 1)
+        eventos.append((lock, f"ML{mutex_id:02d}:{lock:02d}"))
+        eventos.append((unlock, f"MU{mutex_id:02d}:{unlock:02d}"))
+
+    eventos.sort(key=lambda evento: evento[0])
+    return [texto for _, texto in eventos]
+
+
+def linhas_carga(parametros: ParametrosCarga, semente: int | None = None) -> Iterator[str]:
+    """Gera as linhas da configuração (cabeçalho e uma linha por tarefa, em ordem de ingresso), uma por vez."""
+    _validar(parametros)
+    gerador = random.Random(semente)
+
+    pesos_mutex = None
+    if parametros.n_mutexes > 0 and parametros.fracao_mutex > 0:
+        if parametros.contencao == "uniforme":
+            pesos = [1.0] * parametros.n_mutexes
+        else:
+            pesos = [1 / k for k in range(1, parametros.n_mutexes + 1)]
+        pesos_mutex = list(accumulate(pesos))
+
+    yield f"{parametros.algoritmo};{parametros.quantum};{parametros.alpha}\n"
+
+    largura_id = len(str(parametros.n_tarefas))
+    chegadas = _instantes_chegada(parametros, gerador)
+    for numero in range(1, parametros.n_tarefas + 1):
+        ingresso = next(chegadas)
+        duracao = _duracao(parametros, gerador)
+        prioridade = gerador.randint(parametros.prioridade_min, parametros.prioridade_max)
+        cor = f"{gerador.randrange(0x1000000):06X}"
+        campos = [f"t{numero:0{largura_id}d}", cor, str(ingresso), str(duracao), str(prioridade)]
+        campos.extend(_eventos(parametros, gerador, duracao, pesos_mutex))
+        yield ";".join(campos) + ";\n"
+
+
+def escrever_carga(caminho: str, parametros: ParametrosCarga, semente: int | None = None):
+    """Grava a carga num arquivo de configuração, linha a linha."""
+    with open(caminho, "w") as arquivo:
+        arquivo.writelines(linhas_carga(parametros, semente))
+
+
+def simular_carga(parametros: ParametrosCarga, semente: int | None = None) -> dict:
+    """
+    Simula a carga direto do gerador (leitura sob demanda, tarefas descartadas ao terminar: memória limitada
+    às tarefas ativas) e retorna relógio final, tarefas concluídas e tempo de execução.
+    """
+    concluidas = 0
+
+    def contar(tarefa):
+        nonlocal concluidas
+        concluidas += 1
+
+    inicio = time.perf_counter()
+    with registro.silenciado():
+        so = SistemaOperacional(linhas_carga(parametros, semente), sob_demanda=True, ao_finalizar=contar)
+        so.run_to_completion()
+    segundos = time.perf_counter() - inicio
+    return {
+        "algoritmo": parametros.algoritmo,
+        "relogio_final": so.relogio,
+        "concluidas": concluidas,
+        "terminou": so.simulacao_terminada(),
+        "segundos": segundos,
+    }
+
+
+def main(argv=None) -> int:
+    padrao = ParametrosCarga()
+    parser = argparse.ArgumentParser(description="Gera cargas sintéticas no formato do arquivo de configuração.")
+    parser.add_argument("saida", nargs="?", help="arquivo a gravar (omitido: escreve na saída padrão)")
+    parser.add_argument("--executar", action="store_true",
+                        help="em vez de gravar, simula a carga com cada algoritmo disponível e mostra o tempo")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--tarefas", type=int, default=padrao.n_tarefas)
+    parser.add_argument("--algoritmo", default=padrao.algoritmo)
+    parser.add_argument("--quantum", type=int, default=padrao.quantum)
+    parser.add_argument("--alpha", type=int, default=padrao.alpha)
+    parser.add_argument("--chegada", choices=CHEGADAS, default=padrao.chegada)
+    parser.add_argument("--taxa-chegada", type=float, default=padrao.taxa_chegada, help="tarefas por tick, em média")
+    parser.add_argument("--tamanho-rajada", type=float, default=padrao.tamanho_rajada)
+    parser.add_argument("--duracao", choices=DISTRIBUICOES_DURACAO, default=padrao.duracao)
+    parser.add_argument("--duracao-min", type=int, default=padrao.duracao_min)
+    parser.add_argument("--duracao-max", type=int, default=padrao.duracao_max)
+    parser.add_argument("--duracao-media", type=float, default=padrao.duracao_media)
+    parser.add_argument("--prioridade-min", type=int, default=padrao.prioridade_min)
+    parser.add_argument("--prioridade-max", type=int, default=padrao.prioridade_max)
+    parser.add_argument("--densidade-io", type=float, default=padrao.densidade_io,
+                        help="probabilidade de iniciar um I/O em cada instante de execução")
+    parser.add_argument("--duracao-io-max", type=int, default=padrao.duracao_io_max)
+    parser.add_argument("--mutexes", type=int, default=padrao.n_mutexes)
+    parser.add_argument("--fracao-mutex", type=float, default=padrao.fracao_mutex,
+                        help="fração das tarefas com uma seção crítica")
+    parser.add_argument("--contencao", choices=CONTENCOES, default=padrao.contencao)
+    args = parser.parse_args(argv)
+
+    parametros = ParametrosCarga(
+        n_tarefas=args.tarefas, algoritmo=args.algoritmo, quantum=args.quantum, alpha=args.alpha,
+        chegada=args.chegada, taxa_chegada=args.taxa_chegada, tamanho_rajada=args.tamanho_rajada,
+        duracao=args.duracao, duracao_min=args.duracao_min, duracao_max=args.duracao_max,
+        duracao_media=args.duracao_media, prioridade_min=args.prioridade_min, prioridade_max=args.prioridade_max,
+        densidade_io=args.densidade_io, duracao_io_max=args.duracao_io_max,
+        n_mutexes=args.mutexes, fracao_mutex=args.fracao_mutex, contencao=args.contencao,
+    )
+    try:
+        _validar(parametros)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.executar:
+        for algoritmo in Escalonador("fifo").algoritmos_disponiveis:
+            resultado = simular_carga(parametros._replace(algoritmo=algoritmo), args.semente)
+            print(f"{algoritmo:>9}: {resultado['concluidas']} tarefas em {resultado['relogio_final']} ticks, "
+                  f"{resultado['segundos']:.2f} s" + ("" if resultado["terminou"] else " (não terminou)"))
+    elif args.saida:
+        escrever_carga(args.saida, parametros, args.semente)
+    else:
+        sys.stdout.writelines(linhas_carga(parametros, args.semente))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# Gerenciador de Mutexes
+#
+# Mantém o estado de cada mutex e índices auxiliares para que adquirir, liberar
+# e liberar todos os mutexes de uma tarefa custem O(1) amortizado:
+# - mutexes: {mutex_id: {"dono": TCB | None, "fila_espera": deque[TCB]}}
+# - posse: id da tarefa -> conjunto de mutexes que ela possui
+# - bloqueadas: tarefas bloqueadas aguardando algum mutex, em ordem de bloqueio. A chave é a própria TCB,
+#   porque ids podem se repetir; a posse segue pelo id (o dono de um mutex é identificado pelo id da tarefa)
+
+from collections import deque
+
+import registro
+from tcb import TCB
+
+
+class GerenciadorMutex:
+    def __init__(self):
+        self.mutexes: dict[int, dict] = {}
+        self.ordem_criacao: dict[int, int] = {}  # mutex_id -> ordem em que o mutex foi criado
+        self.posse: dict[str, set[int]] = {}
+        self.bloqueadas: dict[TCB, None] = {}
+
+    def _obter_ou_criar_mutex(self, mutex_id: int) -> dict:
+        """Obtém um mutex existente ou cria um novo se não existir."""
+        if mutex_id not in self.mutexes:
+            self.ordem_criacao[mutex_id] = len(self.mutexes)
+            self.mutexes[mutex_id] = {"dono": None, "fila_espera": deque()}
+        return self.mutexes[mutex_id]
+
+    def _definir_dono(self, mutex: dict, mutex_id: int, tarefa: TCB | None):
+        """Troca o dono do mutex mantendo o índice de posse atualizado."""
+        if mutex["dono"] is not None:
+            self.posse[mutex["dono"].id].discard(mutex_id)
+        mutex["dono"] = tarefa
+        if tarefa is not None:
+            self.posse.setdefault(tarefa.id, set()).add(mutex_id)
+
+    def solicitar(self, tarefa: TCB, mutex_id: int) -> bool:
+        """
+        Tenta adquirir o mutex para a tarefa.
+        Retorna True se o mutex foi adquirido, False se a tarefa foi bloqueada.
+        """
+        mutex = self._obter_ou_criar_mutex(mutex_id)
+
+        if mutex["dono"] is None:
+            # Mutex está livre, a tarefa pode adquirir
+            self._definir_dono(mutex, mutex_id, tarefa)
+            registro.info("mutex", "Tarefa %s adquiriu mutex %s", tarefa.id, mutex_id)
+            return True
+        elif mutex["dono"].id == tarefa.id:
+            # A tarefa já possui o mutex (reentrância - opcional, mas seguro)
+            registro.info("mutex", "Tarefa %s já possui mutex %s", tarefa.id, mutex_id)
+            return True
+        else:
+            # Mutex está ocupado, bloqueia a tarefa
+            mutex["fila_espera"].append(tarefa)
+            self.bloqueadas[tarefa] = None
+            registro.info("mutex", "Tarefa %s bloqueada aguardando mutex %s (dono: %s)", tarefa.id, mutex_id, mutex["dono"].id)
+            return False
+
+    def liberar(self, tarefa: TCB, mutex_id: int) -> TCB | None:
+        """
+        Libera o mutex e passa a posse para a próxima tarefa na fila de espera, se houver.
+        Retorna a tarefa acordada (que deve voltar à fila de prontas) ou None.
+        """
+        mutex = self._obter_ou_criar_mutex(mutex_id)
+
+        if mutex["dono"] is None:
+            registro.aviso("mutex", "Aviso: Tarefa %s tentou liberar mutex %s que já está livre", tarefa.id, mutex_id)
+            return None
+
+        if mutex["dono"].id != tarefa.id:
+            registro.aviso("mutex", "Aviso: Tarefa %s tentou liberar mutex %s que pertence a %s", tarefa.id, mutex_id, mutex["dono"].id)
+            return None
+
+        registro.info("mutex", "Tarefa %s liberou mutex %s", tarefa.id, mutex_id)
+
+        if mutex["fila_espera"]:
+            # Acorda a próxima tarefa na fila de espera
+            proxima_tarefa = mutex["fila_espera"].popleft()
+            self._definir_dono(mutex, mutex_id, proxima_tarefa)
+            registro.info("mutex", "Tarefa %s acordada e adquiriu mutex %s", proxima_tarefa.id, mutex_id)
+            self.bloqueadas.pop(proxima_tarefa, None)
+            return proxima_tarefa
+
+        # Ninguém esperando, libera o mutex
+        self._definir_dono(mutex, mutex_id, None)
+        return None
+
+    def liberar_todos(self, tarefa: TCB) -> list[TCB]:
+        """
+        Libera todos os mutexes que a tarefa possui (na ordem em que os mutexes foram criados).
+        Retorna as tarefas acordadas, na ordem em que devem voltar à fila de prontas.
+        """
+        mutexes_a_liberar = sorted(self.posse.get(tarefa.id, ()), key=self.ordem_criacao.__getitem__)
+
+        acordadas = []
+        for mutex_id in mutexes_a_liberar:
+            registro.info("mutex", "Liberando mutex %s da tarefa %s que terminou", mutex_id, tarefa.id)
+            proxima_tarefa = self.liberar(tarefa, mutex_id)
+            if proxima_tarefa is not None:
+                acordadas.append(proxima_tarefa)
+        self.posse.pop(tarefa.id, None)  # A tarefa terminou: não precisa mais de entrada no índice
+        return acordadas
+
+    def esta_bloqueada(self, tarefa: TCB) -> bool:
+        return tarefa in self.bloqueadas
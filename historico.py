@@ -0,0 +1,175 @@
+# Histórico da simulação para os botões "Regredir Tick" / "Próximo Tick"
+#
+# Em vez de copiar o sistema operacional inteiro antes de cada tick, guarda um quadro-chave
+# (estado serializado com pickle + estado do gerador de números aleatórios) a cada N ticks.
+# Para voltar a um tick, restaura o quadro-chave mais próximo antes dele e reexecuta os ticks
+# que faltam. Como o motor é determinístico dado o estado do gerador, a reexecução chega
+# exatamente ao mesmo estado (inclusive os sorteios de desempate). Se o sistema foi semeado
+# (SistemaOperacional.semear), o gerador dos sorteios já vai dentro do estado serializado; o estado do
+# gerador global só importa para simulações sem semente.
+#
+# A memória é limitada por um orçamento em bytes: quando os quadros-chave passam dele,
+# o intervalo entre quadros dobra e metade deles é descartada (o quadro do tick 0 nunca sai).
+#
+# O rastro binário pode ser gravado durante a execução (iniciar_rastro): os quadros-chave não levam o gravador,
+# e voltar ou saltar ticks o invalida (o arquivo só aceita acréscimos). Sem rastro contínuo, gravar_rastro
+# reexecuta a simulação a partir do tick 0.
+
+import pickle
+import random
+from bisect import bisect_right
+
+import registro
+from sistema_operacional import SistemaOperacional
+
+
+class HistoricoSimulacao:
+    def __init__(self, sistema_operacional: SistemaOperacional, intervalo_quadros: int = 32,
+                 orcamento_bytes: int = 64 * 1024 * 1024):
+        self.sistema_operacional = sistema_operacional
+        self.intervalo_quadros = max(1, intervalo_quadros)  # Ticks entre dois quadros-chave
+        self.orcamento_bytes = orcamento_bytes  # Memória máxima ocupada pelos quadros-chave
+        self.ticks_quadros: list[int] = []  # Ticks com quadro-chave, em ordem crescente
+        self.quadros: dict[int, tuple[bytes, tuple]] = {}  # tick -> (estado serializado, estado do random)
+        self.bytes_usados = 0
+        self.caminho_rastro: str | None = None  # Rastro gravado durante a execução (ver iniciar_rastro)
+        self._salvar_quadro()
+
+    def _salvar_quadro(self):
+        """Guarda um quadro-chave do estado atual e respeita o orçamento de memória."""
+        tick = self.sistema_operacional.relogio
+        if tick in self.quadros:
+            return
+        so = self.sistema_operacional
+        gravador, so.rastro = so.rastro, None  # O gravador do rastro (arquivo aberto) não entra no quadro
+        try:
+            estado = pickle.dumps(so, pickle.HIGHEST_PROTOCOL)
+        finally:
+            so.rastro = gravador
+        self.quadros[tick] = (estado, random.getstate())
+        self.ticks_quadros.append(tick)
+        self.bytes_usados += len(estado)
+
+        while self.bytes_usados > self.orcamento_bytes and len(self.ticks_quadros) > 1:
+            self._rarear_quadros()
+
+    def _rarear_quadros(self):
+        """Dobra o intervalo entre quadros-chave e descarta os que não caem no novo intervalo."""
+        self.intervalo_quadros *= 2
+        mantidos = []
+        for tick in self.ticks_quadros:
+            if tick == 0 or tick % self.intervalo_quadros == 0:
+                mantidos.append(tick)
+            else:
+                self.bytes_usados -= len(self.quadros.pop(tick)[0])
+        if len(mantidos) == len(self.ticks_quadros):
+            # Nenhum quadro caiu fora do novo intervalo: descarta o mais antigo depois do tick 0
+            tick = mantidos.pop(1)
+            self.bytes_usados -= len(self.quadros.pop(tick)[0])
+        self.ticks_quadros = mantidos
+
+    def avancar(self):
+        """Executa um tick e guarda um quadro-chave quando o relógio cai no intervalo."""
+        so = self.sistema_operacional
+        if so.simulacao_terminada():
+            return
+        so.executar_tick()
+        if so.relogio % self.intervalo_quadros == 0:
+            self._salvar_quadro()
+
+    def avancar_ate_fim(self):
+        """
+        Executa até o fim saltando os ticks sem eventos, parando em cada múltiplo do intervalo para guardar um quadro-chave.
+        Para também se nada mais pode acontecer (ex.: tarefas presas em mutex para sempre).
+        """
+        so = self.sistema_operacional
+        while so.ha_eventos_pendentes():
+            proximo_quadro = (so.relogio // self.intervalo_quadros + 1) * self.intervalo_quadros
+            so.run_until(proximo_quadro)
+            if so.relogio % self.intervalo_quadros == 0:
+                self._salvar_quadro()
+
+    def iniciar_rastro(self, caminho: str):
+        """Grava o rastro binário em caminho conforme a simulação avança, para gravar_rastro não precisar reexecutá-la."""
+        self.sistema_operacional.iniciar_rastro(caminho)
+        self.caminho_rastro = caminho
+
+    def rastro_continuo(self) -> bool:
+        """O rastro em gravação cobre todos os ticks desde o 0 (nenhum retrocesso ou salto o invalidou)."""
+        return self.sistema_operacional.rastro is not None
+
+    def descartar_rastro(self):
+        """Para de gravar o rastro em curso; o arquivo fica incompleto (gravar_rastro o regrava reexecutando)."""
+        so = self.sistema_operacional
+        if so.rastro is not None:
+            so.rastro.descartar()
+            so.rastro = None
+
+    def saltar_para(self, sistema_operacional: SistemaOperacional) -> SistemaOperacional:
+        """
+        Troca o estado atual por um estado mais adiante da mesma simulação (ex.: o estado final lido do cache)
+        e guarda um quadro-chave dele. Os ticks pulados não têm quadro: voltar a eles reexecuta a partir do anterior.
+        """
+        self.descartar_rastro()  # Os ticks pulados não foram gravados
+        self.sistema_operacional = sistema_operacional
+        self._salvar_quadro()
+        return sistema_operacional
+
+    def ir_para(self, tick: int) -> SistemaOperacional:
+        """
+        Restaura a simulação no início do tick informado (tick <= relógio atual) e retorna o novo sistema operacional.
+        Os quadros-chave depois desse tick são descartados, pois serão gravados de novo ao avançar.
+        """
+        tick = max(0, min(tick, self.sistema_operacional.relogio))
+        indice = bisect_right(self.ticks_quadros, tick) - 1
+        tick_quadro = self.ticks_quadros[indice]
+
+        self.descartar_rastro()  # O rastro só aceita acréscimos: os ticks depois de tick já foram gravados
+
+        for descartado in self.ticks_quadros[indice + 1:]:
+            self.bytes_usados -= len(self.quadros.pop(descartado)[0])
+        del self.ticks_quadros[indice + 1:]
+
+        estado, estado_random = self.quadros[tick_quadro]
+        so = pickle.loads(estado)
+        random.setstate(estado_random)
+
+        # Os ticks reexecutados já foram registrados da primeira vez; os registros posteriores ao tick saem do buffer
+        registro.descartar_a_partir_do_tick(tick)
+        with registro.silenciado():
+            so.run_until(tick)
+
+        self.sistema_operacional = so
+        return so
+
+    def gravar_rastro(self, caminho: str):
+        """
+        Grava o rastro binário da simulação completa em caminho. Se a simulação já terminou com o rastro contínuo
+        gravado nesse caminho, só o fecha; senão, reexecuta a simulação a partir do tick 0 numa cópia
+        (o estado atual não é alterado). A reexecução faz os mesmos sorteios da original.
+        """
+        so = self.sistema_operacional
+        if self.rastro_continuo() and caminho == self.caminho_rastro:
+            if not so.ha_eventos_pendentes():
+                so.encerrar_rastro()
+                return
+            self.descartar_rastro()  # A reexecução vai regravar o mesmo arquivo
+
+        estado, estado_random = self.quadros[0]
+        so = pickle.loads(estado)
+        estado_random_atual = random.getstate()
+        random.setstate(estado_random)
+        try:
+            so.iniciar_rastro(caminho)
+            with registro.silenciado():
+                so.run_to_completion()
+            so.encerrar_rastro()
+        finally:
+            random.setstate(estado_random_atual)
+
+    def voltar(self, n_ticks: int = 1) -> SistemaOperacional:
+        """Volta n_ticks ticks e retorna o sistema operacional restaurado."""
+        return self.ir_para(self.sistema_operacional.relogio - n_ticks)
+
+    def pode_voltar(self) -> bool:
+        return self.sistema_operacional.relogio > 0
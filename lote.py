@@ -0,0 +1,184 @@
+# Execução em lote (sem interface gráfica)
+#
+# Roda um ou mais arquivos de configuração até o fim e escreve o resultado de cada tarefa
+# e o escalonamento em JSON ou CSV. Não importa customtkinter nem PIL, então funciona em servidores sem tela.
+# Arquivos já simulados com a mesma semente saem do cache em disco (cache_resultados.py), sem simular de novo.
+#
+# Uso:
+#   python lote.py config_livro_rr.txt caso-teste-002.txt --formato csv --saida resultados.csv --jobs 4
+#   python lote.py caso-teste-*.txt --semente 7 --cache /tmp/cache_simulador --cache-mb 64
+#   python lote.py carga.txt --sem-cache
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import registro
+from cache_resultados import LIMITE_PADRAO, CacheResultados, cacheavel, pasta_padrao
+from sistema_operacional import SistemaOperacional
+
+
+def resultado_simulacao(so: SistemaOperacional) -> dict:
+    """
+    Resume o estado final de uma simulação: métricas gerais (ver metricas.py), dados de cada tarefa
+    e o escalonamento (quem executou em cada trecho).
+    """
+    tarefas = []
+    escalonamento = []
+    for tarefa in so.tarefas:
+        intervalos = [list(intervalo) for intervalo in tarefa.intervalos_execucao]
+        metricas = so.get_metricas_tarefa(tarefa)
+        tarefas.append({
+            "id": tarefa.id,
+            "ingresso": tarefa.ingresso,
+            "duracao": tarefa.duracao,
+            "prioridade": tarefa.prioridade,
+            "primeira_execucao": intervalos[0][0] if intervalos else None,
+            "termino": intervalos[-1][1] if tarefa in so.conjunto_finalizadas else None,
+            "tempo_executado": tarefa.tempo_executado,
+            "espera_prontas": metricas["espera_prontas"],
+            "bloqueado_io": metricas["bloqueado_io"],
+            "bloqueado_mutex": metricas["bloqueado_mutex"],
+            "intervalos_execucao": intervalos,
+        })
+        escalonamento.extend([inicio, fim, tarefa.id] for inicio, fim in intervalos)
+    escalonamento.sort()
+
+    return {
+        "algoritmo": so.nome_escalonador,
+        "quantum": so.quantum,
+        "alpha": so.alpha,
+        "relogio_final": so.relogio,
+        "terminou": so.simulacao_terminada(),
+        "ticks_com_sorteio": sorted(so.ticks_com_sorteio),
+        "metricas": so.get_metricas(),
+        "tarefas": tarefas,
+        "escalonamento": escalonamento,
+    }
+
+
+def simular_arquivo(config_file: str, semente: int | None = None, pasta_rastros: str | None = None,
+                    sob_demanda: bool = False, pasta_cache: str | None = None, limite_cache: int = LIMITE_PADRAO) -> dict:
+    """
+    Simula um arquivo de configuração até o fim. Erros de leitura são devolvidos no resultado.
+    Com pasta_rastros, grava também o rastro binário da simulação (<nome do arquivo>.rastro) nessa pasta.
+    Com sob_demanda, as tarefas são lidas do arquivo conforme ingressam (arquivo ordenado por ingresso).
+    Com pasta_cache, um arquivo já simulado com a mesma semente sai do cache (com o rastro, se ele estiver lá)
+    e uma simulação nova é guardada nele.
+    """
+    destino_rastro = None if pasta_rastros is None else os.path.join(pasta_rastros, os.path.basename(config_file) + ".rastro")
+    cache = apelido = None
+    if pasta_cache is not None:
+        try:
+            cache = CacheResultados(pasta_cache, limite_bytes=limite_cache)
+            apelido = cache.apelido(config_file, semente)
+        except OSError:
+            pass  # Pasta do cache sem permissão, ou arquivo ilegível (o erro sai da simulação, abaixo)
+        chave = None if apelido is None else cache.resolver_apelido(apelido)
+        if chave is not None:
+            resultado = cache.buscar(chave)
+            if resultado is not None and (destino_rastro is None or cache.copiar_rastro(chave, destino_rastro)):
+                return {"arquivo": config_file, **resultado}
+
+    try:
+        # As mensagens do simulador não podem se misturar com a saída do lote (e só custariam tempo)
+        with registro.silenciado():
+            so = SistemaOperacional(config_file, sob_demanda=sob_demanda, semente=semente)
+            if destino_rastro is not None:
+                so.iniciar_rastro(destino_rastro)
+            so.run_to_completion()
+            so.encerrar_rastro()
+    except Exception as e:
+        return {"arquivo": config_file, "erro": str(e)}
+
+    resultado = resultado_simulacao(so)
+    if cache is not None and cacheavel(so, semente):
+        try:
+            cache.guardar(cache.chave(so, semente), resultado, apelido=apelido, caminho_rastro=destino_rastro)
+        except OSError:
+            pass  # Sem espaço ou sem permissão na pasta do cache: o resultado continua valendo
+    return {"arquivo": config_file, **resultado}
+
+
+CAMPOS_CSV = ["arquivo", "algoritmo", "quantum", "alpha", "tarefa", "ingresso", "duracao", "prioridade",
+              "primeira_execucao", "termino", "tempo_executado", "espera_prontas", "bloqueado_io", "bloqueado_mutex",
+              "intervalos_execucao", "erro"]
+
+
+def escrever_csv(resultados: list[dict], saida):
+    """Uma linha por tarefa; os intervalos de execução vão numa coluna no formato "inicio-fim inicio-fim"."""
+    writer = csv.DictWriter(saida, fieldnames=CAMPOS_CSV)
+    writer.writeheader()
+    for resultado in resultados:
+        if "erro" in resultado:
+            writer.writerow({"arquivo": resultado["arquivo"], "erro": resultado["erro"]})
+            continue
+        for tarefa in resultado["tarefas"]:
+            writer.writerow({
+                "arquivo": resultado["arquivo"],
+                "algoritmo": resultado["algoritmo"],
+                "quantum": resultado["quantum"],
+                "alpha": resultado["alpha"],
+                "tarefa": tarefa["id"],
+                "ingresso": tarefa["ingresso"],
+                "duracao": tarefa["duracao"],
+                "prioridade": tarefa["prioridade"],
+                "primeira_execucao": tarefa["primeira_execucao"],
+                "termino": tarefa["termino"],
+                "tempo_executado": tarefa["tempo_executado"],
+                "espera_prontas": tarefa["espera_prontas"],
+                "bloqueado_io": tarefa["bloqueado_io"],
+                "bloqueado_mutex": tarefa["bloqueado_mutex"],
+                "intervalos_execucao": " ".join(f"{inicio}-{fim}" for inicio, fim in tarefa["intervalos_execucao"]),
+            })
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Executa simulações em lote, sem interface gráfica.")
+    parser.add_argument("arquivos", nargs="+", help="arquivos de configuração (mesmo formato da interface)")
+    parser.add_argument("--formato", choices=["json", "csv"], default="json", help="formato da saída (padrão: json)")
+    parser.add_argument("--saida", "-o", help="arquivo de saída (padrão: saída padrão)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="número de processos para simular arquivos em paralelo")
+    parser.add_argument("--semente", type=int, help="semente dos sorteios de desempate, para resultados reproduzíveis")
+    parser.add_argument("--rastros", metavar="PASTA", help="grava o rastro binário de cada simulação nesta pasta")
+    parser.add_argument("--sob-demanda", action="store_true",
+                        help="lê as tarefas conforme ingressam, sem carregar o arquivo inteiro (exige arquivo ordenado por ingresso)")
+    parser.add_argument("--cache", metavar="PASTA", default=pasta_padrao(), help="pasta do cache de resultados (padrão: %(default)s)")
+    parser.add_argument("--cache-mb", type=int, default=LIMITE_PADRAO // (1024 * 1024), help="tamanho máximo do cache em MB")
+    parser.add_argument("--sem-cache", action="store_true", help="simula todos os arquivos, sem ler nem gravar o cache")
+    args = parser.parse_args(argv)
+
+    if args.rastros:
+        os.makedirs(args.rastros, exist_ok=True)
+
+    sementes = [args.semente] * len(args.arquivos)
+    pastas = [args.rastros] * len(args.arquivos)
+    sob_demanda = [args.sob_demanda] * len(args.arquivos)
+    caches = [None if args.sem_cache else args.cache] * len(args.arquivos)
+    limites = [args.cache_mb * 1024 * 1024] * len(args.arquivos)
+    parametros = (args.arquivos, sementes, pastas, sob_demanda, caches, limites)
+    if args.jobs > 1 and len(args.arquivos) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            resultados = list(executor.map(simular_arquivo, *parametros))
+    else:
+        resultados = [simular_arquivo(*argumentos) for argumentos in zip(*parametros)]
+
+    saida = open(args.saida, "w", newline="", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        if args.formato == "csv":
+            escrever_csv(resultados, saida)
+        else:
+            json.dump(resultados, saida, ensure_ascii=False, indent=2)
+            saida.write("\n")
+    finally:
+        if args.saida:
+            saida.close()
+
+    return 1 if any("erro" in resultado for resultado in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
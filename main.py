@@ -1,7 +1,7 @@
 import customtkinter
-from config_editor import ConfigEditor
-from simulacao_frame import SimulacaoFrame
-from tkinter import filedialog
+
+# A tela de simulação (motor, histórico, cache, diagrama), o editor de configuração e o diálogo de arquivos
+# são importados quando o usuário os abre: o menu aparece só com o customtkinter carregado.
 
 class App(customtkinter.CTk):
     def __init__(self):
@@ -54,6 +54,8 @@ class App(customtkinter.CTk):
 
     def iniciar_simulacao(self):
         """Inicia a simulação, destruindo o menu e construindo a UI de simulação."""
+        from simulacao_frame import SimulacaoFrame
+
         self.menu_frame.destroy()
         self.simulacao_frame = SimulacaoFrame(self, self.reseta_simulacao)
         self.simulacao_frame.create_simulation_ui(self.config_file)
@@ -61,6 +63,8 @@ class App(customtkinter.CTk):
 
     def seleciona_config(self):
         """Abre um diálogo para selecionar um arquivo de configuração."""
+        from tkinter import filedialog
+
         file_path = filedialog.askopenfilename(
             title="Selecione um arquivo de configuração",
             initialdir=".",  # Changed from "/" to current directory
@@ -91,6 +95,8 @@ class App(customtkinter.CTk):
 
     def cria_menu_edicao(self):
         """Cria a interface para edição de configuração."""
+        from config_editor import ConfigEditor
+
         if self.menu_frame:
             self.menu_frame.destroy()
             self.menu_frame = None
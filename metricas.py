@@ -0,0 +1,145 @@
+# Métricas incrementais da simulação
+#
+# O sistema operacional avisa cada acontecimento (chegada, execução, bloqueio, desbloqueio, término) e os
+# contadores são atualizados na hora, então totais e médias podem ser lidos em O(1) em qualquer tick,
+# sem percorrer as tarefas nem os intervalos de execução.
+#
+# Cada tick de uma tarefa ingressada cai em exatamente um estado: executando, bloqueada em I/O,
+# bloqueada em mutex ou esperando na fila de prontas. Os bloqueios são medidos com o tick em que começaram
+# (TCB.inicio_bloqueio); a espera na fila de prontas sai por diferença:
+#   espera = (término ou relógio - ingresso) - executado - bloqueado em I/O - bloqueado em mutex
+# Os bloqueios ainda em curso entram nos totais por soma dos inícios: n_bloqueadas * relógio - soma dos inícios.
+
+from tcb import TCB
+
+
+def metricas_tarefa(tarefa: TCB, relogio: int, termino: int | None = None) -> dict:
+    """Métricas de uma tarefa ingressada até o relógio (ou até o término, se ela já terminou)."""
+    fim = relogio if termino is None else termino
+    bloqueado_io = tarefa.tempo_bloqueado_io
+    bloqueado_mutex = tarefa.tempo_bloqueado_mutex
+    if tarefa.inicio_bloqueio is not None and termino is None:
+        # Bloqueio em curso (a tarefa está em I/O ou aguardando mutex)
+        em_curso = max(relogio - tarefa.inicio_bloqueio, 0)
+        if tarefa.evento_io_ativo is not None:
+            bloqueado_io += em_curso
+        else:
+            bloqueado_mutex += em_curso
+    return {
+        "primeira_execucao": tarefa.intervalos_execucao[0][0] if tarefa.intervalos_execucao else None,
+        "resposta": tarefa.intervalos_execucao[0][0] - tarefa.ingresso if tarefa.intervalos_execucao else None,
+        "espera_prontas": fim - tarefa.ingresso - tarefa.tempo_executado - bloqueado_io - bloqueado_mutex,
+        "bloqueado_io": bloqueado_io,
+        "bloqueado_mutex": bloqueado_mutex,
+    }
+
+
+class MetricasSimulacao:
+    def __init__(self):
+        self.ticks_executados = 0  # Ticks em que alguma tarefa executou
+        self.ticks_ociosos = 0  # Ticks em que nenhuma tarefa executou
+        self.trocas_de_contexto = 0  # Vezes em que uma tarefa assumiu a CPU (= total de intervalos de execução)
+
+        self.tarefas_ingressadas = 0
+        self.tarefas_iniciadas = 0  # Tarefas que já executaram pelo menos um tick
+        self.tarefas_concluidas = 0
+        self.soma_ingresso_ativas = 0  # Soma dos ingressos das tarefas ingressadas e não concluídas
+        self.soma_resposta = 0  # Primeira execução - ingresso, das tarefas iniciadas
+        self.soma_retorno = 0  # Término - ingresso, das tarefas concluídas
+        self.retorno_max: int | None = None
+        self.soma_espera_concluidas = 0  # Espera na fila de prontas das tarefas concluídas
+
+        # Bloqueios: total dos já encerrados + (quantidade, soma dos inícios) dos em curso
+        self.bloqueio_io_encerrado = 0
+        self.bloqueadas_io = 0
+        self.soma_inicio_io = 0
+        self.bloqueio_mutex_encerrado = 0
+        self.bloqueadas_mutex = 0
+        self.soma_inicio_mutex = 0
+
+    # --- Acontecimentos (chamados pelo SistemaOperacional) ---
+
+    def chegada(self, tarefa: TCB):
+        self.tarefas_ingressadas += 1
+        self.soma_ingresso_ativas += tarefa.ingresso
+
+    def execucao(self, tarefa: TCB, relogio: int, n_ticks: int = 1):
+        """A tarefa executou nos ticks [relogio, relogio + n_ticks); chamar depois de registrar_execucao."""
+        self.ticks_executados += n_ticks
+        intervalos = tarefa.intervalos_execucao
+        if intervalos[-1][0] == relogio:
+            # Começou um intervalo novo: a tarefa acabou de assumir a CPU
+            self.trocas_de_contexto += 1
+            if len(intervalos) == 1:
+                self.tarefas_iniciadas += 1
+                self.soma_resposta += relogio - tarefa.ingresso
+
+    def ocioso(self, n_ticks: int = 1):
+        self.ticks_ociosos += n_ticks
+
+    def bloqueio_io(self, tarefa: TCB, relogio: int):
+        """A tarefa executou no tick relogio e foi para o I/O: fica bloqueada a partir do tick seguinte."""
+        tarefa.inicio_bloqueio = relogio + 1
+        self.bloqueadas_io += 1
+        self.soma_inicio_io += relogio + 1
+
+    def fim_io(self, tarefa: TCB, relogio: int):
+        duracao = relogio - tarefa.inicio_bloqueio
+        tarefa.tempo_bloqueado_io += duracao
+        self.bloqueio_io_encerrado += duracao
+        self.bloqueadas_io -= 1
+        self.soma_inicio_io -= tarefa.inicio_bloqueio
+        tarefa.inicio_bloqueio = None
+
+    def bloqueio_mutex(self, tarefa: TCB, relogio: int):
+        """A tarefa não conseguiu o mutex no tick relogio, que ela já não executa."""
+        tarefa.inicio_bloqueio = relogio
+        self.bloqueadas_mutex += 1
+        self.soma_inicio_mutex += relogio
+
+    def fim_mutex(self, tarefa: TCB, relogio: int):
+        duracao = relogio - tarefa.inicio_bloqueio
+        tarefa.tempo_bloqueado_mutex += duracao
+        self.bloqueio_mutex_encerrado += duracao
+        self.bloqueadas_mutex -= 1
+        self.soma_inicio_mutex -= tarefa.inicio_bloqueio
+        tarefa.inicio_bloqueio = None
+
+    def termino(self, tarefa: TCB, relogio: int):
+        """A tarefa executou o último tick em relogio."""
+        retorno = relogio + 1 - tarefa.ingresso
+        self.tarefas_concluidas += 1
+        self.soma_ingresso_ativas -= tarefa.ingresso
+        self.soma_retorno += retorno
+        self.retorno_max = retorno if self.retorno_max is None else max(self.retorno_max, retorno)
+        self.soma_espera_concluidas += retorno - tarefa.tempo_executado - tarefa.tempo_bloqueado_io - tarefa.tempo_bloqueado_mutex
+
+    # --- Leitura ---
+
+    def resumo(self, relogio: int) -> dict:
+        """Totais e médias no início do tick relogio (tudo o que aconteceu nos ticks [0, relogio))."""
+        bloqueado_io = self.bloqueio_io_encerrado + self.bloqueadas_io * relogio - self.soma_inicio_io
+        bloqueado_mutex = self.bloqueio_mutex_encerrado + self.bloqueadas_mutex * relogio - self.soma_inicio_mutex
+        ativas = self.tarefas_ingressadas - self.tarefas_concluidas
+        tempo_no_sistema = self.soma_retorno + ativas * relogio - self.soma_ingresso_ativas
+        espera = tempo_no_sistema - self.ticks_executados - bloqueado_io - bloqueado_mutex
+
+        media = lambda total, quantidade: total / quantidade if quantidade else None
+        return {
+            "ticks_executados": self.ticks_executados,
+            "ticks_ociosos": self.ticks_ociosos,
+            "trocas_de_contexto": self.trocas_de_contexto,
+            "tarefas_ingressadas": self.tarefas_ingressadas,
+            "tarefas_concluidas": self.tarefas_concluidas,
+            "espera_prontas_total": espera,
+            "bloqueado_io_total": bloqueado_io,
+            "bloqueado_mutex_total": bloqueado_mutex,
+            "espera_prontas_media": media(espera, self.tarefas_ingressadas),
+            "bloqueado_io_medio": media(bloqueado_io, self.tarefas_ingressadas),
+            "bloqueado_mutex_medio": media(bloqueado_mutex, self.tarefas_ingressadas),
+            "resposta_media": media(self.soma_resposta, self.tarefas_iniciadas),
+            "retorno_medio": media(self.soma_retorno, self.tarefas_concluidas),
+            "retorno_max": self.retorno_max,
+            "espera_media_concluidas": media(self.soma_espera_concluidas, self.tarefas_concluidas),
+            "utilizacao_cpu": media(self.ticks_executados, relogio),
+        }
@@ -0,0 +1,264 @@
+# Monte Carlo dos sorteios de desempate
+#
+# Quando todos os critérios de desempate empatam, o escalonador sorteia (Escalonador._escolher_do_heap),
+# então uma simulação é só uma amostra. Aqui o mesmo arquivo é simulado com N sementes (SistemaOperacional.semear)
+# e o resultado é a distribuição das métricas (metricas.py) e do término de cada tarefa.
+#
+# Trabalho compartilhado entre as sementes:
+# - Tudo antes do primeiro sorteio é igual para todas: a simulação roda uma vez até o início do tick do primeiro
+#   sorteio e esse estado (pickle) é o ponto de partida de todas as outras.
+# - Sementes que tiram os mesmos resultados seguem juntas numa única simulação (um ramo). Em cada sorteio o ramo
+#   calcula o resultado de cada semente do grupo; se elas divergem, segue com o maior grupo e cada um dos outros
+#   vira um ramo novo, que parte do mesmo ponto repetindo as escolhas feitas até ali.
+# - Cada processo do pool recebe o ponto de partida uma vez (inicializador) e grupos de sementes que concordam
+#   no primeiro sorteio.
+#
+# Uso:
+#   python monte_carlo.py config_srtf_same_arrival.txt --sementes 1000 --jobs 4
+#   python monte_carlo.py carga.txt --sementes 200 --formato json --saida distribuicao.json
+
+import argparse
+import json
+import math
+import pickle
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import registro
+import tabela_texto
+from config_handler import read_config
+from sistema_operacional import SistemaOperacional
+
+CAMPOS_DISTRIBUICAO = ["relogio_final", "retorno_medio", "retorno_max", "espera_prontas_media", "resposta_media",
+                       "trocas_de_contexto", "ticks_ociosos", "utilizacao_cpu"]
+
+_ponto_partida: bytes | None = None  # Estado serializado no início do tick do primeiro sorteio (ver _iniciar_processo)
+
+
+class _SorteioEncontrado(Exception):
+    def __init__(self, n_candidatas: int):
+        super().__init__(n_candidatas)
+        self.n_candidatas = n_candidatas
+
+
+class _GeradorSonda:
+    """Gerador da simulação de sondagem: interrompe a simulação no primeiro sorteio."""
+
+    def choice(self, candidatas):
+        raise _SorteioEncontrado(len(candidatas))
+
+
+class _GeradorRamificado:
+    """
+    Gerador de um ramo: repete as escolhas já feitas desde o ponto de partida e depois sorteia com os geradores
+    das sementes do grupo, separando em ramos novos as sementes que tiram outro resultado.
+    """
+
+    def __init__(self, escolhas: list[int], geradores: dict[int, random.Random]):
+        self.escolhas = list(escolhas)  # Índice escolhido em cada sorteio desde o ponto de partida
+        self.n_sorteios = 0
+        self.geradores = geradores  # semente -> gerador, das sementes que seguem neste ramo
+        self.ramos_novos: list[tuple[list[int], dict[int, random.Random]]] = []
+
+    def choice(self, candidatas):
+        if self.n_sorteios < len(self.escolhas):
+            indice = self.escolhas[self.n_sorteios]
+        else:
+            # choice(range(n)) consome o gerador exatamente como choice(candidatas) numa simulação isolada
+            grupos: dict[int, dict[int, random.Random]] = {}
+            for semente, gerador in self.geradores.items():
+                grupos.setdefault(gerador.choice(range(len(candidatas))), {})[semente] = gerador
+            indice = max(grupos, key=lambda i: len(grupos[i]))
+            for outro, grupo in grupos.items():
+                if outro != indice:
+                    self.ramos_novos.append((self.escolhas + [outro], grupo))
+            self.escolhas.append(indice)
+            self.geradores = grupos[indice]
+        self.n_sorteios += 1
+        return candidatas[indice]
+
+
+def _executar(so: SistemaOperacional, limite_ticks: int | None):
+    if limite_ticks is None:
+        so.run_to_completion()
+    else:
+        so.run_until(limite_ticks)
+
+
+def _resultado(so: SistemaOperacional) -> dict:
+    """Métricas de uma simulação terminada e o término de cada tarefa concluída."""
+    return {
+        "relogio_final": so.relogio,
+        "terminou": so.simulacao_terminada(),
+        **so.get_metricas(),
+        "termino": {tarefa.id: tarefa.intervalos_execucao[-1][1] for tarefa in so.tarefas_finalizadas},
+    }
+
+
+def _guardar_ponto_partida(ponto_partida: bytes):
+    global _ponto_partida
+    _ponto_partida = ponto_partida
+
+
+def _iniciar_processo(ponto_partida: bytes):
+    """
+    Inicializador do pool: guarda o ponto de partida uma vez por processo e desliga o registro.
+    Só para os processos do pool; no processo que chamou monte_carlo basta o registro.silenciado().
+    """
+    _guardar_ponto_partida(ponto_partida)
+    registro.desligar()
+
+
+def _simular_grupo(sementes: list[int], limite_ticks: int | None) -> tuple[dict[int, dict], int]:
+    """Simula as sementes a partir do ponto de partida; retorna (semente -> resultado, quantas simulações rodaram)."""
+    resultados = {}
+    ramos = [([], {semente: random.Random(semente) for semente in sementes})]
+    n_simulacoes = 0
+    while ramos:
+        escolhas, geradores = ramos.pop()
+        so = pickle.loads(_ponto_partida)
+        gerador = _GeradorRamificado(escolhas, geradores)
+        so.escalonador.gerador = gerador
+        _executar(so, limite_ticks)
+        n_simulacoes += 1
+        ramos.extend(gerador.ramos_novos)
+        resultado = _resultado(so)
+        for semente in gerador.geradores:
+            resultados[semente] = resultado
+    return resultados, n_simulacoes
+
+
+def _percentil(ordenados: list, p: float):
+    """Percentil pelo posto mais próximo (ordenados não vazio)."""
+    return ordenados[max(0, math.ceil(p * len(ordenados)) - 1)]
+
+
+def distribuicao(valores: list) -> dict | None:
+    """Média, desvio padrão, mínimo, mediana, percentil 90 e máximo dos valores (None são ignorados)."""
+    valores = sorted(valor for valor in valores if valor is not None)
+    if not valores:
+        return None
+    return {
+        "media": statistics.fmean(valores),
+        "desvio": statistics.pstdev(valores),
+        "minimo": valores[0],
+        "p50": _percentil(valores, 0.5),
+        "p90": _percentil(valores, 0.9),
+        "maximo": valores[-1],
+    }
+
+
+def monte_carlo(config_file: str, sementes: list[int], jobs: int = 1, limite_ticks: int | None = None) -> dict:
+    """
+    Simula config_file com cada semente e devolve a distribuição das métricas e do término de cada tarefa,
+    além de quantas simulações foram de fato executadas (sementes com os mesmos sorteios dividem uma só).
+    limite_ticks interrompe simulações que não terminam sozinhas (ex.: tarefas presas em mutex).
+    """
+    with registro.silenciado():
+        so = SistemaOperacional(read_config(config_file))
+        inicial = pickle.dumps(so, pickle.HIGHEST_PROTOCOL)
+
+        # 1. Sondagem: em que tick acontece o primeiro sorteio e entre quantas tarefas
+        so.escalonador.gerador = _GeradorSonda()
+        try:
+            _executar(so, limite_ticks)
+        except _SorteioEncontrado as sorteio:
+            tick_sorteio, n_candidatas = so.relogio, sorteio.n_candidatas
+        else:
+            # Nenhum sorteio: todas as sementes dão o mesmo resultado
+            resultado = _resultado(so)
+            return _resumo(config_file, {semente: resultado for semente in sementes}, n_simulacoes=1, tick_sorteio=None)
+
+        # 2. Ponto de partida: o estado no início do tick do primeiro sorteio
+        so = pickle.loads(inicial)
+        so.run_until(tick_sorteio)
+        ponto_partida = pickle.dumps(so, pickle.HIGHEST_PROTOCOL)
+
+    # 3. Agrupa as sementes pelo resultado do primeiro sorteio; grupos grandes são divididos entre os processos
+    grupos: dict[int, list[int]] = {}
+    for semente in sementes:
+        grupos.setdefault(random.Random(semente).choice(range(n_candidatas)), []).append(semente)
+    tamanho_maximo = max(1, math.ceil(len(sementes) / jobs))
+    lotes = [grupo[i:i + tamanho_maximo] for grupo in grupos.values() for i in range(0, len(grupo), tamanho_maximo)]
+
+    resultados, n_simulacoes = {}, 0
+    limites = [limite_ticks] * len(lotes)
+    if jobs > 1 and len(lotes) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_iniciar_processo, initargs=(ponto_partida,)) as executor:
+            parciais = list(executor.map(_simular_grupo, lotes, limites))
+    else:
+        with registro.silenciado():
+            _guardar_ponto_partida(ponto_partida)
+            parciais = [_simular_grupo(lote, limite_ticks) for lote in lotes]
+    for resultados_lote, simulacoes_lote in parciais:
+        resultados.update(resultados_lote)
+        n_simulacoes += simulacoes_lote
+
+    return _resumo(config_file, resultados, n_simulacoes, tick_sorteio)
+
+
+def _resumo(config_file: str, resultados: dict[int, dict], n_simulacoes: int, tick_sorteio: int | None) -> dict:
+    ids_tarefas = sorted({id_tarefa for resultado in resultados.values() for id_tarefa in resultado["termino"]})
+    return {
+        "arquivo": config_file,
+        "sementes": len(resultados),
+        "simulacoes": n_simulacoes,
+        "tick_primeiro_sorteio": tick_sorteio,
+        "terminaram": sum(resultado["terminou"] for resultado in resultados.values()),
+        "metricas": {campo: distribuicao([resultado[campo] for resultado in resultados.values()])
+                     for campo in CAMPOS_DISTRIBUICAO},
+        "termino": {id_tarefa: distribuicao([resultado["termino"].get(id_tarefa) for resultado in resultados.values()])
+                    for id_tarefa in ids_tarefas},
+    }
+
+
+def escrever_tabela(resumo: dict, saida):
+    """Cabeçalho com as contagens e uma tabela de distribuição para as métricas e outra para os términos."""
+    saida.write(f"{resumo['arquivo']}: {resumo['sementes']} sementes, {resumo['simulacoes']} simulações, "
+                f"{resumo['terminaram']} terminaram, primeiro sorteio no tick {tabela_texto.formatar(resumo['tick_primeiro_sorteio'])}\n")
+    colunas = ["media", "desvio", "minimo", "p50", "p90", "maximo"]
+    for titulo, distribuicoes in (("metrica", resumo["metricas"]), ("termino", resumo["termino"])):
+        linhas = [[nome] + [None if dist is None else dist[coluna] for coluna in colunas]
+                  for nome, dist in distribuicoes.items()]
+        saida.write("\n")
+        tabela_texto.escrever_tabela([titulo] + colunas, linhas, saida)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simula um arquivo com várias sementes e mostra a distribuição dos resultados dos sorteios de desempate.")
+    parser.add_argument("arquivo", help="arquivo de configuração")
+    parser.add_argument("--sementes", "-n", type=int, default=100, help="quantidade de sementes (padrão: 100)")
+    parser.add_argument("--semente-inicial", type=int, default=0, help="primeira semente; as demais são consecutivas")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="processos em paralelo")
+    parser.add_argument("--limite-ticks", type=int, help="interrompe cada simulação neste tick")
+    parser.add_argument("--formato", choices=["tabela", "json"], default="tabela")
+    parser.add_argument("--saida", "-o", help="arquivo de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    if args.sementes < 1:
+        parser.error("--sementes deve ser pelo menos 1")
+
+    sementes = list(range(args.semente_inicial, args.semente_inicial + args.sementes))
+    try:
+        resumo = monte_carlo(args.arquivo, sementes, jobs=args.jobs, limite_ticks=args.limite_ticks)
+    except Exception as e:
+        print(f"Erro ao simular {args.arquivo}: {e}", file=sys.stderr)
+        return 1
+
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        if args.formato == "json":
+            json.dump(resumo, saida, ensure_ascii=False, indent=2)
+            saida.write("\n")
+        else:
+            escrever_tabela(resumo, saida)
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+# Simulação multinúcleo (SMP)
+#
+# SistemaMultinucleo estende o SistemaOperacional para n núcleos. Cada núcleo executa a mesma política
+# (Escalonador) sobre a sua própria fila de prontas ou, com fila_global, todos retiram de uma fila única.
+# Chegadas vão para o núcleo menos carregado; tarefas que voltam de I/O ou de mutex, para o último núcleo em que
+# executaram (afinidade). Com filas por núcleo há dois balanceamentos:
+# - periódico: a cada intervalo_balanceamento ticks, tarefas passam da fila mais carregada para a menos carregada;
+# - roubo de trabalho: um núcleo ocioso com a fila vazia pega uma tarefa da fila mais longa.
+# Uma tarefa que passa a executar num núcleo diferente do anterior paga penalidade_migracao ticks
+# (o núcleo fica ocupado sem que ela avance), como o custo de recarregar a cache.
+#
+# I/O, mutexes, chegadas (inclusive a leitura sob demanda), métricas e desempate por sorteio são os do
+# SistemaOperacional; o núcleo de cada intervalo de execução fica em TCB.nucleos_execucao (ver GanttDiagram).
+# Envelhecimento (PRIOPEnv): como no SistemaOperacional, a fila de um núcleo só envelhece nos ticks em que ele
+# executou até o fim (não envelhece ocioso, nem quando a tarefa bloqueia em I/O ou mutex); a fila global envelhece
+# se algum núcleo executou. Uma tarefa bloqueada em mutex envelhece com a fila do núcleo em que executava quando
+# bloqueou. Como cada fila tem a sua época, uma tarefa que muda de fila leva o envelhecimento acumulado para a
+# prioridade dinâmica (_mover_tarefa).
+# O modo orientado a eventos só salta os trechos em que todos os núcleos estão ociosos.
+#
+# Uso (planejamento de capacidade: vazão e latência conforme núcleos são acrescentados):
+#   python multinucleo.py carga.txt --nucleos 1-8 --penalidade-migracao 2
+#   python multinucleo.py carga.txt --nucleos 1 2 4 --fila-global --formato csv --saida capacidade.csv
+
+import argparse
+import csv
+import json
+import pickle
+import random
+import sys
+
+import registro
+import tabela_texto
+from config_handler import read_config
+from escalonador import Escalonador
+from sistema_operacional import SistemaOperacional
+from tcb import TCB
+
+CAMPOS_CAPACIDADE = ["nucleos", "relogio_final", "terminou", "vazao", "retorno_medio", "retorno_max", "resposta_media",
+                     "espera_prontas_media", "utilizacao_cpu", "trocas_de_contexto", "migracoes", "roubos"]
+
+
+class Nucleo:
+    __slots__ = ("indice", "escalonador", "tarefa_executando", "quantum_atual", "penalidade_restante")
+
+    def __init__(self, indice: int, escalonador: Escalonador):
+        self.indice = indice
+        self.escalonador = escalonador  # Fila de prontas deste núcleo (a mesma para todos com fila global)
+        self.tarefa_executando: TCB | None = None
+        self.quantum_atual = 0
+        self.penalidade_restante = 0  # Ticks de migração que ainda faltam antes de a tarefa avançar
+
+
+class SistemaMultinucleo(SistemaOperacional):
+    def __init__(self, config_file, n_nucleos: int = 2, fila_global: bool = False, intervalo_balanceamento: int = 0,
+                 penalidade_migracao: int = 0, **opcoes):
+        """
+        n_nucleos: quantidade de CPUs. fila_global: uma fila de prontas compartilhada em vez de uma por núcleo.
+        intervalo_balanceamento: a cada quantos ticks equilibrar as filas (0 desliga; o roubo de trabalho fica sempre ativo).
+        penalidade_migracao: ticks perdidos quando uma tarefa volta a executar em outro núcleo.
+        As demais opções (sob_demanda, ao_finalizar, semente) são as do SistemaOperacional.
+        """
+        if n_nucleos < 1:
+            raise ValueError("A simulação precisa de pelo menos um núcleo")
+        super().__init__(config_file, **opcoes)
+        self.fila_global = fila_global
+        self.intervalo_balanceamento = intervalo_balanceamento
+        self.penalidade_migracao = penalidade_migracao
+
+        # O escalonador criado pelo SistemaOperacional é o do núcleo 0 (ou a fila global)
+        self.escalonadores = [self.escalonador]
+        if not fila_global:
+            self.escalonadores += [Escalonador(self.nome_escalonador, alpha=self.alpha) for _ in range(n_nucleos - 1)]
+            gerador = self.escalonador.gerador
+            for escalonador in self.escalonadores:
+                escalonador.gerador = gerador  # Um só gerador de sorteios para todos os núcleos
+        self.nucleos = [Nucleo(i, self.escalonadores[0 if fila_global else i]) for i in range(n_nucleos)]
+
+        self.escalonador_bloqueio: dict[TCB, Escalonador] = {}  # Tarefa bloqueada em mutex -> fila em cuja época envelhece
+        self.migracoes = 0  # Vezes em que uma tarefa voltou a executar em outro núcleo
+        self.roubos = 0  # Tarefas levadas de uma fila para outra pelo balanceamento
+        self.ticks_migracao = 0  # Ticks de núcleo gastos com penalidade de migração
+
+    def semear(self, semente: int | None):
+        """Como em SistemaOperacional.semear; o gerador é compartilhado pelos núcleos."""
+        gerador = None if semente is None else random.Random(semente)
+        # Chamado também por SistemaOperacional.__init__, antes de os outros núcleos existirem
+        for escalonador in getattr(self, "escalonadores", [self.escalonador]):
+            escalonador.gerador = gerador
+
+    def iniciar_rastro(self, caminho: str):
+        raise ValueError("O rastro binário registra uma única CPU; não está disponível na simulação multinúcleo")
+
+    # --- Filas ---
+
+    def _carga(self, nucleo: Nucleo) -> int:
+        return len(nucleo.escalonador.fila_tarefas_prontas) + (nucleo.tarefa_executando is not None)
+
+    @staticmethod
+    def _mover_tarefa(tarefa: TCB, origem: Escalonador, destino: Escalonador):
+        """
+        Coloca na fila do destino uma tarefa que envelhecia na época da origem: o envelhecimento acumulado vai para a
+        prioridade dinâmica e ela recomeça a envelhecer na época do destino.
+        """
+        if origem is not destino and tarefa.epoca_envelhecimento is not None:
+            tarefa.prioridade_dinamica = origem.get_prioridade_dinamica(tarefa)
+            tarefa.epoca_envelhecimento = None
+        destino.adicionar_tarefa_pronta(tarefa)
+
+    def _tornar_pronta(self, tarefa: TCB, afinidade: bool, origem: Escalonador | None = None) -> Escalonador:
+        """
+        Coloca a tarefa numa fila de prontas (com afinidade, a do último núcleo em que executou) e retorna o escalonador dela.
+        origem: escalonador em cuja época a tarefa já envelhecia (tarefas acordadas de mutex).
+        """
+        if self.fila_global:
+            escalonador = self.escalonador
+        elif afinidade and tarefa.nucleos_execucao:
+            escalonador = self.nucleos[tarefa.nucleos_execucao[-1]].escalonador
+        else:
+            escalonador = min(self.nucleos, key=self._carga).escalonador
+        self._mover_tarefa(tarefa, escalonador if origem is None else origem, escalonador)
+        return escalonador
+
+    def _solicitar_mutex(self, tarefa: TCB, mutex_id: int) -> bool:
+        """Como no SistemaOperacional, mas a tarefa bloqueada envelhece na época da fila do núcleo em que executava."""
+        if self.gerenciador_mutex.solicitar(tarefa, mutex_id):
+            return True
+        self.metricas.bloqueio_mutex(tarefa, self.relogio)
+        escalonador = next(nucleo.escalonador for nucleo in self.nucleos if nucleo.tarefa_executando is tarefa)
+        escalonador.iniciar_envelhecimento(tarefa)
+        self.escalonador_bloqueio[tarefa] = escalonador
+        return False
+
+    def _acordar_tarefa_mutex(self, tarefa: TCB):
+        self.metricas.fim_mutex(tarefa, self.relogio)
+        self._tornar_pronta(tarefa, afinidade=True, origem=self.escalonador_bloqueio.pop(tarefa))
+
+    def _balancear(self):
+        """Passa tarefas da fila do núcleo mais carregado para o menos carregado até a diferença ser no máximo 1."""
+        for _ in range(len(self.tarefas)):
+            mais = max(self.nucleos, key=self._carga)
+            menos = min(self.nucleos, key=self._carga)
+            if self._carga(mais) - self._carga(menos) <= 1:
+                return
+            tarefa = mais.escalonador.ceder_tarefa()
+            if tarefa is None:
+                return
+            self._mover_tarefa(tarefa, mais.escalonador, menos.escalonador)
+            self.roubos += 1
+
+    def _roubar_tarefa(self, nucleo: Nucleo):
+        """Núcleo ocioso e sem fila: pega uma tarefa da fila mais longa que não seria executada neste tick."""
+        vitima = max(self.nucleos, key=lambda outro: len(outro.escalonador.fila_tarefas_prontas) - (outro.tarefa_executando is None))
+        sobrando = len(vitima.escalonador.fila_tarefas_prontas) - (vitima.tarefa_executando is None)
+        if vitima is nucleo or sobrando < 1:
+            return
+        self._mover_tarefa(vitima.escalonador.ceder_tarefa(), vitima.escalonador, nucleo.escalonador)
+        self.roubos += 1
+
+    def _escalonar_nucleo(self, nucleo: Nucleo):
+        """Escolhe a próxima tarefa do núcleo (como SistemaOperacional._escalonar) e aplica a penalidade de migração."""
+        escalonador = nucleo.escalonador
+        escalonador.set_tarefa_atual(nucleo.tarefa_executando)
+        tarefa = escalonador.escalonar()
+        nucleo.tarefa_executando = tarefa
+        nucleo.quantum_atual = 0
+        nucleo.penalidade_restante = 0
+        if escalonador.houve_sorteio():
+            self.ticks_com_sorteio.add(self.relogio)
+        if tarefa is not None:
+            registro.debug("sched", "Tarefa %s escalonada no núcleo %s", tarefa.id, nucleo.indice)
+            if tarefa.nucleos_execucao and tarefa.nucleos_execucao[-1] != nucleo.indice:
+                self.migracoes += 1
+                nucleo.penalidade_restante = self.penalidade_migracao
+
+    def _liberar_nucleo(self, nucleo: Nucleo):
+        nucleo.escalonador.set_tarefa_atual(nucleo.tarefa_executando)
+        nucleo.tarefa_executando = None
+        self._escalonar_nucleo(nucleo)
+
+    # --- Tick ---
+
+    def executar_tick(self):
+        self._executar_tick()
+
+    def _executar_tick(self):
+        registro.tick_atual = self.relogio
+        filas_alteradas = set()  # Escalonadores que receberam tarefas neste tick (para a preempção por chegada)
+
+        # 1. Fim de I/O e chegadas
+        if self.fila_IO:
+            for tarefa in self.fila_IO.retirar_concluidas(self.relogio):
+                registro.debug("io", "Tarefa %s concluiu I/O", tarefa.id)
+                self.metricas.fim_io(tarefa, self.relogio)
+                filas_alteradas.add(id(self._tornar_pronta(tarefa, afinidade=True)))
+
+        if self.relogio in self.tarefas_no_ingresso:
+            for tarefa in self.tarefas_no_ingresso[self.relogio]:
+                tarefa.prioridade_dinamica = tarefa.prioridade
+                self.metricas.chegada(tarefa)
+                filas_alteradas.add(id(self._tornar_pronta(tarefa, afinidade=False)))
+            if self.tarefas_pendentes is not None:
+                del self.tarefas_no_ingresso[self.relogio]
+                self._ler_proximo_ingresso()
+
+        # 2. Balanceamento periódico e roubo de trabalho pelos núcleos ociosos
+        if not self.fila_global:
+            if self.intervalo_balanceamento and self.relogio % self.intervalo_balanceamento == 0:
+                self._balancear()
+            for nucleo in self.nucleos:
+                if nucleo.tarefa_executando is None and not nucleo.escalonador.fila_tarefas_prontas:
+                    self._roubar_tarefa(nucleo)
+
+        # 3. Núcleos ociosos escolhem uma tarefa antes de qualquer preempção
+        for nucleo in self.nucleos:
+            if nucleo.tarefa_executando is None:
+                self._escalonar_nucleo(nucleo)
+
+        # 4. Preempção por chegada (SRTF, PRIOP, PRIOPEnv) nos núcleos cuja fila recebeu tarefas
+        if self.preempcao_por_chegada and filas_alteradas:
+            for nucleo in self.nucleos:
+                tarefa = nucleo.tarefa_executando
+                if (tarefa is not None and id(nucleo.escalonador) in filas_alteradas
+                        and nucleo.escalonador.deve_preemptar(tarefa)):
+                    nucleo.escalonador.adicionar_tarefa_pronta(tarefa)
+                    self._liberar_nucleo(nucleo)
+
+        # 5. Cada núcleo executa um tick
+        envelhecer = set()  # Escalonadores dos núcleos que executaram até o fim do tick
+        for nucleo in self.nucleos:
+            if self._executar_nucleo(nucleo):
+                envelhecer.add(id(nucleo.escalonador))
+
+        # Envelhecimento só nas filas cujo núcleo executou (regra do SistemaOperacional, por núcleo)
+        for escalonador in self.escalonadores:
+            if id(escalonador) in envelhecer:
+                escalonador.aplicar_envelhecimento()
+
+        self.relogio += 1
+
+    def _executar_nucleo(self, nucleo: Nucleo) -> bool:
+        """
+        Um tick do núcleo: mesmos passos do SistemaOperacional (mutex, execução, I/O, término, quantum).
+        Retorna se a fila do núcleo envelhece neste tick: não quando ele fica ocioso nem quando a tarefa bloqueia em I/O
+        ou mutex (os ticks de penalidade de migração contam como execução).
+        """
+        tarefa = nucleo.tarefa_executando
+        if tarefa is None:
+            self.metricas.ocioso()
+            return False
+        if nucleo.penalidade_restante > 0:
+            nucleo.penalidade_restante -= 1
+            self.ticks_migracao += 1
+            return True
+
+        tempo_execucao_tarefa = tarefa.tempo_executado + 1
+        if tarefa.lista_eventos and self._processar_eventos_mutex(tarefa, tempo_execucao_tarefa):
+            self._liberar_nucleo(nucleo)
+            self.metricas.ocioso()  # Ninguém executou neste núcleo
+            return False
+
+        tarefa.registrar_execucao(self.relogio, 1, nucleo.indice)
+        self.metricas.execucao(tarefa, self.relogio)
+        tarefa.tempo_restante -= 1
+
+        eventos = tarefa.lista_eventos
+        indice = tarefa.indice_proximo_evento
+        while indice < len(eventos) and eventos[indice].inicio == tempo_execucao_tarefa:
+            evento = eventos[indice]
+            if evento.tipo == "IO":
+                tarefa.evento_io_ativo = evento
+                self.fila_IO.adicionar(tarefa, self.relogio)
+                self.metricas.bloqueio_io(tarefa, self.relogio)
+                registro.debug("io", "Tarefa %s bloqueada em I/O por %s ticks", tarefa.id, evento.duracao)
+                self._liberar_nucleo(nucleo)
+                return False
+            indice += 1
+
+        nucleo.quantum_atual += 1
+        if tarefa.tempo_executado >= tarefa.duracao:
+            registro.info("sched", "Tarefa %s terminou no núcleo %s.", tarefa.id, nucleo.indice)
+            self.metricas.termino(tarefa, self.relogio)
+            self._liberar_todos_mutexes_tarefa(tarefa)
+            if self.ao_finalizar is not None:
+                self._descartar_tarefa(tarefa)
+            else:
+                self.tarefas_finalizadas.append(tarefa)
+                self.conjunto_finalizadas.add(tarefa)
+            self._liberar_nucleo(nucleo)
+        elif nucleo.quantum_atual >= self.quantum and self.preempcao_por_quantum:
+            nucleo.escalonador.adicionar_tarefa_pronta(tarefa)
+            self._liberar_nucleo(nucleo)
+        return True
+
+    # --- Modo orientado a eventos: só salta trechos com todos os núcleos ociosos e as filas vazias ---
+
+    def _proximo_instante_relevante(self) -> int | None:
+        if any(nucleo.tarefa_executando is not None for nucleo in self.nucleos):
+            return self.relogio
+        if any(escalonador.fila_tarefas_prontas for escalonador in self.escalonadores):
+            return self.relogio
+        candidatos = [instante for instante in (self._proxima_chegada(), self.fila_IO.proxima_conclusao()) if instante is not None]
+        return min(candidatos) if candidatos else None
+
+    def _avancar_ticks_sem_eventos(self, n_ticks: int):
+        if n_ticks <= 0:
+            return
+        # Todos os núcleos ociosos: como no SistemaOperacional, não há envelhecimento
+        self.metricas.ocioso(n_ticks * len(self.nucleos))
+        self.relogio += n_ticks
+
+    # --- Consultas ---
+
+    def get_tarefas_executando(self) -> list[TCB | None]:
+        """Tarefa de cada núcleo (None se ocioso)."""
+        return [nucleo.tarefa_executando for nucleo in self.nucleos]
+
+    def get_estado_tarefa(self, tarefa: TCB) -> str:
+        for nucleo in self.nucleos:
+            if tarefa is nucleo.tarefa_executando:
+                return f"EXECUTANDO (núcleo {nucleo.indice})"
+        if tarefa not in self.conjunto_finalizadas and any(tarefa in e.fila_tarefas_prontas for e in self.escalonadores):
+            return "PRONTA"
+        return super().get_estado_tarefa(tarefa)
+
+    def get_metricas(self) -> dict:
+        """Métricas do SistemaOperacional; a utilização é a média dos núcleos. Inclui migrações e roubos."""
+        metricas = super().get_metricas()
+        if self.relogio:
+            metricas["utilizacao_cpu"] = metricas["ticks_executados"] / (self.relogio * len(self.nucleos))
+        metricas["nucleos"] = len(self.nucleos)
+        metricas["migracoes"] = self.migracoes
+        metricas["roubos"] = self.roubos
+        metricas["ticks_migracao"] = self.ticks_migracao
+        return metricas
+
+
+def capacidade(config_file: str, lista_nucleos: list[int], semente: int | None = None, limite_ticks: int | None = None,
+               **opcoes) -> list[dict]:
+    """Simula config_file com cada quantidade de núcleos e retorna vazão, latência e utilização de cada uma."""
+    with registro.silenciado():
+        dados_config = read_config(config_file)
+    tarefas_serializadas = pickle.dumps(dados_config["tarefas"], pickle.HIGHEST_PROTOCOL)
+    resultados = []
+    for n_nucleos in lista_nucleos:
+        # Cada simulação recebe uma cópia nova das tarefas: as TCBs passam a pertencer ao sistema
+        dados_config["tarefas"] = pickle.loads(tarefas_serializadas)
+        with registro.silenciado():
+            so = SistemaMultinucleo(dados_config, n_nucleos=n_nucleos, semente=semente, **opcoes)
+            if limite_ticks is None:
+                so.run_to_completion()
+            else:
+                so.run_until(limite_ticks)
+        metricas = so.get_metricas()
+        resultados.append({
+            "relogio_final": so.relogio,
+            "terminou": so.simulacao_terminada(),
+            "vazao": metricas["tarefas_concluidas"] / so.relogio if so.relogio else None,
+            **{campo: metricas[campo] for campo in CAMPOS_CAPACIDADE if campo in metricas},
+        })
+    return resultados
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simula um arquivo com 1, 2, ... núcleos e compara vazão e latência.")
+    parser.add_argument("arquivo", help="arquivo de configuração")
+    parser.add_argument("--nucleos", nargs="+", default=["1-4"], help="quantidades de núcleos; aceita intervalos (ex.: 1-8 16)")
+    parser.add_argument("--fila-global", action="store_true", help="uma fila de prontas compartilhada por todos os núcleos")
+    parser.add_argument("--balanceamento", type=int, default=0, metavar="TICKS", help="intervalo do balanceamento periódico (0 desliga)")
+    parser.add_argument("--penalidade-migracao", type=int, default=0, metavar="TICKS", help="ticks perdidos ao mudar de núcleo")
+    parser.add_argument("--semente", type=int, help="semente dos sorteios de desempate")
+    parser.add_argument("--limite-ticks", type=int, help="interrompe cada simulação neste tick")
+    parser.add_argument("--formato", choices=["tabela", "csv", "json"], default="tabela")
+    parser.add_argument("--saida", "-o", help="arquivo de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    try:
+        lista_nucleos = tabela_texto.inteiros(args.nucleos)
+    except ValueError:
+        parser.error("--nucleos aceita inteiros ou intervalos como 1-8")
+    if any(n < 1 for n in lista_nucleos):
+        parser.error("a quantidade de núcleos deve ser pelo menos 1")
+
+    try:
+        resultados = capacidade(args.arquivo, lista_nucleos, semente=args.semente, limite_ticks=args.limite_ticks,
+                                fila_global=args.fila_global, intervalo_balanceamento=args.balanceamento,
+                                penalidade_migracao=args.penalidade_migracao)
+    except Exception as e:
+        print(f"Erro ao simular {args.arquivo}: {e}", file=sys.stderr)
+        return 1
+
+    saida = open(args.saida, "w", newline="", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        if args.formato == "json":
+            json.dump(resultados, saida, ensure_ascii=False, indent=2)
+            saida.write("\n")
+        elif args.formato == "csv":
+            writer = csv.DictWriter(saida, fieldnames=CAMPOS_CAPACIDADE)
+            writer.writeheader()
+            writer.writerows(resultados)
+        else:
+            linhas = [[resultado.get(campo) for campo in CAMPOS_CAPACIDADE] for resultado in resultados]
+            tabela_texto.escrever_tabela(CAMPOS_CAPACIDADE, linhas, saida)
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
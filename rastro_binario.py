@@ -0,0 +1,189 @@
+# Rastro binário do escalonamento
+#
+# Arquivo só de acréscimo com um registro de largura fixa por trecho de ticks:
+#   (tick, tarefa que executou, motivo do escalonamento, eventos, tamanho das filas de prontas, I/O e mutex)
+# Um registro vale do seu tick até o tick do próximo registro. Ticks seguidos sem nenhuma mudança
+# (inclusive os saltados pelo modo orientado a eventos) são gravados como um único registro.
+#
+# Layout do arquivo:
+#   cabeçalho | registros | índice (1 número de registro a cada TICKS_POR_BLOCO ticks) | ids das tarefas (JSON) | rodapé
+# O índice permite ao LeitorRastro (mmap) achar o registro de qualquer tick em O(1): vai direto ao bloco do tick
+# e faz uma busca binária dentro dele.
+
+import json
+import mmap
+import struct
+from typing import NamedTuple
+
+MAGICO = b"SORASTRO"
+VERSAO = 1
+TICKS_POR_BLOCO = 4096
+
+CABECALHO = struct.Struct("<8sHHI")  # mágico, versão, tamanho do registro, ticks por bloco
+REGISTRO = struct.Struct("<QiBBxxIII")  # tick, tarefa (-1 = CPU ociosa), motivo, eventos, prontas, I/O, mutex
+INDICE = struct.Struct("<Q")
+RODAPE = struct.Struct("<QQQQQ8s")  # n_registros, tick_final, offset do índice, n_blocos, offset dos ids, mágico
+
+# Motivo da última troca de tarefa no tick
+MOTIVO_NENHUM = 0
+MOTIVO_CPU_LIVRE = 1
+MOTIVO_PREEMPCAO = 2
+MOTIVO_MUTEX = 3
+MOTIVO_IO = 4
+MOTIVO_TERMINO = 5
+MOTIVO_QUANTUM = 6
+
+NOMES_MOTIVOS = {
+    MOTIVO_NENHUM: "-",
+    MOTIVO_CPU_LIVRE: "CPU livre",
+    MOTIVO_PREEMPCAO: "preempção",
+    MOTIVO_MUTEX: "bloqueio por mutex",
+    MOTIVO_IO: "bloqueio por I/O",
+    MOTIVO_TERMINO: "término",
+    MOTIVO_QUANTUM: "fim do quantum",
+}
+
+# Eventos ocorridos no tick (máscara de bits)
+EVENTO_CHEGADA = 1
+EVENTO_FIM_IO = 2
+EVENTO_INICIO_IO = 4
+EVENTO_BLOQUEIO_MUTEX = 8
+EVENTO_TERMINO = 16
+EVENTO_SORTEIO = 32
+EVENTO_PREEMPCAO = 64
+
+NOMES_EVENTOS = {
+    EVENTO_CHEGADA: "chegada",
+    EVENTO_FIM_IO: "fim de I/O",
+    EVENTO_INICIO_IO: "início de I/O",
+    EVENTO_BLOQUEIO_MUTEX: "bloqueio por mutex",
+    EVENTO_TERMINO: "término",
+    EVENTO_SORTEIO: "sorteio",
+    EVENTO_PREEMPCAO: "preempção",
+}
+
+
+class RegistroRastro(NamedTuple):
+    tick: int
+    tarefa: str | None  # Tarefa que executou no tick (None = CPU ociosa)
+    motivo: int
+    eventos: int
+    prontas: int
+    io: int
+    mutex: int
+
+    def descricao(self) -> str:
+        eventos = ", ".join(nome for bit, nome in NOMES_EVENTOS.items() if self.eventos & bit) or "-"
+        return (f"Tick {self.tick}: {self.tarefa or 'ociosa'} | motivo: {NOMES_MOTIVOS.get(self.motivo, '?')} | "
+                f"eventos: {eventos} | prontas: {self.prontas}, I/O: {self.io}, mutex: {self.mutex}")
+
+
+class GravadorRastro:
+    """Grava o rastro de uma simulação, um trecho de ticks por vez, em ordem crescente de tick."""
+
+    def __init__(self, caminho: str, ids_tarefas: list[str]):
+        self.arquivo = open(caminho, "wb")
+        self.ids_tarefas = ids_tarefas
+        self.arquivo.write(CABECALHO.pack(MAGICO, VERSAO, REGISTRO.size, TICKS_POR_BLOCO))
+        self.n_registros = 0
+        self.ultimo = None  # Campos (exceto o tick) do último registro gravado
+        self.indice: list[int] = []  # Bloco -> número do registro que cobre o primeiro tick do bloco
+
+    def _preencher_indice(self, ate_tick: int):
+        """Aponta para o último registro gravado todos os blocos que começam antes de ate_tick."""
+        while len(self.indice) * TICKS_POR_BLOCO < ate_tick:
+            self.indice.append(self.n_registros - 1)
+
+    def gravar(self, tick: int, tarefa: int, motivo: int, eventos: int, prontas: int, io: int, mutex: int):
+        """Registra o estado a partir de tick. Se nada mudou desde o último registro, ele apenas continua valendo."""
+        campos = (tarefa, motivo, eventos, prontas, io, mutex)
+        if campos == self.ultimo and motivo == MOTIVO_NENHUM and eventos == 0:
+            return
+        self._preencher_indice(tick)
+        if len(self.indice) * TICKS_POR_BLOCO == tick:
+            self.indice.append(self.n_registros)
+        self.arquivo.write(REGISTRO.pack(tick, *campos))
+        self.n_registros += 1
+        self.ultimo = campos
+
+    def fechar(self, tick_final: int):
+        """Grava índice, ids e rodapé. tick_final é o relógio ao fim da simulação (o último registro vale até ele)."""
+        self._preencher_indice(tick_final)
+        offset_indice = self.arquivo.tell()
+        for numero_registro in self.indice:
+            self.arquivo.write(INDICE.pack(numero_registro))
+        offset_ids = self.arquivo.tell()
+        self.arquivo.write(json.dumps(self.ids_tarefas).encode("utf-8"))
+        self.arquivo.write(RODAPE.pack(self.n_registros, tick_final, offset_indice, len(self.indice), offset_ids, MAGICO))
+        self.arquivo.close()
+
+    def descartar(self):
+        """Fecha o arquivo sem índice nem rodapé: o rastro fica incompleto e não pode ser lido."""
+        self.arquivo.close()
+
+
+class LeitorRastro:
+    """Lê um rastro com mmap: o arquivo não é carregado na memória, só as páginas consultadas."""
+
+    def __init__(self, caminho: str):
+        with open(caminho, "rb") as arquivo:
+            self.mmap = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, versao, tamanho_registro, self.ticks_por_bloco = CABECALHO.unpack_from(self.mmap, 0)
+        if magico != MAGICO or versao != VERSAO or tamanho_registro != REGISTRO.size:
+            self.mmap.close()
+            raise ValueError(f"Arquivo de rastro inválido: {caminho}")
+
+        offset_rodape = len(self.mmap) - RODAPE.size
+        (self.n_registros, self.tick_final, self.offset_indice, self.n_blocos,
+         offset_ids, magico) = RODAPE.unpack_from(self.mmap, offset_rodape)
+        if magico != MAGICO:
+            self.mmap.close()
+            raise ValueError(f"Arquivo de rastro incompleto: {caminho}")
+        self.ids_tarefas: list[str] = json.loads(self.mmap[offset_ids:offset_rodape].decode("utf-8"))
+
+    def _tick_do_registro(self, numero: int) -> int:
+        return struct.unpack_from("<Q", self.mmap, CABECALHO.size + numero * REGISTRO.size)[0]
+
+    def _numero_registro(self, tick: int) -> int:
+        """Número do registro que cobre o tick: o último com tick de início <= tick."""
+        bloco = tick // self.ticks_por_bloco
+        inicio = INDICE.unpack_from(self.mmap, self.offset_indice + bloco * INDICE.size)[0]
+        if bloco + 1 < self.n_blocos:
+            fim = INDICE.unpack_from(self.mmap, self.offset_indice + (bloco + 1) * INDICE.size)[0]
+        else:
+            fim = self.n_registros - 1
+
+        # Busca binária dentro do bloco
+        while inicio < fim:
+            meio = (inicio + fim + 1) // 2
+            if self._tick_do_registro(meio) <= tick:
+                inicio = meio
+            else:
+                fim = meio - 1
+        return inicio
+
+    def registro_no_tick(self, tick: int) -> RegistroRastro:
+        """Estado da simulação no tick (0 <= tick < tick_final)."""
+        if not 0 <= tick < self.tick_final:
+            raise IndexError(f"Tick {tick} fora do rastro (0 a {self.tick_final - 1})")
+        numero = self._numero_registro(tick)
+        tick_registro, tarefa, motivo, eventos, prontas, io, mutex = REGISTRO.unpack_from(
+            self.mmap, CABECALHO.size + numero * REGISTRO.size
+        )
+        if tick_registro != tick:
+            # Ticks seguintes de um trecho agrupado: nenhuma troca nem evento neles
+            motivo, eventos = MOTIVO_NENHUM, 0
+        return RegistroRastro(tick, self.ids_tarefas[tarefa] if tarefa >= 0 else None, motivo, eventos, prontas, io, mutex)
+
+    def __len__(self) -> int:
+        return self.tick_final
+
+    def fechar(self):
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,120 @@
+# Registro (trace) das mensagens do simulador
+#
+# Substitui os print() espalhados pelo motor. Cada mensagem tem uma categoria e um nível:
+# - categorias: "sched" (escalonamento, término, sorteio), "mutex", "io" e "parse" (leitura da configuração)
+# - níveis: DEBUG < INFO < AVISO < ERRO
+#
+# A mensagem é formatada só se o nível estiver habilitado para a categoria (argumentos no estilo "%s"),
+# então com o registro desligado cada chamada custa apenas uma comparação.
+# Opcionalmente, os registros ficam num buffer circular (deque) que a interface pode mostrar.
+#
+# Padrão: imprime no terminal as mesmas mensagens de antes (nível INFO para cima), sem buffer.
+
+import contextlib
+from collections import deque
+from typing import NamedTuple
+
+DEBUG = 10
+INFO = 20
+AVISO = 30
+ERRO = 40
+DESLIGADO = 100  # Limiar acima de qualquer nível: nada é registrado
+
+CATEGORIAS = ("sched", "mutex", "io", "parse")
+
+
+class EntradaRegistro(NamedTuple):
+    tick: int | None  # Tick em que a mensagem foi gerada (None fora da simulação, ex.: leitura da configuração)
+    categoria: str
+    nivel: int
+    mensagem: str
+
+
+_limiares: dict[str, int] = {categoria: INFO for categoria in CATEGORIAS}  # Nível mínimo registrado por categoria
+_imprimir = True
+_buffer: deque[EntradaRegistro] | None = None
+
+tick_atual: int | None = None  # Atualizado pelo SistemaOperacional a cada tick
+
+
+def configurar(nivel: int = INFO, categorias=None, imprimir: bool = True, tamanho_buffer: int = 0):
+    """
+    Define o que é registrado e para onde vai.
+    categorias: categorias habilitadas (None = todas); as demais ficam desligadas.
+    imprimir: imprime as mensagens no terminal.
+    tamanho_buffer: guarda os últimos N registros em memória (0 = sem buffer).
+    """
+    global _imprimir, _buffer
+    _imprimir = imprimir
+    _buffer = deque(maxlen=tamanho_buffer) if tamanho_buffer > 0 else None
+
+    # Sem destino nenhum, desliga tudo para que as chamadas não formatem nada
+    if not imprimir and _buffer is None:
+        nivel = DESLIGADO
+
+    for categoria in CATEGORIAS:
+        habilitada = categorias is None or categoria in categorias
+        _limiares[categoria] = nivel if habilitada else DESLIGADO
+
+
+def desligar():
+    """Desliga o registro completamente (usado nas execuções em lote)."""
+    configurar(imprimir=False)
+
+
+@contextlib.contextmanager
+def silenciado():
+    """Desliga o registro dentro do bloco e restaura a configuração anterior ao sair."""
+    limiares_anteriores = dict(_limiares)
+    for categoria in CATEGORIAS:
+        _limiares[categoria] = DESLIGADO
+    try:
+        yield
+    finally:
+        _limiares.update(limiares_anteriores)
+
+
+def habilitado(categoria: str, nivel: int) -> bool:
+    return nivel >= _limiares[categoria]
+
+
+def registrar(categoria: str, nivel: int, mensagem: str, *args):
+    if nivel < _limiares[categoria]:
+        return
+    texto = mensagem % args if args else mensagem
+    if _imprimir:
+        print(texto)
+    if _buffer is not None:
+        _buffer.append(EntradaRegistro(tick_atual, categoria, nivel, texto))
+
+
+def debug(categoria: str, mensagem: str, *args):
+    registrar(categoria, DEBUG, mensagem, *args)
+
+
+def info(categoria: str, mensagem: str, *args):
+    registrar(categoria, INFO, mensagem, *args)
+
+
+def aviso(categoria: str, mensagem: str, *args):
+    registrar(categoria, AVISO, mensagem, *args)
+
+
+def erro(categoria: str, mensagem: str, *args):
+    registrar(categoria, ERRO, mensagem, *args)
+
+
+def ultimos_registros(n: int | None = None) -> list[EntradaRegistro]:
+    """Os últimos n registros do buffer (todos se n for None), do mais antigo para o mais recente."""
+    if _buffer is None:
+        return []
+    registros = list(_buffer)
+    return registros if n is None else registros[-n:]
+
+
+def descartar_a_partir_do_tick(tick: int):
+    """Remove do buffer os registros gerados no tick informado ou depois (usado ao regredir a simulação)."""
+    if _buffer is None:
+        return
+    while _buffer and _buffer[-1].tick is not None and _buffer[-1].tick >= tick:
+        _buffer.pop()
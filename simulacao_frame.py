@@ -1,14 +1,28 @@
-import copy
 import customtkinter
 from sistema_operacional import SistemaOperacional
-from gantt_diagram import GanttDiagram
-import platform
+from historico import HistoricoSimulacao
+from cache_resultados import PARTES, CacheResultados, cacheavel
+from rastro_binario import LeitorRastro
+import registro
+from gantt_diagram import GanttDiagram, segmentos_barra
 import os
-import subprocess
-from datetime import datetime
-from PIL import ImageGrab, Image  # type: ignore
-import copy  # Importante para salvar o histórico de estados
-from image_helper import convert_ps_to_png_pillow_with_white_bg, convert_ps_to_png_with_white_bg
+import pickle
+import tempfile
+# PIL, image_helper, platform e subprocess só servem à captura de tela e são importados em take_screenshot,
+# para não atrasar a abertura da interface (e para a simulação funcionar mesmo sem o Pillow instalado)
+
+# Cor de cada estado de tarefa no painel de inspeção
+CORES_ESTADO_TAREFA = {
+    "FINALIZADA": "#4CAF50",       # Verde
+    "EXECUTANDO": "#2196F3",       # Azul
+    "BLOQUEADA I/O": "#FF6F00",    # Laranja escuro
+    "BLOQUEADA MUTEX": "#E91E63",  # Rosa/Magenta
+    "PRONTA": "#FF9800",           # Laranja claro
+    "NÃO INGRESSADA": "#757575",   # Cinza
+    "DESCONHECIDO": "#9C27B0",     # Roxo
+}
+
+ALTURA_LINHA_TCB = 215  # Altura (px) de cada linha do painel de tarefas, espaçamento incluído
 
 class SimulacaoFrame(customtkinter.CTkFrame):
     def __init__(self, master, voltar_ao_menu_callback):
@@ -17,7 +31,18 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         self.voltar_ao_menu_callback = voltar_ao_menu_callback
         self.gantt_diagram = None
         self.sistema_operacional = None
-        self.historico_estados = []  # Para guardar os "snapshots" da simulação
+        self.historico = None  # Quadros-chave da simulação para poder regredir ticks
+        self.rastro = None  # Leitor do rastro binário, aberto quando a simulação termina
+        self.caminho_rastro = None  # Arquivo temporário do rastro, gravado enquanto a simulação avança
+
+        # Cache em disco dos resultados (cache_resultados.py): a interface não usa semente, então só entram
+        # simulações sem sorteio de desempate. chave_cache é a entrada da configuração aberta, se ela já estava no cache.
+        try:
+            self.cache = CacheResultados()
+        except OSError:
+            self.cache = None
+        self.apelido_cache = None
+        self.chave_cache = None
 
         # Widgets da tela de simulação (declarados aqui para fácil acesso)
         self.simulation_frame = None
@@ -32,11 +57,49 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         self.quantum_label = None
         self.finalizadas_label = None
         self.ativas_label = None
+        self.metricas_label = None
+        self.linha_tempo_slider = None
+        self.linha_tempo_label = None
+
+
+    def carregar_sistema(self, config_file: str) -> SistemaOperacional:
+        """Sistema operacional no tick 0: do cache, se o arquivo já foi simulado, ou lendo o arquivo."""
+        self.apelido_cache = self.chave_cache = None
+        if self.cache is not None:
+            try:
+                self.apelido_cache = self.cache.apelido(config_file, None)
+            except OSError:
+                pass  # O erro de leitura sai do SistemaOperacional, abaixo
+            else:
+                self.chave_cache = self.cache.resolver_apelido(self.apelido_cache)
 
+        if self.chave_cache is not None:
+            inicial = self.cache.carregar_estado(self.chave_cache, "inicial")
+            if inicial is not None:
+                return inicial
+            self.chave_cache = self.cache.resolver_apelido(self.apelido_cache)  # None se a entrada ilegível saiu do cache
+        return SistemaOperacional(config_file)
+
+    def guardar_no_cache(self):
+        """Guarda a simulação terminada no cache (tick 0, estado final, resultado e rastro), se ela ainda não está completa lá."""
+        from lote import resultado_simulacao  # lote carrega o multiprocessing; só é preciso ao fim da simulação
+
+        so = self.sistema_operacional
+        if self.cache is None or not cacheavel(so, None):
+            return
+        chave = self.cache.chave(so, None)
+        if all(self.cache.caminho_parte(chave, parte) for parte in PARTES):
+            return
+        try:
+            self.cache.guardar(chave, resultado_simulacao(so), apelido=self.apelido_cache, caminho_rastro=self.caminho_rastro,
+                               inicial=self.historico.quadros[0][0], final=pickle.dumps(so, pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            return  # Sem espaço ou sem permissão: fica sem cache
+        self.chave_cache = chave
 
     def create_simulation_ui(self, config_file: str):
         try:
-            self.sistema_operacional = SistemaOperacional(config_file)
+            self.sistema_operacional = self.carregar_sistema(config_file)
         except Exception as e:
             print(f"Erro ao iniciar simulação: {e}")
             # Botão: Voltar ao Menu
@@ -53,7 +116,10 @@ class SimulacaoFrame(customtkinter.CTkFrame):
             )
             reset_button.pack(side="left", padx=10)
             return
-        self.historico_estados = []  # Limpa o histórico para uma nova simulação
+        self.historico = HistoricoSimulacao(self.sistema_operacional)  # Histórico novo para a nova simulação
+        self.caminho_rastro = self._novo_arquivo_rastro()
+        self.historico.iniciar_rastro(self.caminho_rastro)  # O rastro é gravado junto com os ticks
+        registro.configurar(tamanho_buffer=200)  # Continua imprimindo e guarda os últimos registros para o painel
 
         # --- Construção da Interface de Simulação ---
         self.simulation_frame = customtkinter.CTkFrame(self, fg_color="transparent")
@@ -81,6 +147,9 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         self.ativas_label = customtkinter.CTkLabel(self.info_frame, text="🏃 Ativas: Nenhuma", font=("Arial", 18))
         self.ativas_label.pack(side="left", padx=20)
 
+        self.metricas_label = customtkinter.CTkLabel(self.info_frame, text="📊 Métricas: -", font=("Arial", 14))
+        self.metricas_label.pack(side="left", padx=20)
+
         # -- 2. Frame Principal (Centro) - Split entre Gantt e Inspeção de TCBs --
         main_content_frame = customtkinter.CTkFrame(self.simulation_frame, fg_color="transparent")
         main_content_frame.pack(fill="both", expand=True, padx=20, pady=10)
@@ -100,11 +169,30 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         )
         tcb_title.pack(pady=(10, 5))
         
-        # Scrollable frame para as informações das tarefas
-        self.tcb_scrollable = customtkinter.CTkScrollableFrame(
-            self.tcb_panel_frame, label_text="Estado das Tarefas", label_font=("Arial", 16)
-        )
-        self.tcb_scrollable.pack(fill="both", expand=True, padx=10, pady=10)
+        # Resumo (mutexes, fila de prontas, fila de I/O): seções criadas uma vez e só atualizadas a cada tick
+        self.tcb_resumo_frame = customtkinter.CTkFrame(self.tcb_panel_frame, fg_color="transparent")
+        self.tcb_resumo_frame.pack(fill="x", padx=10)
+        self.tcb_secoes = {}
+        self.tcb_separador = customtkinter.CTkFrame(self.tcb_resumo_frame, height=2)
+        self.tcb_secoes_visiveis = None
+
+        # Lista das tarefas: um conjunto fixo de linhas reaproveitadas conforme a rolagem,
+        # então só existem widgets para as tarefas visíveis
+        lista_frame = customtkinter.CTkFrame(self.tcb_panel_frame)
+        lista_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        lista_titulo = customtkinter.CTkLabel(lista_frame, text="Estado das Tarefas", font=("Arial", 16))
+        lista_titulo.pack(pady=(5, 0))
+
+        self.tcb_scrollbar = customtkinter.CTkScrollbar(lista_frame, command=self._rolar_painel_tcb)
+        self.tcb_scrollbar.pack(side="right", fill="y")
+
+        self.tcb_linhas_frame = customtkinter.CTkFrame(lista_frame, fg_color="transparent")
+        self.tcb_linhas_frame.pack(side="left", fill="both", expand=True)
+        self.tcb_linhas_frame.bind("<Configure>", self._ajustar_linhas_tcb)
+        self._vincular_roda_mouse(self.tcb_linhas_frame)
+        self.tcb_linhas = []  # Linhas reaproveitáveis: {"frame", "header", "detalhes", "conteudo"}
+        self.tcb_primeira_linha = 0  # Índice (em so.tarefas) da tarefa mostrada na primeira linha
 
         # -- 3. Frame de Controles (Baixo) --
         self.control_frame = customtkinter.CTkFrame(self.simulation_frame)
@@ -143,43 +231,65 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         )
         screenshot_button.pack(side="left", padx=10)
 
+        # Linha do tempo: habilitada quando a simulação termina, lê cada tick do rastro binário
+        linha_tempo_frame = customtkinter.CTkFrame(self.control_frame, fg_color="transparent")
+        linha_tempo_frame.pack(fill="x", padx=20, pady=(0, 10))
+
+        self.linha_tempo_slider = customtkinter.CTkSlider(
+            linha_tempo_frame, from_=0, to=1, command=self.mostrar_tick_rastro, state="disabled"
+        )
+        self.linha_tempo_slider.set(0)
+        self.linha_tempo_slider.pack(side="left", fill="x", expand=True, padx=10)
+
+        self.linha_tempo_label = customtkinter.CTkLabel(
+            linha_tempo_frame, text="Linha do tempo disponível ao fim da simulação", font=("Arial", 14), width=700, anchor="w"
+        )
+        self.linha_tempo_label.pack(side="left", padx=10)
+
         # Inicia e exibe o estado inicial (tick 0)
         self.atualizar_diagrama()
 
     def proximo_tick(self):
-        """Salva o estado atual, executa um tick e atualiza a UI."""
+        """Executa um tick (o histórico guarda quadros-chave periodicamente) e atualiza a UI."""
         if not self.sistema_operacional.simulacao_terminada():
-            # Salva o estado ATUAL antes de executar o próximo tick
-            try:
-                self.historico_estados.append(copy.deepcopy(self.sistema_operacional))
-            except Exception as e:
-                print(f"Erro ao salvar estado para histórico: {e}")
-            finally:
-                self.sistema_operacional.executar_tick()
-                self.atualizar_diagrama()
+            self.historico.avancar()
+            self.atualizar_diagrama()
 
         # Atualiza o estado dos botões
         if self.sistema_operacional.simulacao_terminada():
             self.next_tick_button.configure(state="disabled")
             self.run_to_end_button.configure(state="disabled")
+            self.abrir_rastro()
             self.take_screenshot()  # Tira screenshot automático ao finalizar
         
         self.prev_tick_button.configure(state="normal") # Sempre podemos regredir depois de avançar
 
     def tick_anterior(self):
-        """Restaura o estado anterior do histórico e atualiza a UI."""
-        if self.historico_estados:
-            # Pega o último estado salvo e o restaura
-            self.sistema_operacional = self.historico_estados.pop()
+        """Restaura o estado do tick anterior a partir do histórico e atualiza a UI."""
+        self.fechar_rastro()  # A linha do tempo vale só para a simulação terminada
+        if self.historico.pode_voltar():
+            # Restaura o quadro-chave mais próximo e reexecuta até o tick anterior
+            self.sistema_operacional = self.historico.voltar()
             self.atualizar_diagrama()
 
         # Atualiza o estado dos botões
-        if not self.historico_estados:
+        if not self.historico.pode_voltar():
             self.prev_tick_button.configure(state="disabled") # Desabilita se não há mais histórico
         
         self.next_tick_button.configure(state="normal") # Sempre podemos avançar depois de regredir
         self.run_to_end_button.configure(state="normal")
 
+    @staticmethod
+    def texto_metricas(metricas: dict) -> str:
+        """Resumo das métricas para a barra de informações (médias por tarefa ingressada)."""
+        formatar = lambda valor: "-" if valor is None else f"{valor:.1f}"
+        return (f"📊 Espera: {formatar(metricas['espera_prontas_media'])}"
+                f" | I/O: {formatar(metricas['bloqueado_io_medio'])}"
+                f" | Mutex: {formatar(metricas['bloqueado_mutex_medio'])}"
+                f" | Resposta: {formatar(metricas['resposta_media'])}"
+                f" | Trocas: {metricas['trocas_de_contexto']}"
+                f" | Ocioso: {metricas['ticks_ociosos']}")
+
     def atualizar_diagrama(self):
         """Atualiza o diagrama de Gantt e todas as informações na tela."""
         so = self.sistema_operacional
@@ -202,29 +312,31 @@ class SimulacaoFrame(customtkinter.CTkFrame):
             self.tarefa_exec_label.configure(text="Executando: Nenhuma")
         self.ativas_label.configure(text=f"🏃 Prontas: {len(fila_prontas)}")
         self.finalizadas_label.configure(text=f"✅ Finalizadas: {len(so.tarefas_finalizadas)}/{len(todas_tarefas)}")
-
-        # Recria o diagrama de Gantt no frame correto
-        if self.gantt_diagram:
-            self.gantt_diagram.destroy()
+        self.metricas_label.configure(text=self.texto_metricas(so.get_metricas()))
 
         # Passa os ticks com sorteio para o diagrama
         ticks_sorteio = getattr(so, 'ticks_com_sorteio', set())
-        self.gantt_diagram = GanttDiagram(self.gantt_frame, current_time, tarefas, ticks_sorteio)
-        self.gantt_diagram.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # O diagrama de Gantt é criado uma vez por simulação e depois só atualizado
+        if self.gantt_diagram is None:
+            self.gantt_diagram = GanttDiagram(self.gantt_frame, current_time, tarefas, ticks_sorteio)
+            self.gantt_diagram.pack(fill="both", expand=True, padx=10, pady=10)
+        else:
+            self.gantt_diagram.atualizar(current_time, tarefas, ticks_sorteio)
         
         # Atualiza o painel de inspeção de TCBs
         self.atualizar_painel_tcb()
 
     def avancar_ate_fim(self):
-        """Executa a simulação até o fim, salvando cada passo no histórico."""
-        while not self.sistema_operacional.simulacao_terminada():
-            # Ainda salvamos o histórico para poder regredir passo a passo depois
-            try:
-                self.historico_estados.append(copy.deepcopy(self.sistema_operacional)) # Adicionar um método que funcione com o Queue depois
-            except Exception as e:
-                print(f"Erro ao salvar estado para histórico: {e}")
-            finally:
-                self.sistema_operacional.executar_tick()
+        """
+        Executa a simulação até o fim; o histórico guarda quadros-chave para poder regredir passo a passo depois.
+        Se o estado final já está no cache, salta direto para ele.
+        """
+        final = None if self.chave_cache is None else self.cache.carregar_estado(self.chave_cache, "final")
+        if final is not None:
+            self.sistema_operacional = self.historico.saltar_para(final)
+        else:
+            self.historico.avancar_ate_fim()
 
         self.atualizar_diagrama()
         self.update() # Força a atualização da UI
@@ -233,69 +345,92 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         self.next_tick_button.configure(state="disabled")
         self.run_to_end_button.configure(state="disabled")
         self.prev_tick_button.configure(state="normal") # Garante que podemos regredir
+        self.abrir_rastro()
         self.take_screenshot()  # Tira screenshot automático ao finalizar
 
+    @staticmethod
+    def _novo_arquivo_rastro() -> str:
+        descritor, caminho = tempfile.mkstemp(suffix=".rastro")
+        os.close(descritor)
+        return caminho
+
+    def abrir_rastro(self):
+        """
+        Fecha o rastro binário gravado durante a simulação terminada e habilita a linha do tempo.
+        Se um retrocesso (ou o salto para o estado final do cache) interrompeu a gravação, copia o rastro do cache
+        ou reexecuta a simulação para gravá-lo. A simulação terminada vai para o cache.
+        """
+        self.fechar_rastro()
+        if self.sistema_operacional.get_relogio() == 0:
+            return
+
+        if self.caminho_rastro is None:
+            self.caminho_rastro = self._novo_arquivo_rastro()
+        if (self.historico.rastro_continuo() or self.chave_cache is None
+                or not self.cache.copiar_rastro(self.chave_cache, self.caminho_rastro)):
+            self.historico.gravar_rastro(self.caminho_rastro)
+        self.rastro = LeitorRastro(self.caminho_rastro)
+        self.guardar_no_cache()
+
+        ultimo_tick = len(self.rastro) - 1
+        self.linha_tempo_slider.configure(
+            state="normal", from_=0, to=max(ultimo_tick, 1), number_of_steps=max(ultimo_tick, 1)
+        )
+        self.linha_tempo_slider.set(ultimo_tick)
+        self.mostrar_tick_rastro(ultimo_tick)
+
+    def fechar_rastro(self):
+        """Fecha e apaga o rastro temporário e desabilita a linha do tempo."""
+        if self.rastro is None:
+            return
+        self.rastro.fechar()
+        os.remove(self.caminho_rastro)
+        self.rastro = None
+        self.caminho_rastro = None
+
+        if self.linha_tempo_slider is not None and self.linha_tempo_slider.winfo_exists():
+            self.linha_tempo_slider.configure(state="disabled")
+            self.linha_tempo_label.configure(text="Linha do tempo disponível ao fim da simulação")
+        if self.gantt_diagram is not None:
+            self.gantt_diagram.marcar_tick(None)
+
+    def mostrar_tick_rastro(self, valor):
+        """Mostra o que aconteceu no tick escolhido na linha do tempo e destaca a coluna no diagrama."""
+        if self.rastro is None:
+            return
+        tick = min(int(round(valor)), len(self.rastro) - 1)
+        self.linha_tempo_label.configure(text=self.rastro.registro_no_tick(tick).descricao())
+        self.gantt_diagram.marcar_tick(tick)
+
     def resetar_simulacao(self):
         """Destrói a UI da simulação e volta para o menu principal."""
+        self.fechar_rastro()
+        if self.historico is not None:
+            self.historico.descartar_rastro()  # Simulação não terminada: o rastro em gravação fica incompleto
+        if self.caminho_rastro is not None:
+            os.remove(self.caminho_rastro)
+            self.caminho_rastro = None
         if self.simulation_frame:
             self.simulation_frame.destroy()
 
         self.gantt_diagram = None
         self.sistema_operacional = None
-        self.historico_estados = []
+        self.historico = None
         
         self.voltar_ao_menu_callback()
 
 
     def atualizar_painel_tcb(self):
-        """Atualiza o painel de inspeção das TCBs com informações em tempo real."""
-        # Limpa o conteúdo anterior
-        for widget in self.tcb_scrollable.winfo_children():
-            widget.destroy()
-        
+        """Atualiza o painel de inspeção das TCBs, mexendo só nos textos e cores que mudaram."""
         so = self.sistema_operacional
-        tarefa_executando = so.get_tarefa_executando()
         fila_prontas = so.escalonador.fila_tarefas_prontas
-        todas_tarefas = so.tarefas
-        tarefas_finalizadas = so.tarefas_finalizadas
         fila_io = so.fila_IO
-        mutexes = so.mutexes
-        
-        # Coleta tarefas bloqueadas por mutex
-        tarefas_bloqueadas_mutex = set()
-        for mutex_id, mutex_info in mutexes.items():
-            for tarefa in mutex_info["fila_espera"]:
-                tarefas_bloqueadas_mutex.add(tarefa["id"])
-        
-        # Função para determinar estado da tarefa
-        def get_estado_tarefa(tarefa):
-            if tarefa in tarefas_finalizadas:
-                return "FINALIZADA", "#4CAF50"  # Verde
-            elif tarefa == tarefa_executando:
-                return "EXECUTANDO", "#2196F3"  # Azul
-            elif tarefa in fila_io:
-                return "BLOQUEADA I/O", "#FF6F00"  # Laranja escuro
-            elif tarefa["id"] in tarefas_bloqueadas_mutex:
-                return "BLOQUEADA MUTEX", "#E91E63"  # Rosa/Magenta
-            elif tarefa in fila_prontas:
-                return "PRONTA", "#FF9800"      # Laranja claro
-            elif tarefa['ingresso'] > so.relogio:
-                return "NÃO INGRESSADA", "#757575"  # Cinza
-            else:
-                return "DESCONHECIDO", "#9C27B0"   # Roxo
+        mutexes = so.gerenciador_mutex.mutexes
         
         # === PAINEL DE MUTEXES ===
+        texto_mutexes = None
         if mutexes:
-            mutex_frame = customtkinter.CTkFrame(self.tcb_scrollable)
-            mutex_frame.pack(fill="x", padx=5, pady=10)
-            
-            mutex_title = customtkinter.CTkLabel(
-                mutex_frame,
-                text="🔒 Estado dos Mutexes:",
-                font=("Arial", 16, "bold")
-            )
-            mutex_title.pack(pady=5)
-            
+            linhas_mutex = []
             for mutex_id, mutex_info in mutexes.items():
                 dono = mutex_info["dono"]
                 fila_espera = mutex_info["fila_espera"]
@@ -308,150 +443,215 @@ class SimulacaoFrame(customtkinter.CTkFrame):
                 if fila_espera:
                     esperando = ", ".join([t['id'] for t in fila_espera])
                     dono_text += f" | ⏳ Esperando: {esperando}"
-                
-                mutex_label = customtkinter.CTkLabel(
-                    mutex_frame,
-                    text=dono_text,
-                    font=("Consolas", 14),
-                    wraplength=350
-                )
-                mutex_label.pack(padx=10, pady=2)
-        
-        # Separador
-        separator = customtkinter.CTkFrame(self.tcb_scrollable, height=2)
-        separator.pack(fill="x", padx=5, pady=5)
+                linhas_mutex.append(dono_text)
+            texto_mutexes = "\n".join(linhas_mutex)
 
         # Informações da fila de prontas
+        texto_prontas = None
         if fila_prontas:
-            fila_frame = customtkinter.CTkFrame(self.tcb_scrollable)
-            fila_frame.pack(fill="x", padx=5, pady=10)
-            
-            fila_title = customtkinter.CTkLabel(
-                fila_frame,
-                text="🚦 Fila de Prontas:",
-                font=("Arial", 16, "bold")
-            )
-            fila_title.pack(pady=5)
             # Mostra prioridade dinâmica se for PRIOPENV
             if so.nome_escalonador.lower() == "priopenv":
-                fila_text = " → ".join([
-                    f"{t['id']}(p{t['prioridade']}→{t.get('prioridade_dinamica', t['prioridade'])})"
+                texto_prontas = " → ".join([
+                    f"{t['id']}(p{t['prioridade']}→{so.escalonador.get_prioridade_dinamica(t)})"
                     for t in fila_prontas
                 ])
             else:
-                fila_text = " → ".join([f"{t['id']}(p{t['prioridade']})" for t in fila_prontas])
-            
-            fila_label = customtkinter.CTkLabel(
-                fila_frame,
-                text=fila_text,
-                font=("Consolas", 14),
-                wraplength=350
-            )
-            fila_label.pack(padx=10, pady=(0, 10))
+                texto_prontas = " → ".join([f"{t['id']}(p{t['prioridade']})" for t in fila_prontas])
 
         # Fila de I/O
+        texto_io = None
         if fila_io:
-            io_frame = customtkinter.CTkFrame(self.tcb_scrollable)
-            io_frame.pack(fill="x", padx=5, pady=10)
-            
-            io_title = customtkinter.CTkLabel(
-                io_frame,
-                text="🖥️ Fila de I/O:",
-                font=("Arial", 16, "bold")
-            )
-            io_title.pack(pady=5)
-            
             # Mostra evento de IO ativo de cada tarefa
             io_text_parts = []
             for t in fila_io:
-                # Usa o evento_io_ativo se disponível
-                evento = t.get("evento_io_ativo")
-                if evento and evento['tempo_restante'] > 0:
+                # Tempo restante calculado a partir do tick de conclusão do I/O
+                restante = fila_io.tempo_restante(t, so.relogio)
+                if restante > 0:
                     io_text_parts.append(
-                        f"{t['id']}(restante:{evento['tempo_restante']})"
+                        f"{t['id']}(restante:{restante})"
                     )
                 else:
                     io_text_parts.append(f"{t['id']}")
             
-            io_text = " → ".join(io_text_parts) if io_text_parts else "Vazia"
-            
-            io_label = customtkinter.CTkLabel(
-                io_frame,
-                text=io_text,
-                font=("Consolas", 14),
-                wraplength=350
-            )
-            io_label.pack(padx=10, pady=(0, 10))
-        
-        # Lista todas as tarefas com suas informações
-        for tarefa in todas_tarefas:
-            estado, cor = get_estado_tarefa(tarefa)
-            
-            # Frame principal da tarefa
-            tarefa_frame = customtkinter.CTkFrame(
-                self.tcb_scrollable, 
-                fg_color=cor, 
-                corner_radius=8
-            )
-            tarefa_frame.pack(fill="x", padx=5, pady=3)
-            
-            # Header da tarefa
-            header_frame = customtkinter.CTkFrame(tarefa_frame, fg_color="transparent")
-            header_frame.pack(fill="x", padx=10, pady=5)
-            
-            task_id_label = customtkinter.CTkLabel(
-                header_frame,
-                text=f"📋 {tarefa['id']} ({estado})",
-                font=("Arial", 16, "bold"),
-                text_color="white"
-            )
-            task_id_label.pack(side="left")
-            
-            # Detalhes da tarefa
-            details_text = f"⏰ Ingresso: {tarefa['ingresso']}\n"
-            details_text += f"⭐ Prioridade: {tarefa['prioridade']}\n"
-            
-            if 'tempo_restante' in tarefa and so.nome_escalonador.lower() == 'srtf':
-                details_text += f"⏳ Restante: {tarefa['tempo_restante']}\n"
-            if so.nome_escalonador.lower() == "priopenv":
-                details_text += f"⚡ Prioridade Dinâmica: {tarefa.get('prioridade_dinamica', tarefa['prioridade'])}\n"
-            
-            executed_ticks = len(tarefa['tempos_de_execucao'])
-            details_text += f"✔️ Executado: {executed_ticks}/{tarefa['duracao']} ticks\n"
-            
-            if tarefa['tempos_de_execucao']:
-                recent_ticks = tarefa['tempos_de_execucao'][-5:]  # Últimos 5 ticks
-                details_text += f"🔄 Últimos ticks: {recent_ticks}\n"
-            
-            # Mostra eventos pendentes (I/O e Mutex)
-            if tarefa['lista_eventos']:
-                eventos_pendentes = []
-                for ev in tarefa['lista_eventos']:
-                    if ev['tipo'] == 'IO':
-                        if ev['tempo_restante'] > 0 or ev['inicio'] > executed_ticks:
-                            eventos_pendentes.append(f"IO@{ev['inicio']}")
-                    elif ev['tipo'] == 'ML':
-                        if ev['inicio'] > executed_ticks:
-                            eventos_pendentes.append(f"ML{ev['mutex_id']}@{ev['inicio']}")
-                    elif ev['tipo'] == 'MU':
-                        if ev['inicio'] > executed_ticks:
-                            eventos_pendentes.append(f"MU{ev['mutex_id']}@{ev['inicio']}")
-                if eventos_pendentes:
-                    details_text += f"📅 Eventos: {', '.join(eventos_pendentes[:4])}"
-                    if len(eventos_pendentes) > 4:
-                        details_text += f"... (+{len(eventos_pendentes)-4})"
-            
-            details_label = customtkinter.CTkLabel(
-                tarefa_frame,
-                text=details_text,
-                font=("Consolas", 16),
-                text_color="white",
-                justify="left"
-            )
-            details_label.pack(padx=10, pady=(0, 10), anchor="w")
-        
-
-
+            texto_io = " → ".join(io_text_parts) if io_text_parts else "Vazia"
+
+        # Últimas mensagens do simulador (buffer do módulo registro)
+        ultimos = registro.ultimos_registros(5)
+        texto_registros = "\n".join(
+            f"[{entrada.tick}] {entrada.mensagem}" if entrada.tick is not None else entrada.mensagem
+            for entrada in ultimos
+        ) if ultimos else None
+
+        self._atualizar_resumo_tcb([
+            ("mutexes", "🔒 Estado dos Mutexes:", texto_mutexes),
+            ("prontas", "🚦 Fila de Prontas:", texto_prontas),
+            ("io", "🖥️ Fila de I/O:", texto_io),
+            ("registros", "📝 Últimos Eventos:", texto_registros),
+        ])
+
+        # Lista das tarefas (mantém a posição da rolagem dentro dos limites)
+        self._definir_primeira_linha_tcb(self.tcb_primeira_linha)
+
+    def _atualizar_resumo_tcb(self, secoes):
+        """Atualiza as seções do resumo; uma seção sem texto fica escondida. O separador fica sempre após os mutexes."""
+        for chave, titulo, texto in secoes:
+            if texto is None:
+                continue
+            secao = self.tcb_secoes.get(chave)
+            if secao is None:
+                frame = customtkinter.CTkFrame(self.tcb_resumo_frame)
+                titulo_label = customtkinter.CTkLabel(frame, text=titulo, font=("Arial", 16, "bold"))
+                titulo_label.pack(pady=5)
+                label = customtkinter.CTkLabel(frame, text=texto, font=("Consolas", 14), wraplength=350)
+                label.pack(padx=10, pady=(0, 10))
+                secao = self.tcb_secoes[chave] = {"frame": frame, "label": label, "texto": texto}
+            elif secao["texto"] != texto:
+                secao["label"].configure(text=texto)
+                secao["texto"] = texto
+
+        # Só reorganiza o layout quando alguma seção aparece ou some
+        visiveis = tuple(chave for chave, _, texto in secoes if texto is not None)
+        if visiveis == self.tcb_secoes_visiveis:
+            return
+        self.tcb_secoes_visiveis = visiveis
+
+        for widget in self.tcb_resumo_frame.winfo_children():
+            widget.pack_forget()
+        for chave, _, texto in secoes:
+            if texto is not None:
+                self.tcb_secoes[chave]["frame"].pack(fill="x", padx=5, pady=10)
+            if chave == "mutexes":
+                self.tcb_separador.pack(fill="x", padx=5, pady=5)
+
+    def _conteudo_linha_tcb(self, tarefa):
+        """Textos e cor da linha de uma tarefa no painel: (cabeçalho, detalhes, cor)."""
+        so = self.sistema_operacional
+        estado = so.get_estado_tarefa(tarefa)
+        cor = CORES_ESTADO_TAREFA[estado]
+
+        # Detalhes da tarefa
+        details_text = f"⏰ Ingresso: {tarefa['ingresso']}\n"
+        details_text += f"⭐ Prioridade: {tarefa['prioridade']}\n"
+        
+        if 'tempo_restante' in tarefa and so.nome_escalonador.lower() == 'srtf':
+            details_text += f"⏳ Restante: {tarefa['tempo_restante']}\n"
+        if so.nome_escalonador.lower() == "priopenv":
+            details_text += f"⚡ Prioridade Dinâmica: {so.escalonador.get_prioridade_dinamica(tarefa)}\n"
+        
+        executed_ticks = tarefa['tempo_executado']
+        details_text += f"✔️ Executado: {executed_ticks}/{tarefa['duracao']} ticks\n"
+        
+        if tarefa['intervalos_execucao']:
+            recent_ticks = tarefa.ultimos_ticks(5)  # Últimos 5 ticks
+            details_text += f"🔄 Últimos ticks: {recent_ticks}\n"
+        
+        # Mostra eventos pendentes (I/O e Mutex)
+        if tarefa['lista_eventos']:
+            eventos_pendentes = []
+            for ev in tarefa['lista_eventos']:
+                if ev['tipo'] == 'IO':
+                    if ev['tempo_restante'] > 0 or ev['inicio'] > executed_ticks:
+                        eventos_pendentes.append(f"IO@{ev['inicio']}")
+                elif ev['tipo'] == 'ML':
+                    if ev['inicio'] > executed_ticks:
+                        eventos_pendentes.append(f"ML{ev['mutex_id']}@{ev['inicio']}")
+                elif ev['tipo'] == 'MU':
+                    if ev['inicio'] > executed_ticks:
+                        eventos_pendentes.append(f"MU{ev['mutex_id']}@{ev['inicio']}")
+            if eventos_pendentes:
+                details_text += f"📅 Eventos: {', '.join(eventos_pendentes[:4])}"
+                if len(eventos_pendentes) > 4:
+                    details_text += f"... (+{len(eventos_pendentes)-4})"
+
+        return f"📋 {tarefa['id']} ({estado})", details_text, cor
+
+    def _vincular_roda_mouse(self, widget):
+        # Windows/macOS usam <MouseWheel>; Linux usa os botões 4 e 5
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(evento, self._rolar_painel_tcb_roda)
+
+    def _criar_linha_tcb(self):
+        """Cria uma linha (ainda vazia e fora do layout) para o painel de tarefas."""
+        frame = customtkinter.CTkFrame(self.tcb_linhas_frame, height=ALTURA_LINHA_TCB - 6, corner_radius=8)
+        frame.pack_propagate(False)  # Altura fixa: a rolagem é feita em linhas inteiras
+
+        header = customtkinter.CTkLabel(frame, text="", font=("Arial", 16, "bold"), text_color="white")
+        header.pack(padx=10, pady=5, anchor="w")
+
+        detalhes = customtkinter.CTkLabel(frame, text="", font=("Consolas", 16), text_color="white", justify="left")
+        detalhes.pack(padx=10, pady=(0, 10), anchor="w")
+
+        for widget in (frame, header, detalhes):
+            self._vincular_roda_mouse(widget)
+        return {"frame": frame, "header": header, "detalhes": detalhes, "conteudo": None}
+
+    def _ajustar_linhas_tcb(self, event=None):
+        """Cria ou destrói linhas para que existam apenas as que cabem na altura do painel."""
+        altura = self.tcb_linhas_frame.winfo_height()
+        n_linhas = max(1, -(-altura // ALTURA_LINHA_TCB))  # Arredonda para cima: a última pode aparecer pela metade
+
+        while len(self.tcb_linhas) < n_linhas:
+            self.tcb_linhas.append(self._criar_linha_tcb())
+        while len(self.tcb_linhas) > n_linhas:
+            self.tcb_linhas.pop()["frame"].destroy()
+
+        if self.sistema_operacional is not None:
+            self._definir_primeira_linha_tcb(self.tcb_primeira_linha)
+
+    def _definir_primeira_linha_tcb(self, primeira):
+        """Rola a lista de tarefas para que a tarefa de índice primeira fique no topo."""
+        total = len(self.sistema_operacional.tarefas)
+        linhas_inteiras = max(1, self.tcb_linhas_frame.winfo_height() // ALTURA_LINHA_TCB)
+        self.tcb_primeira_linha = max(0, min(primeira, total - linhas_inteiras))
+        self._atualizar_linhas_tcb()
+
+    def _rolar_painel_tcb(self, *args):
+        """Comando da barra de rolagem: ("moveto", fração) ou ("scroll", n, "units" | "pages")."""
+        total = len(self.sistema_operacional.tarefas)
+        if args[0] == "moveto":
+            primeira = round(float(args[1]) * total)
+        else:
+            passo = int(args[1]) * (len(self.tcb_linhas) if args[2] == "pages" else 1)
+            primeira = self.tcb_primeira_linha + passo
+        self._definir_primeira_linha_tcb(primeira)
+
+    def _rolar_painel_tcb_roda(self, event):
+        passo = -1 if (event.num == 4 or event.delta > 0) else 1
+        self._definir_primeira_linha_tcb(self.tcb_primeira_linha + passo)
+
+    def _atualizar_linhas_tcb(self):
+        """Preenche as linhas visíveis com as tarefas a partir de tcb_primeira_linha, reconfigurando só o que mudou."""
+        tarefas = self.sistema_operacional.tarefas
+        for i, linha in enumerate(self.tcb_linhas):
+            indice = self.tcb_primeira_linha + i
+            conteudo = self._conteudo_linha_tcb(tarefas[indice]) if indice < len(tarefas) else None
+            anterior = linha["conteudo"]
+            if conteudo == anterior:
+                continue
+
+            if conteudo is None:
+                # Sobram linhas só no fim da lista, então esconder não altera a ordem das demais
+                linha["frame"].pack_forget()
+            else:
+                header_text, details_text, cor = conteudo
+                if anterior is None:
+                    linha["frame"].pack(fill="x", padx=5, pady=3)
+                    anterior = (None, None, None)
+                if header_text != anterior[0]:
+                    linha["header"].configure(text=header_text)
+                if details_text != anterior[1]:
+                    linha["detalhes"].configure(text=details_text)
+                if cor != anterior[2]:
+                    linha["frame"].configure(fg_color=cor)
+            linha["conteudo"] = conteudo
+
+        # Barra de rolagem proporcional à parte visível da lista
+        if tarefas:
+            inicio = self.tcb_primeira_linha / len(tarefas)
+            fim = min(1.0, (self.tcb_primeira_linha + len(self.tcb_linhas)) / len(tarefas))
+            self.tcb_scrollbar.set(inicio, fim)
+        else:
+            self.tcb_scrollbar.set(0.0, 1.0)
 
     def take_screenshot(self):
         """Salva a tela inteira da simulação como PNG."""
@@ -459,6 +659,10 @@ class SimulacaoFrame(customtkinter.CTkFrame):
             print("❌ Erro: Nenhuma simulação disponível para capturar.")
             return
         
+        import platform
+        import subprocess
+        from datetime import datetime
+
         # Gera nome do arquivo com informações da simulação
         so = self.sistema_operacional
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -484,6 +688,7 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         # === MÉTODO 1: PIL ImageGrab (Windows/macOS/Linux com Pillow 9.1+) ===
         try:
             print("🔄 Tentando captura direta com PIL...")
+            from PIL import ImageGrab, Image  # type: ignore
             
             # Captura o SimulacaoFrame inteiro (self, não self.simulation_frame)
             x = self.winfo_rootx()
@@ -552,6 +757,7 @@ class SimulacaoFrame(customtkinter.CTkFrame):
         if self.gantt_diagram and self.gantt_diagram.canvas:
             try:
                 print("🔄 Gerando PostScript do diagrama de Gantt (apenas gráfico)...")
+                from image_helper import convert_ps_to_png_pillow_with_white_bg, convert_ps_to_png_with_white_bg
                 temp_ps = f"temp_{timestamp}.eps"
                 
                 self.gantt_diagram.canvas.postscript(file=temp_ps)
@@ -635,20 +841,16 @@ class SimulacaoFrame(customtkinter.CTkFrame):
             
             # Retângulos da tarefa
             tempo_atual = current_time
-            if tarefa["duracao"] == len(tarefa["tempos_de_execucao"]):
-                tempo_termino = tarefa["tempos_de_execucao"][-1] if tarefa["tempos_de_execucao"] else tempo_atual
+            if tarefa["duracao"] == tarefa["tempo_executado"]:
+                tempo_termino = tarefa["intervalos_execucao"][-1][1] - 1 if tarefa["intervalos_execucao"] else tempo_atual
             else:
                 tempo_termino = tempo_atual
                 
-            for tempo in range(tarefa["ingresso"], tempo_termino + 1):
-                x = margin_left + tempo * cell_width
-                
-                if tempo in tarefa["tempos_de_execucao"]:
-                    fill_color = tarefa["cor"]
-                else:
-                    fill_color = "white"
-                
-                svg_content += f'\n  <rect x="{x}" y="{y + 5}" width="{cell_width}" height="{cell_height}" fill="{fill_color}" stroke="black" stroke-width="2"/>'
+            # Um retângulo por trecho contíguo de execução ou espera
+            for inicio_trecho, fim_trecho, executando in segmentos_barra(tarefa["ingresso"], tempo_termino, tarefa["intervalos_execucao"]):
+                fill_color = tarefa["cor"] if executando else "white"
+                x = margin_left + inicio_trecho * cell_width
+                svg_content += f'\n  <rect x="{x}" y="{y + 5}" width="{(fim_trecho - inicio_trecho) * cell_width}" height="{cell_height}" fill="{fill_color}" stroke="black" stroke-width="2"/>'
         
         svg_content += '\n</svg>'
         
@@ -1,12 +1,31 @@
 # Classe do Sistema Operacional
-from config_handler import read_config
+import random
+from collections.abc import Callable, Iterable
+
+from config_handler import abrir_config, read_config
 from escalonador import Escalonador
+from fila_io import FilaIO
+from gerenciador_mutex import GerenciadorMutex
+from metricas import MetricasSimulacao, metricas_tarefa
+import rastro_binario
+import registro
 from tcb import TCB
 
 
 class SistemaOperacional:
-    def __init__(self, config_file: str):
-        """Inicializa o sistema operacional lendo a configuração do arquivo e adicionando todas as variáveis necessárias."""
+    def __init__(self, config_file: str | Iterable[str] | dict, sob_demanda: bool = False, ao_finalizar: Callable[[TCB], None] | None = None,
+                 semente: int | None = None):
+        """
+        Inicializa o sistema operacional lendo a configuração do arquivo e adicionando todas as variáveis necessárias.
+        config_file também pode ser um iterável com as linhas da configuração (ex.: gerador_carga.linhas_carga)
+        ou uma configuração já lida, no formato de read_config (as tarefas passam a pertencer a este sistema).
+        sob_demanda: lê as tarefas do arquivo conforme elas ingressam, em vez de carregar todas no início.
+        Exige o arquivo ordenado por ingresso; o arquivo fica aberto até a última tarefa ser lida, então
+        o sistema não pode ser serializado (HistoricoSimulacao) nesse modo.
+        ao_finalizar: se informado, cada tarefa que termina é passada a ele e descartada (sai de tarefas e
+        não entra em tarefas_finalizadas). Junto com sob_demanda, a memória fica limitada às tarefas ativas.
+        semente: se informada, os sorteios de desempate usam um gerador próprio (ver semear).
+        """
 
         self.relogio = 0 # Inicializa o relógio do sistema
         self.quantum_atual = 0 # Contador do quantum atual
@@ -18,9 +37,18 @@ class SistemaOperacional:
         self.chama_escalonador_entrada = False # Flag para chamar o escalonador quando uma nova tarefa entra
         self.ultima_tarefa_executada: TCB | None = None # Última tarefa que foi executada (para visualização)
         self.alpha = 1  # Fator de envelhecimento (para algoritmos que o utilizam)
+        self.ao_finalizar = ao_finalizar
 
+        registro.tick_atual = None  # Mensagens da leitura da configuração não pertencem a nenhum tick
         try: 
-            dados_config = read_config(config_file)
+            if isinstance(config_file, dict):
+                dados_config = config_file
+                sob_demanda = False  # As tarefas já estão todas em memória
+            elif sob_demanda:
+                dados_config, tarefas_pendentes = abrir_config(config_file, ordenado_por_ingresso=True)
+                dados_config["tarefas"] = []
+            else:
+                dados_config = read_config(config_file)
         except Exception as e:
             raise Exception(f"Erro ao ler o arquivo de configuração: {e}")
 
@@ -34,152 +62,206 @@ class SistemaOperacional:
         # Organiza as tarefas por tempo de ingresso para facilitar a adição ao sistema
         self.tarefas_no_ingresso = {}
         for tarefa in self.tarefas:
-            if tarefa["ingresso"] not in self.tarefas_no_ingresso:
-                self.tarefas_no_ingresso[tarefa["ingresso"]] = []
-            self.tarefas_no_ingresso[tarefa["ingresso"]].append(tarefa)
+            if tarefa.ingresso not in self.tarefas_no_ingresso:
+                self.tarefas_no_ingresso[tarefa.ingresso] = []
+            self.tarefas_no_ingresso[tarefa.ingresso].append(tarefa)
+
+        # Instantes de ingresso ordenados, usados pelo modo orientado a eventos para saltar direto à próxima chegada
+        self.instantes_ingresso = sorted(self.tarefas_no_ingresso)
+        self.indice_proximo_ingresso = 0
+        self.indice_tarefa = {tarefa: i for i, tarefa in enumerate(self.tarefas)}  # Pela TCB: ids podem se repetir
+
+        # Leitura sob demanda: tarefas ainda no arquivo e a primeira já lida do próximo instante de ingresso.
+        # Invariante: as tarefas do próximo instante de ingresso já estão em self.tarefas, então
+        # simulacao_terminada e o modo orientado a eventos não precisam olhar o arquivo.
+        self.tarefas_pendentes = None
+        self.tarefa_adiantada: TCB | None = None
+        if sob_demanda:
+            self.tarefas_pendentes = tarefas_pendentes
+            try:
+                self._ler_proximo_ingresso()
+            except Exception as e:
+                raise Exception(f"Erro ao ler o arquivo de configuração: {e}")
 
         # Inicializa o escalonador
         self.escalonador = Escalonador(self.nome_escalonador, alpha=self.alpha)
         self.tarefa_executando: TCB | None = None
         self.tarefas_finalizadas: list[TCB] = []
-        self.fila_IO: list[TCB] = []
+        self.conjunto_finalizadas: set[TCB] = set()  # Mesmo conteúdo de tarefas_finalizadas, para consulta em O(1)
+        self.fila_IO = FilaIO()  # Tarefas bloqueadas em I/O, ordenadas pelo tick de conclusão
 
-        # Estrutura para gerenciar Mutexes
-        # Formato: {mutex_id: {"dono": TCB | None, "fila_espera": list[TCB]}}
-        self.mutexes: dict[int, dict] = {}
-        
-        # Rastreia tarefas bloqueadas por mutex para aplicar envelhecimento
-        self.tarefas_bloqueadas_mutex: list[TCB] = []
+        # Estrutura para gerenciar Mutexes (estado de cada mutex, posse por tarefa e tarefas bloqueadas)
+        # Tarefas bloqueadas por mutex também envelhecem, ver Escalonador.iniciar_envelhecimento
+        self.gerenciador_mutex = GerenciadorMutex()
 
         # Rastreia em quais ticks houve sorteio para desempate
         self.ticks_com_sorteio: set[int] = set()
 
+        # Contadores atualizados a cada acontecimento (espera, bloqueios, trocas de contexto, ociosidade)
+        self.metricas = MetricasSimulacao()
+
         # Define quais algoritmos causam preempção na CHEGADA de uma nova tarefa
         self.preempcao_por_chegada = self.escalonador.get_preempcao_chegada()
         self.preempcao_por_quantum = self.escalonador.get_preempcao_quantum()
+        if semente is not None:
+            self.semear(semente)
+
+        # Rastro binário opcional (ver iniciar_rastro) e o que aconteceu no tick atual, para gravá-lo
+        self.rastro: rastro_binario.GravadorRastro | None = None
+        self.tarefa_executou_no_tick: TCB | None = None
+        self.motivo_tick = rastro_binario.MOTIVO_NENHUM
+        self.eventos_tick = 0
+
+    def semear(self, semente: int | None):
+        """
+        Passa a sortear os desempates com um random.Random próprio iniciado com semente, em vez do gerador global
+        do módulo random. Os sorteios são os mesmos de random.seed(semente), mas não dependem de quem mais usa o
+        gerador global, e o estado do gerador vai junto quando o sistema é serializado. None volta ao gerador global.
+        """
+        self.escalonador.gerador = None if semente is None else random.Random(semente)
+
+    def _ler_proximo_ingresso(self):
+        """Leitura sob demanda: lê do arquivo todas as tarefas do próximo instante de ingresso."""
+        if self.tarefa_adiantada is None:
+            self.tarefa_adiantada = next(self.tarefas_pendentes, None)
+            if self.tarefa_adiantada is None:
+                self.tarefas_pendentes = None
+                return
+
+        # Os instantes anteriores já passaram: a lista só precisa do próximo
+        instante = self.tarefa_adiantada.ingresso
+        self.instantes_ingresso = [instante]
+        self.indice_proximo_ingresso = 0
+        self.tarefas_no_ingresso[instante] = []
+        while self.tarefa_adiantada is not None and self.tarefa_adiantada.ingresso == instante:
+            tarefa = self.tarefa_adiantada
+            self.indice_tarefa[tarefa] = len(self.tarefas)
+            self.tarefas.append(tarefa)
+            self.tarefas_no_ingresso[instante].append(tarefa)
+            self.tarefa_adiantada = next(self.tarefas_pendentes, None)
+
+        if self.tarefa_adiantada is None:
+            self.tarefas_pendentes = None  # Arquivo lido até o fim (o gerador fecha o arquivo)
 
-    def _obter_ou_criar_mutex(self, mutex_id: int) -> dict:
-        """Obtém um mutex existente ou cria um novo se não existir."""
-        if mutex_id not in self.mutexes:
-            self.mutexes[mutex_id] = {"dono": None, "fila_espera": []}
-        return self.mutexes[mutex_id]
+    def _descartar_tarefa(self, tarefa: TCB):
+        """
+        Entrega a tarefa terminada a ao_finalizar e a retira do sistema. As tarefas ativas continuam sendo
+        exatamente tarefas (sem as finalizadas), então simulacao_terminada segue valendo: 0 finalizadas == 0 tarefas.
+        """
+        self.ao_finalizar(tarefa)
+        indice = self.indice_tarefa.pop(tarefa)
+        ultima = self.tarefas.pop()
+        if ultima is not tarefa:
+            # Troca com a última para remover em O(1); a ordem de tarefas deixa de ser a do arquivo
+            self.tarefas[indice] = ultima
+            self.indice_tarefa[ultima] = indice
 
     def _solicitar_mutex(self, tarefa: TCB, mutex_id: int) -> bool:
         """
         Tenta adquirir o mutex para a tarefa.
         Retorna True se o mutex foi adquirido, False se a tarefa foi bloqueada.
         """
-        mutex = self._obter_ou_criar_mutex(mutex_id)
-        
-        if mutex["dono"] is None:
-            # Mutex está livre, a tarefa pode adquirir
-            mutex["dono"] = tarefa
-            print(f"Tarefa {tarefa['id']} adquiriu mutex {mutex_id}")
+        if self.gerenciador_mutex.solicitar(tarefa, mutex_id):
             return True
-        elif mutex["dono"]["id"] == tarefa["id"]:
-            # A tarefa já possui o mutex (reentrância - opcional, mas seguro)
-            print(f"Tarefa {tarefa['id']} já possui mutex {mutex_id}")
-            return True
-        else:
-            # Mutex está ocupado, bloqueia a tarefa
-            mutex["fila_espera"].append(tarefa)
-            self.tarefas_bloqueadas_mutex.append(tarefa)
-            print(f"Tarefa {tarefa['id']} bloqueada aguardando mutex {mutex_id} (dono: {mutex['dono']['id']})")
-            return False
+        self.metricas.bloqueio_mutex(tarefa, self.relogio)
+        self.escalonador.iniciar_envelhecimento(tarefa)
+        return False
 
     def _liberar_mutex(self, tarefa: TCB, mutex_id: int):
         """
-        Libera o mutex e acorda a próxima tarefa na fila de espera, se houver.
+        Libera o mutex e coloca na fila de prontas a próxima tarefa que estava esperando por ele, se houver.
         """
-        mutex = self._obter_ou_criar_mutex(mutex_id)
-        
-        if mutex["dono"] is None:
-            print(f"Aviso: Tarefa {tarefa['id']} tentou liberar mutex {mutex_id} que já está livre")
-            return
-        
-        if mutex["dono"]["id"] != tarefa["id"]:
-            print(f"Aviso: Tarefa {tarefa['id']} tentou liberar mutex {mutex_id} que pertence a {mutex['dono']['id']}")
-            return
-        
-        print(f"Tarefa {tarefa['id']} liberou mutex {mutex_id}")
-        
-        if mutex["fila_espera"]:
-            # Acorda a próxima tarefa na fila de espera
-            proxima_tarefa = mutex["fila_espera"].pop(0)
-            mutex["dono"] = proxima_tarefa
-            print(f"Tarefa {proxima_tarefa['id']} acordada e adquiriu mutex {mutex_id}")
-            
-            # Remove da lista de bloqueadas e coloca na fila de prontas
-            if proxima_tarefa in self.tarefas_bloqueadas_mutex:
-                self.tarefas_bloqueadas_mutex.remove(proxima_tarefa)
-            self.escalonador.adicionar_tarefa_pronta(proxima_tarefa)
-        else:
-            # Ninguém esperando, libera o mutex
-            mutex["dono"] = None
+        proxima_tarefa = self.gerenciador_mutex.liberar(tarefa, mutex_id)
+        if proxima_tarefa is not None:
+            self._acordar_tarefa_mutex(proxima_tarefa)
+
+    def _avancar_cursor_eventos(self, tarefa: TCB, tempo_execucao_tarefa: int) -> int:
+        """
+        Avança o cursor de eventos da tarefa até o primeiro evento com inicio >= tempo_execucao_tarefa e o retorna.
+        A lista de eventos é ordenada por inicio na leitura, então o custo é O(1) amortizado por tick.
+        """
+        eventos = tarefa.lista_eventos
+        indice = tarefa.indice_proximo_evento
+        while indice < len(eventos) and eventos[indice].inicio < tempo_execucao_tarefa:
+            indice += 1
+        tarefa.indice_proximo_evento = indice
+        return indice
 
     def _processar_eventos_mutex(self, tarefa: TCB, tempo_execucao_tarefa: int) -> bool:
         """
         Processa eventos de mutex (ML e MU) para o tempo de execução atual.
         Retorna True se a tarefa foi bloqueada, False caso contrário.
+        Se a tarefa bloquear, o cursor não avança: ao voltar a executar ela reprocessa os eventos deste instante.
         """
-        if not tarefa["lista_eventos"]:
+        if not tarefa.lista_eventos:
             return False
         
-        tarefa_bloqueada = False
+        eventos = tarefa.lista_eventos
+        indice = self._avancar_cursor_eventos(tarefa, tempo_execucao_tarefa)
         
-        for evento in tarefa["lista_eventos"]:
-            if evento["inicio"] == tempo_execucao_tarefa:
-                if evento["tipo"] == "ML":
-                    # Solicitar mutex
-                    if not self._solicitar_mutex(tarefa, evento["mutex_id"]):
-                        # Tarefa foi bloqueada
-                        tarefa_bloqueada = True
-                        break  # Não processa mais eventos se bloqueou
-                elif evento["tipo"] == "MU":
-                    # Liberar mutex
-                    self._liberar_mutex(tarefa, evento["mutex_id"])
+        while indice < len(eventos) and eventos[indice].inicio == tempo_execucao_tarefa:
+            evento = eventos[indice]
+            if evento.tipo == "ML":
+                # Solicitar mutex
+                if not self._solicitar_mutex(tarefa, evento.mutex_id):
+                    # Tarefa foi bloqueada
+                    return True  # Não processa mais eventos se bloqueou
+            elif evento.tipo == "MU":
+                # Liberar mutex
+                self._liberar_mutex(tarefa, evento.mutex_id)
+            indice += 1
         
-        return tarefa_bloqueada
+        return False
 
     def _liberar_todos_mutexes_tarefa(self, tarefa: TCB):
         """
         Libera todos os mutexes que a tarefa possui quando ela termina.
         """
-        mutexes_a_liberar = []
-        for mutex_id, mutex in self.mutexes.items():
-            if mutex["dono"] and mutex["dono"]["id"] == tarefa["id"]:
-                mutexes_a_liberar.append(mutex_id)
-        
-        for mutex_id in mutexes_a_liberar:
-            print(f"Liberando mutex {mutex_id} da tarefa {tarefa['id']} que terminou")
-            self._liberar_mutex(tarefa, mutex_id)
+        for proxima_tarefa in self.gerenciador_mutex.liberar_todos(tarefa):
+            self._acordar_tarefa_mutex(proxima_tarefa)
 
-    def _escalonar(self):
-        """Chama o escalonador para escolher a próxima tarefa a executar."""
+    def _acordar_tarefa_mutex(self, tarefa: TCB):
+        """A tarefa recebeu o mutex que esperava e volta à fila de prontas."""
+        self.metricas.fim_mutex(tarefa, self.relogio)
+        self.escalonador.adicionar_tarefa_pronta(tarefa)
+
+    def _escalonar(self, motivo: int = rastro_binario.MOTIVO_CPU_LIVRE):
+        """Chama o escalonador para escolher a próxima tarefa a executar. motivo vai para o rastro binário."""
         # Atualiza tarefa_atual ANTES de escalonar
         self.escalonador.set_tarefa_atual(self.tarefa_executando)
         self.tarefa_executando = self.escalonador.escalonar()
         self.quantum_atual = 0
+        if self.tarefa_executando is not None:
+            self.motivo_tick = motivo
+            registro.debug("sched", "Tarefa %s escalonada", self.tarefa_executando.id)
         
         # Registra se houve sorteio neste tick
         if self.escalonador.houve_sorteio():
             self.ticks_com_sorteio.add(self.relogio)
+            self.eventos_tick |= rastro_binario.EVENTO_SORTEIO
 
     def executar_tick(self):
-        # 0. Processa todas as tarefas na fila de I/O
+        if self.rastro is None:
+            self._executar_tick()
+            return
+
+        tick = self.relogio
+        self.tarefa_executou_no_tick = None
+        self.motivo_tick = rastro_binario.MOTIVO_NENHUM
+        self.eventos_tick = 0
+        self._executar_tick()
+        self._gravar_rastro(tick, self.tarefa_executou_no_tick, self.motivo_tick, self.eventos_tick)
+
+    def _executar_tick(self):
+        registro.tick_atual = self.relogio
+
+        # 0. Devolve à fila de prontas as tarefas cujo I/O termina neste tick
         tarefas_voltaram_de_io = False
         if self.fila_IO:
-            tarefas_IO_concluidas = []
-            for tarefa_io in self.fila_IO:
-                evento = tarefa_io.get("evento_io_ativo")
-                if evento and evento["tempo_restante"] > 0:
-                    evento["tempo_restante"] -= 1
-                    if evento["tempo_restante"] <= 0:
-                        tarefa_io["evento_io_ativo"] = None
-                        tarefas_IO_concluidas.append(tarefa_io)
-            
-            for tarefa_concluida in tarefas_IO_concluidas:
-                self.fila_IO.remove(tarefa_concluida)
+            for tarefa_concluida in self.fila_IO.retirar_concluidas(self.relogio):
+                registro.debug("io", "Tarefa %s concluiu I/O", tarefa_concluida.id)
+                self.eventos_tick |= rastro_binario.EVENTO_FIM_IO
+                self.metricas.fim_io(tarefa_concluida, self.relogio)
                 self.escalonador.adicionar_tarefa_pronta(tarefa_concluida)
                 tarefas_voltaram_de_io = True
 
@@ -188,9 +270,16 @@ class SistemaOperacional:
         if self.relogio in self.tarefas_no_ingresso:
             novas_tarefas = self.tarefas_no_ingresso[self.relogio]
             novas_tarefas_chegaram = len(novas_tarefas) > 0
+            self.eventos_tick |= rastro_binario.EVENTO_CHEGADA
             for tarefa in novas_tarefas:
-                tarefa['prioridade_dinamica'] = tarefa['prioridade']
+                tarefa.prioridade_dinamica = tarefa.prioridade
+                self.metricas.chegada(tarefa)
                 self.escalonador.adicionar_tarefa_pronta(tarefa)
+
+            # Leitura sob demanda: as tarefas deste instante entraram, lê as do próximo
+            if self.tarefas_pendentes is not None:
+                del self.tarefas_no_ingresso[self.relogio]
+                self._ler_proximo_ingresso()
         
         # 2. Verifica preempção por chegada (SRTF, PRIOP, PRIOPEnv)
         if self.tarefa_executando and self.preempcao_por_chegada:
@@ -203,7 +292,8 @@ class SistemaOperacional:
                     # Atualiza tarefa_atual antes de limpar tarefa_executando
                     self.escalonador.set_tarefa_atual(self.tarefa_executando)
                     self.tarefa_executando = None
-                    self._escalonar()  # Chama escalonador após preempção
+                    self.eventos_tick |= rastro_binario.EVENTO_PREEMPCAO
+                    self._escalonar(rastro_binario.MOTIVO_PREEMPCAO)  # Chama escalonador após preempção
 
         # 3. Se não há tarefa executando, chama o escalonador
         if self.tarefa_executando is None:
@@ -211,14 +301,15 @@ class SistemaOperacional:
 
         # 3.5. Se ainda assim não houver tarefa (fila vazia), apenas avança o relógio
         if self.tarefa_executando is None:
+            self.metricas.ocioso()
             self.relogio += 1
             return
 
         # Calcula o tempo de execução ANTES de executar
-        tempo_execucao_tarefa = len(self.tarefa_executando["tempos_de_execucao"]) + 1
+        tempo_execucao_tarefa = self.tarefa_executando.tempo_executado + 1
         
         # Processa eventos de mutex ANTES de executar o tick
-        if self.tarefa_executando["lista_eventos"]:
+        if self.tarefa_executando.lista_eventos:
             tarefa_bloqueada_mutex = self._processar_eventos_mutex(self.tarefa_executando, tempo_execucao_tarefa)
             
             if tarefa_bloqueada_mutex:
@@ -226,42 +317,56 @@ class SistemaOperacional:
                 self.escalonador.set_tarefa_atual(self.tarefa_executando)
                 self.tarefa_executando = None
                 self.quantum_atual = 0
-                self._escalonar()  # Chama escalonador após bloqueio por mutex
+                self.eventos_tick |= rastro_binario.EVENTO_BLOQUEIO_MUTEX
+                self._escalonar(rastro_binario.MOTIVO_MUTEX)  # Chama escalonador após bloqueio por mutex
+                self.metricas.ocioso()  # Ninguém executou neste tick
                 self.relogio += 1
                 return
 
         # 4. Executa a tarefa atual por um tick
-        self.tarefa_executando["tempos_de_execucao"].append(self.relogio)
-        if "tempo_restante" in self.tarefa_executando: # Para SRTF
-            self.tarefa_executando["tempo_restante"] -= 1
+        self.tarefa_executando.registrar_execucao(self.relogio)
+        self.metricas.execucao(self.tarefa_executando, self.relogio)
+        self.tarefa_executou_no_tick = self.tarefa_executando
+        self.tarefa_executando.tempo_restante -= 1 # Para SRTF
         
-        # Processa eventos de I/O com tempo absoluto
-        if self.tarefa_executando["lista_eventos"]:
-            for evento in self.tarefa_executando["lista_eventos"]:
-                if evento["tipo"] == "IO":
-                    # Usa tempo_execucao_tarefa já calculado
-                    if tempo_execucao_tarefa == evento["inicio"]:
-                        self.tarefa_executando["evento_io_ativo"] = evento
-                        self.fila_IO.append(self.tarefa_executando)
-                        self.escalonador.set_tarefa_atual(self.tarefa_executando)
-                        self.tarefa_executando = None
-                        self.quantum_atual = 0
-                        self._escalonar()  # Chama escalonador após I/O
-                        self.relogio += 1
-                        return
+        # Processa eventos de I/O com tempo absoluto (o cursor já foi posicionado no instante atual)
+        if self.tarefa_executando.lista_eventos:
+            eventos = self.tarefa_executando.lista_eventos
+            indice = self.tarefa_executando.indice_proximo_evento
+            while indice < len(eventos) and eventos[indice].inicio == tempo_execucao_tarefa:
+                evento = eventos[indice]
+                if evento.tipo == "IO":
+                    self.tarefa_executando.evento_io_ativo = evento
+                    self.fila_IO.adicionar(self.tarefa_executando, self.relogio)
+                    self.metricas.bloqueio_io(self.tarefa_executando, self.relogio)
+                    registro.debug("io", "Tarefa %s bloqueada em I/O por %s ticks", self.tarefa_executando.id, evento.duracao)
+                    self.escalonador.set_tarefa_atual(self.tarefa_executando)
+                    self.tarefa_executando = None
+                    self.quantum_atual = 0
+                    self.eventos_tick |= rastro_binario.EVENTO_INICIO_IO
+                    self._escalonar(rastro_binario.MOTIVO_IO)  # Chama escalonador após I/O
+                    self.relogio += 1
+                    return
+                indice += 1
         
         self.quantum_atual += 1
 
         # 6. Verifica se a tarefa terminou
-        duracao_executada = len(self.tarefa_executando["tempos_de_execucao"])
-        if duracao_executada >= self.tarefa_executando["duracao"]:
-            print(f"Tarefa {self.tarefa_executando['id']} terminou.")
+        duracao_executada = self.tarefa_executando.tempo_executado
+        if duracao_executada >= self.tarefa_executando.duracao:
+            registro.info("sched", "Tarefa %s terminou.", self.tarefa_executando.id)
+            self.metricas.termino(self.tarefa_executando, self.relogio)
             # Libera todos os mutexes antes de finalizar
             self._liberar_todos_mutexes_tarefa(self.tarefa_executando)
-            self.tarefas_finalizadas.append(self.tarefa_executando)
+            if self.ao_finalizar is not None:
+                self._descartar_tarefa(self.tarefa_executando)
+            else:
+                self.tarefas_finalizadas.append(self.tarefa_executando)
+                self.conjunto_finalizadas.add(self.tarefa_executando)
             self.escalonador.set_tarefa_atual(self.tarefa_executando)
             self.tarefa_executando = None
-            self._escalonar()  # Chama escalonador após término
+            self.eventos_tick |= rastro_binario.EVENTO_TERMINO
+            self._escalonar(rastro_binario.MOTIVO_TERMINO)  # Chama escalonador após término
         
         # 7. Se não terminou, verifica se o quantum estourou
         elif self.quantum_atual >= self.quantum and self.preempcao_por_quantum:
@@ -269,19 +374,178 @@ class SistemaOperacional:
             self.escalonador.set_tarefa_atual(self.tarefa_executando)
             self.tarefa_executando = None
             self.quantum_atual = 0
-            self._escalonar()  # Chama escalonador após quantum
+            self.eventos_tick |= rastro_binario.EVENTO_PREEMPCAO
+            self._escalonar(rastro_binario.MOTIVO_QUANTUM)  # Chama escalonador após quantum
 
         # Aplica envelhecimento a tarefas prontas E bloqueadas por mutex
         self.escalonador.aplicar_envelhecimento()
-        if self.nome_escalonador == "priopenv":
-            for tarefa in self.tarefas_bloqueadas_mutex:
-                tarefa['prioridade_dinamica'] += self.alpha
 
         # 9. Avança o relógio do sistema
         self.relogio += 1
 
+    # --- Modo orientado a eventos ---
+    # Os métodos abaixo produzem exatamente o mesmo resultado que chamar executar_tick() repetidamente,
+    # mas avançam em bloco os ticks em que nada relevante acontece (CPU ociosa ou tarefa executando sem eventos).
+
+    def _proximo_instante_relevante(self) -> int | None:
+        """
+        Retorna o próximo tick (>= relógio) em que algo muda o rumo da simulação:
+        chegada de tarefa, fim de I/O, evento da tarefa executando, término ou estouro de quantum.
+        Retorna None se nada mais pode acontecer.
+        """
+        # Tick atual é relevante se há alguém na fila de prontas esperando a CPU livre
+        if self.tarefa_executando is None and self.escalonador.fila_tarefas_prontas:
+            return self.relogio
+
+        candidatos = []
+
+        # Próxima chegada
+        proxima_chegada = self._proxima_chegada()
+        if proxima_chegada is not None:
+            candidatos.append(proxima_chegada)
+
+        # Próximo fim de I/O
+        proxima_conclusao_io = self.fila_IO.proxima_conclusao()
+        if proxima_conclusao_io is not None:
+            candidatos.append(proxima_conclusao_io)
+
+        tarefa = self.tarefa_executando
+        if tarefa is not None:
+            executado = tarefa.tempo_executado
+
+            # Próximo evento (I/O ou mutex) da tarefa em execução
+            indice = self._avancar_cursor_eventos(tarefa, executado + 1)
+            if indice < len(tarefa.lista_eventos):
+                candidatos.append(self.relogio + tarefa.lista_eventos[indice].inicio - executado - 1)
+
+            # Término da tarefa
+            candidatos.append(self.relogio + max(tarefa.duracao - executado - 1, 0))
+
+            # Estouro de quantum
+            if self.preempcao_por_quantum:
+                candidatos.append(self.relogio + max(self.quantum - self.quantum_atual - 1, 0))
+
+        return min(candidatos) if candidatos else None
+
+    def _proxima_chegada(self) -> int | None:
+        """Próximo instante de ingresso (>= relógio), ou None se não chegam mais tarefas."""
+        while (self.indice_proximo_ingresso < len(self.instantes_ingresso)
+               and self.instantes_ingresso[self.indice_proximo_ingresso] < self.relogio):
+            self.indice_proximo_ingresso += 1
+        if self.indice_proximo_ingresso < len(self.instantes_ingresso):
+            return self.instantes_ingresso[self.indice_proximo_ingresso]
+        return None
+
+    def _avancar_ticks_sem_eventos(self, n_ticks: int):
+        """
+        Avança n_ticks ticks sabidamente sem eventos, com o mesmo efeito de n_ticks chamadas a executar_tick().
+        O I/O não precisa ser tocado: FilaIO guarda o tick absoluto de conclusão.
+        """
+        if n_ticks <= 0:
+            return
+
+        if self.tarefa_executando is None:
+            # CPU ociosa: o escalonador é chamado com a fila vazia e não há envelhecimento
+            self._escalonar()
+            if self.rastro is not None:
+                self._gravar_rastro(self.relogio, None)
+            self.metricas.ocioso(n_ticks)
+            self.relogio += n_ticks
+            return
+
+        tarefa = self.tarefa_executando
+        if self.rastro is not None:
+            self._gravar_rastro(self.relogio, tarefa)
+        tarefa.registrar_execucao(self.relogio, n_ticks)
+        self.metricas.execucao(tarefa, self.relogio, n_ticks)
+        tarefa.tempo_restante -= n_ticks
+        self.quantum_atual += n_ticks
+
+        self.escalonador.aplicar_envelhecimento(n_ticks)
+
+        self.relogio += n_ticks
+
+    # --- Rastro binário ---
+
+    def iniciar_rastro(self, caminho: str):
+        """Passa a gravar o rastro binário da simulação em caminho (ver rastro_binario.py)."""
+        if self.ao_finalizar is not None:
+            raise ValueError("O rastro binário precisa de todas as tarefas; não use ao_finalizar junto com ele")
+        self.rastro = rastro_binario.GravadorRastro(caminho, [tarefa.id for tarefa in self.tarefas])
+
+    def encerrar_rastro(self):
+        """Fecha o arquivo de rastro; os ticks gravados vão até o relógio atual."""
+        if self.rastro is not None:
+            self.rastro.ids_tarefas = [tarefa.id for tarefa in self.tarefas]  # Na leitura sob demanda, a lista cresce
+            self.rastro.fechar(self.relogio)
+            self.rastro = None
+
+    def _gravar_rastro(self, tick: int, tarefa: TCB | None, motivo: int = rastro_binario.MOTIVO_NENHUM, eventos: int = 0):
+        """Grava o estado do tick (ou do trecho de ticks sem eventos que começa nele), com as filas como estão agora."""
+        self.rastro.gravar(
+            tick,
+            self.indice_tarefa[tarefa] if tarefa is not None else -1,
+            motivo,
+            eventos,
+            len(self.escalonador.fila_tarefas_prontas),
+            len(self.fila_IO),
+            len(self.gerenciador_mutex.bloqueadas),
+        )
+
+    def run_until(self, tempo_limite: int):
+        """Executa a simulação até o relógio atingir tempo_limite, saltando os ticks sem eventos."""
+        while self.relogio < tempo_limite and not self.simulacao_terminada():
+            proximo = self._proximo_instante_relevante()
+            if proximo is None or proximo >= tempo_limite:
+                self._avancar_ticks_sem_eventos(tempo_limite - self.relogio)
+                break
+            self._avancar_ticks_sem_eventos(proximo - self.relogio)
+            self.executar_tick()
+
+    def run_to_completion(self):
+        """
+        Executa a simulação até todas as tarefas terminarem, saltando os ticks sem eventos.
+        Para antes disso se nada mais pode acontecer (ex.: tarefas presas em mutex para sempre).
+        """
+        while not self.simulacao_terminada():
+            proximo = self._proximo_instante_relevante()
+            if proximo is None:
+                break
+            self._avancar_ticks_sem_eventos(proximo - self.relogio)
+            self.executar_tick()
+
+    def ha_eventos_pendentes(self) -> bool:
+        """Indica se ainda pode acontecer algo na simulação (False quando terminou ou as tarefas estão presas para sempre)."""
+        return not self.simulacao_terminada() and self._proximo_instante_relevante() is not None
+
+    def get_estado_tarefa(self, tarefa: TCB) -> str:
+        """Estado atual da tarefa, consultado em O(1) nos índices de cada fila."""
+        if tarefa in self.conjunto_finalizadas:
+            return "FINALIZADA"
+        elif tarefa is self.tarefa_executando:
+            return "EXECUTANDO"
+        elif tarefa in self.fila_IO:
+            return "BLOQUEADA I/O"
+        elif self.gerenciador_mutex.esta_bloqueada(tarefa):
+            return "BLOQUEADA MUTEX"
+        elif tarefa in self.escalonador.fila_tarefas_prontas:
+            return "PRONTA"
+        elif tarefa.ingresso > self.relogio:
+            return "NÃO INGRESSADA"
+        else:
+            return "DESCONHECIDO"
+
+    def get_metricas(self) -> dict:
+        """Totais e médias da simulação até o relógio atual (espera, bloqueios, trocas de contexto, ociosidade), em O(1)."""
+        return self.metricas.resumo(self.relogio)
+
+    def get_metricas_tarefa(self, tarefa: TCB) -> dict:
+        """Primeira execução, resposta, espera na fila de prontas e tempo bloqueado da tarefa até o relógio atual."""
+        termino = tarefa.intervalos_execucao[-1][1] if tarefa in self.conjunto_finalizadas else None
+        return metricas_tarefa(tarefa, self.relogio, termino)
+
     def get_tarefas_ingressadas(self) -> list[TCB]:
-        return [tarefa for tarefa in self.tarefas if tarefa["ingresso"] <= self.relogio] # Quais Tarefas já ingressaram no sistema
+        return [tarefa for tarefa in self.tarefas if tarefa.ingresso <= self.relogio] # Quais Tarefas já ingressaram no sistema
 
     def get_relogio(self) -> int:
         return self.relogio
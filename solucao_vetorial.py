@@ -0,0 +1,311 @@
+# Solução vetorizada (NumPy) para cargas sem eventos
+#
+# Quando nenhuma tarefa tem eventos (I/O ou mutex), FIFO, RR e SRTF não dependem do tick a tick:
+# - FIFO/RR com quantum >= maior duração: cada tarefa roda inteira em ordem de chegada, e o término é uma soma
+#   acumulada das durações com o relógio "puxado" para a frente nas chegadas (np.maximum.accumulate);
+# - RR: fatia a fatia, mas as rodadas completas em que ninguém termina e ninguém chega são feitas em lote
+#   (k rodadas de uma vez, descontando k * quantum de todas as tarefas da fila com uma operação de vetor);
+# - SRTF: de evento em evento (chegada ou término), com um heap pela mesma chave da FilaSRTF.
+# Os resultados são os mesmos do SistemaOperacional, inclusive a ordem entre chegadas e fim de quantum no mesmo tick
+# (quem escolhe a próxima tarefa no fim de um tick ainda não vê as chegadas do tick seguinte).
+#
+# NumPy é opcional (comentado em requirements.txt): sem ele, ou quando a configuração não se qualifica (eventos, outro algoritmo, possível sorteio),
+# resolver() simula com o SistemaOperacional. verificar() compara as duas formas tick a tick (executar_tick).
+#
+# Uso:
+#   python solucao_vetorial.py carga.txt            (resolve e mostra as métricas)
+#   python solucao_vetorial.py carga.txt --verificar
+
+import argparse
+import heapq
+import json
+import sys
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele tudo passa pelo SistemaOperacional
+    np = None
+
+import registro
+from config_handler import read_config
+from sistema_operacional import SistemaOperacional
+
+
+def motivo_nao_qualifica(dados_config: dict) -> str | None:
+    """Por que a configuração (formato de read_config) não pode ser resolvida por vetores; None se pode."""
+    if np is None:
+        return "NumPy não está instalado"
+    algoritmo = dados_config["nome_escalonador"]
+    if algoritmo not in ("fifo", "rr", "srtf"):
+        return f"algoritmo {algoritmo} não tem solução vetorizada"
+    tarefas = dados_config["tarefas"]
+    if any(tarefa.lista_eventos for tarefa in tarefas):
+        return "há tarefas com eventos de I/O ou mutex"
+    if algoritmo == "srtf" and len({(tarefa.ingresso, tarefa.duracao) for tarefa in tarefas}) < len(tarefas):
+        # Mesma chave completa (tempo restante, ingresso, duração) na fila: o escalonador sortearia
+        return "tarefas com mesmo ingresso e duração podem ser desempatadas por sorteio"
+    return None
+
+
+def _fifo(ingresso, duracao):
+    """Cada tarefa roda inteira, em ordem de chegada: termino_i = max(ingresso_i, termino_{i-1}) + duracao_i."""
+    acumulado = np.cumsum(duracao)
+    termino = acumulado + np.maximum.accumulate(ingresso - (acumulado - duracao))
+    return termino - duracao, termino, len(ingresso)
+
+
+def _rr(ingresso, duracao, quantum: int):
+    """Round-robin fatia a fatia, com as rodadas completas sem chegada nem término feitas em lote."""
+    n = len(ingresso)
+    restante = duracao.copy()
+    inicio = np.full(n, -1, dtype=np.int64)
+    termino = np.zeros(n, dtype=np.int64)
+    chegadas = ingresso.tolist()
+
+    fila = deque()
+    proxima = 0  # Próxima tarefa a chegar (as tarefas estão em ordem de chegada)
+    t = 0
+    atual = None
+    nao_iniciadas = 0  # Tarefas que já chegaram e ainda não executaram (impedem o lote: o início delas importa)
+    ultima, fim_ultima = -1, -1  # Última fatia executada, para contar as trocas de contexto como intervalos
+    trocas = 0
+    fatias_sem_lote = 0  # Depois de uma tentativa de lote frustrada, espera uma rodada antes de tentar de novo
+
+    while True:
+        if atual is None:
+            if not fila:
+                if proxima >= n:
+                    break
+                # CPU ociosa: as chegadas do tick entram antes da escolha
+                t = max(t, chegadas[proxima])
+                while proxima < n and chegadas[proxima] <= t:
+                    fila.append(proxima)
+                    proxima += 1
+                    nao_iniciadas += 1
+            atual = fila.popleft()
+
+        # Lote: k rodadas completas de atual + fila, sem ninguém terminar e sem chegada no meio
+        m = len(fila) + 1
+        if nao_iniciadas == 0 and m > 1 and fatias_sem_lote <= 0:
+            k_chegada = (chegadas[proxima] - t) // (m * quantum) if proxima < n else None
+            if k_chegada is None or k_chegada > 0:
+                indices = np.fromiter((atual, *fila), dtype=np.int64, count=m)
+                k = int((restante[indices] - 1).min()) // quantum
+                if k_chegada is not None:
+                    k = min(k, k_chegada)
+                if k > 0:
+                    restante[indices] -= k * quantum
+                    trocas += k * m
+                    t += k * m * quantum
+                    ultima, fim_ultima = int(indices[-1]), t
+                    continue
+            fatias_sem_lote = m
+        fatias_sem_lote -= 1
+
+        # Uma fatia de atual; quem chega durante ela entra na fila antes de atual voltar para o fim
+        fatia = min(quantum, int(restante[atual]))
+        if inicio[atual] < 0:
+            inicio[atual] = t
+            nao_iniciadas -= 1
+        if ultima != atual or fim_ultima != t:
+            trocas += 1
+        fim = t + fatia
+        while proxima < n and chegadas[proxima] < fim:
+            fila.append(proxima)
+            proxima += 1
+            nao_iniciadas += 1
+        restante[atual] -= fatia
+        if restante[atual] == 0:
+            termino[atual] = fim
+        else:
+            fila.append(atual)
+        ultima, fim_ultima = atual, fim
+        t = fim
+        atual = fila.popleft() if fila else None
+
+    return inicio, termino, trocas
+
+
+def _srtf(ingresso, duracao):
+    """SRTF de evento em evento; só há troca numa chegada com tempo restante estritamente menor ou num término."""
+    n = len(ingresso)
+    chegadas = ingresso.tolist()
+    duracoes = duracao.tolist()
+    restante = list(duracoes)
+    inicio = [-1] * n
+    termino = [0] * n
+
+    heap = []  # (tempo restante, ingresso, duração, índice): a chave da FilaSRTF, sem empates (ver motivo_nao_qualifica)
+    proxima = 0
+    t = 0
+    atual = None
+    ultima, fim_ultima = -1, -1
+    trocas = 0
+
+    while True:
+        if atual is None:
+            if not heap:
+                if proxima >= n:
+                    break
+                t = max(t, chegadas[proxima])
+                while proxima < n and chegadas[proxima] <= t:
+                    heapq.heappush(heap, (restante[proxima], chegadas[proxima], duracoes[proxima], proxima))
+                    proxima += 1
+            atual = heapq.heappop(heap)[3]
+
+        fim = t + restante[atual]
+        ate = chegadas[proxima] if proxima < n and chegadas[proxima] < fim else fim
+        if ate > t:
+            if inicio[atual] < 0:
+                inicio[atual] = t
+            if ultima != atual or fim_ultima != t:
+                trocas += 1
+            restante[atual] -= ate - t
+            ultima, fim_ultima = atual, ate
+            t = ate
+
+        if restante[atual] == 0:
+            termino[atual] = t
+            # A próxima é escolhida no fim do tick, antes das chegadas do tick seguinte (que podem preemptá-la)
+            atual = heapq.heappop(heap)[3] if heap else None
+            continue
+
+        # Chegadas no tick t e preempção por tempo restante estritamente menor
+        while proxima < n and chegadas[proxima] <= t:
+            heapq.heappush(heap, (restante[proxima], chegadas[proxima], duracoes[proxima], proxima))
+            proxima += 1
+        if heap and heap[0][0] < restante[atual]:
+            atual = heapq.heappushpop(heap, (restante[atual], chegadas[atual], duracoes[atual], atual))[3]
+
+    return np.array(inicio, dtype=np.int64), np.array(termino, dtype=np.int64), trocas
+
+
+def resolver_vetorial(dados_config: dict) -> dict:
+    """
+    Resolve uma configuração qualificada (ver motivo_nao_qualifica). Retorna, na ordem do arquivo,
+    ids e arrays de ingresso, duração, primeira execução, término e espera, além do relógio final e das trocas de contexto.
+    """
+    tarefas = dados_config["tarefas"]
+    ingresso_arquivo = np.array([tarefa.ingresso for tarefa in tarefas], dtype=np.int64)
+    duracao_arquivo = np.array([tarefa.duracao for tarefa in tarefas], dtype=np.int64)
+    ordem = np.argsort(ingresso_arquivo, kind="stable")  # Ordem de chegada; no mesmo tick, a ordem do arquivo
+    ingresso, duracao = ingresso_arquivo[ordem], duracao_arquivo[ordem]
+
+    algoritmo = dados_config["nome_escalonador"]
+    if len(tarefas) == 0:
+        inicio = termino = ingresso
+        trocas = 0
+    elif algoritmo == "srtf":
+        inicio, termino, trocas = _srtf(ingresso, duracao)
+    elif dados_config["quantum"] >= duracao.max():
+        inicio, termino, trocas = _fifo(ingresso, duracao)
+    else:
+        inicio, termino, trocas = _rr(ingresso, duracao, dados_config["quantum"])
+
+    # De volta à ordem do arquivo
+    primeira_execucao = np.empty_like(inicio)
+    primeira_execucao[ordem] = inicio
+    termino_arquivo = np.empty_like(termino)
+    termino_arquivo[ordem] = termino
+    return {
+        "ids": [tarefa.id for tarefa in tarefas],
+        "ingresso": ingresso_arquivo,
+        "duracao": duracao_arquivo,
+        "primeira_execucao": primeira_execucao,
+        "termino": termino_arquivo,
+        "espera": termino_arquivo - ingresso_arquivo - duracao_arquivo,
+        "relogio_final": int(termino.max()) if len(tarefas) else 0,
+        "trocas_de_contexto": trocas,
+    }
+
+
+def _resultado_simulacao(so: SistemaOperacional) -> dict:
+    """Mesmo formato de resolver_vetorial, a partir de uma simulação terminada (listas em vez de arrays)."""
+    termino = [tarefa.intervalos_execucao[-1][1] if tarefa in so.conjunto_finalizadas else None for tarefa in so.tarefas]
+    return {
+        "ids": [tarefa.id for tarefa in so.tarefas],
+        "ingresso": [tarefa.ingresso for tarefa in so.tarefas],
+        "duracao": [tarefa.duracao for tarefa in so.tarefas],
+        "primeira_execucao": [tarefa.intervalos_execucao[0][0] if tarefa.intervalos_execucao else None for tarefa in so.tarefas],
+        "termino": termino,
+        "espera": [None if fim is None else fim - tarefa.ingresso - tarefa.tempo_executado
+                   for tarefa, fim in zip(so.tarefas, termino)],
+        "relogio_final": so.relogio,
+        "trocas_de_contexto": sum(len(tarefa.intervalos_execucao) for tarefa in so.tarefas),
+    }
+
+
+def resolver(dados_config: dict, semente: int | None = None) -> dict:
+    """
+    Resolve por vetores quando a configuração se qualifica; senão simula com o SistemaOperacional (que passa a ser
+    o dono das tarefas). O campo "vetorial" indica qual caminho foi usado.
+    """
+    if motivo_nao_qualifica(dados_config) is None:
+        return {**resolver_vetorial(dados_config), "vetorial": True}
+    with registro.silenciado():
+        so = SistemaOperacional(dados_config, semente=semente)
+        so.run_to_completion()
+    return {**_resultado_simulacao(so), "vetorial": False}
+
+
+def verificar(config_file: str) -> list[str]:
+    """Compara a solução vetorizada com a simulação tick a tick (executar_tick); retorna as diferenças encontradas."""
+    with registro.silenciado():
+        vetorial = resolver_vetorial(read_config(config_file))
+        so = SistemaOperacional(read_config(config_file))
+        while not so.simulacao_terminada():
+            so.executar_tick()
+    simulado = _resultado_simulacao(so)
+
+    diferencas = []
+    for campo in ("primeira_execucao", "termino", "espera"):
+        for id_tarefa, valor_vetorial, valor_simulado in zip(vetorial["ids"], vetorial[campo].tolist(), simulado[campo]):
+            if valor_vetorial != valor_simulado:
+                diferencas.append(f"{id_tarefa}: {campo} {valor_vetorial} (vetorial) != {valor_simulado} (simulação)")
+    for campo in ("relogio_final", "trocas_de_contexto"):
+        if vetorial[campo] != simulado[campo]:
+            diferencas.append(f"{campo} {vetorial[campo]} (vetorial) != {simulado[campo]} (simulação)")
+    return diferencas
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Resolve por vetores (NumPy) uma configuração sem eventos com FIFO, RR ou SRTF.")
+    parser.add_argument("arquivo", help="arquivo de configuração")
+    parser.add_argument("--verificar", action="store_true", help="compara com a simulação tick a tick")
+    args = parser.parse_args(argv)
+
+    try:
+        with registro.silenciado():
+            dados_config = read_config(args.arquivo)
+    except Exception as e:
+        print(f"Erro ao ler {args.arquivo}: {e}", file=sys.stderr)
+        return 1
+
+    motivo = motivo_nao_qualifica(dados_config)
+    if args.verificar:
+        if motivo is not None:
+            print(f"{args.arquivo}: não se qualifica ({motivo})", file=sys.stderr)
+            return 1
+        diferencas = verificar(args.arquivo)
+        for diferenca in diferencas:
+            print(diferenca)
+        print(f"{args.arquivo}: {'OK' if not diferencas else f'{len(diferencas)} diferenças'}")
+        return 1 if diferencas else 0
+
+    resultado = resolver(dados_config)
+    if motivo is not None:
+        print(f"Usando a simulação: {motivo}", file=sys.stderr)
+    espera = [valor for valor in resultado["espera"] if valor is not None]
+    json.dump({
+        "vetorial": resultado["vetorial"],
+        "relogio_final": resultado["relogio_final"],
+        "trocas_de_contexto": resultado["trocas_de_contexto"],
+        "espera_media": sum(espera) / len(espera) if espera else None,
+    }, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# Saída em texto das ferramentas de linha de comando (varredura, monte_carlo, multinucleo)
+#
+# Tabelas alinhadas à direita, com a largura de cada coluna ajustada ao maior valor, e a leitura das listas de
+# inteiros com intervalos usadas nas opções (--quantums 1-10 16, --nucleos 1-8).
+
+def inteiros(valores: list[str]) -> list[int]:
+    """Lê uma lista de inteiros que aceita intervalos: ["1-4", "8"] -> [1, 2, 3, 4, 8]."""
+    resultado = []
+    for valor in valores:
+        inicio, _, fim = valor.partition("-")
+        if fim:
+            resultado.extend(range(int(inicio), int(fim) + 1))
+        else:
+            resultado.append(int(inicio))
+    return resultado
+
+
+def formatar(valor) -> str:
+    if valor is None:
+        return "-"
+    if isinstance(valor, float):
+        return f"{valor:.3f}"
+    return str(valor)
+
+
+def escrever_tabela(cabecalho: list[str], linhas: list[list], saida):
+    """Escreve o cabeçalho e as linhas (valores formatados com formatar) em colunas alinhadas."""
+    linhas = [[formatar(valor) for valor in linha] for linha in linhas]
+    larguras = [max([len(campo)] + [len(linha[i]) for linha in linhas]) for i, campo in enumerate(cabecalho)]
+    saida.write("  ".join(campo.rjust(largura) for campo, largura in zip(cabecalho, larguras)) + "\n")
+    for linha in linhas:
+        saida.write("  ".join(valor.rjust(largura) for valor, largura in zip(linha, larguras)) + "\n")
@@ -6,28 +6,113 @@
 # - Tempo de ingresso
 # - Duração total
 # - Prioridade
-# - Uma lista com os momentos que a tarefa foi executada
+# - Os intervalos de tempo em que a tarefa foi executada
 # - Lista de Eventos
 
-from typing import TypedDict
+# TCB e Evento são registros compactos (__slots__): cada campo ocupa um ponteiro, sem dicionário por instância,
+# e o motor acessa os campos como atributos (tarefa.duracao). RegistroSlots mantém o acesso no estilo
+# dicionário (tarefa["duracao"], tarefa.get(...), "campo" in tarefa) usado pela interface gráfica.
 
+from bisect import bisect_right
 
-class Evento(TypedDict):
-    tipo: str  # "IO", "ML" (Mutex Lock), "MU" (Mutex Unlock)
-    inicio: int
-    duracao: int  # Para IO; para ML/MU é 0
-    tempo_restante: int  # Para IO; para ML/MU é 0
-    mutex_id: int  # ID do mutex (apenas para ML e MU)
 
-class TCB(TypedDict):
-    id: str
-    cor: str
-    ingresso: int
-    duracao: int
-    prioridade: int
-    prioridade_dinamica: int
-    tempo_restante: int
-    tempos_de_execucao: list[int]
-    lista_eventos: list[Evento]  # Lista de dicionários (tipo, inicio, duracao)
-    evento_io_ativo: Evento | None  # Evento de I/O atualmente em processamento
+class RegistroSlots:
+    __slots__ = ()
 
+    def __getitem__(self, campo: str):
+        if campo not in type(self).__slots__:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo: str, valor):
+        if campo not in type(self).__slots__:
+            raise KeyError(campo)
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo: str) -> bool:
+        return campo in type(self).__slots__
+
+    def get(self, campo: str, padrao=None):
+        if campo not in type(self).__slots__:
+            return padrao
+        return getattr(self, campo)
+
+    def keys(self):
+        return type(self).__slots__
+
+    def __repr__(self) -> str:
+        # Mesma representação de um dicionário, como quando TCB e Evento eram TypedDict
+        return repr({campo: getattr(self, campo) for campo in type(self).__slots__})
+
+
+class Evento(RegistroSlots):
+    __slots__ = ("tipo", "inicio", "duracao", "tempo_restante", "mutex_id")
+
+    def __init__(self, tipo: str, inicio: int, duracao: int = 0, tempo_restante: int | None = None, mutex_id: int = -1):
+        self.tipo = tipo  # "IO", "ML" (Mutex Lock), "MU" (Mutex Unlock)
+        self.inicio = inicio
+        self.duracao = duracao  # Para IO; para ML/MU é 0
+        self.tempo_restante = duracao if tempo_restante is None else tempo_restante  # Para IO; para ML/MU é 0
+        self.mutex_id = mutex_id  # ID do mutex (apenas para ML e MU)
+
+
+class TCB(RegistroSlots):
+    __slots__ = ("id", "cor", "ingresso", "duracao", "prioridade", "prioridade_dinamica", "epoca_envelhecimento",
+                 "tempo_restante", "intervalos_execucao", "tempo_executado", "lista_eventos", "indice_proximo_evento",
+                 "evento_io_ativo", "tempo_bloqueado_io", "tempo_bloqueado_mutex", "inicio_bloqueio",
+                 "nucleos_execucao")
+
+    def __init__(self, id: str, cor: str, ingresso: int, duracao: int, prioridade: int,
+                 prioridade_dinamica: int | None = None, epoca_envelhecimento: int | None = None,
+                 tempo_restante: int | None = None, lista_eventos: list[Evento] | None = None,
+                 indice_proximo_evento: int = 0, evento_io_ativo: Evento | None = None):
+        self.id = id
+        self.cor = cor
+        self.ingresso = ingresso
+        self.duracao = duracao
+        self.prioridade = prioridade
+        self.prioridade_dinamica = prioridade if prioridade_dinamica is None else prioridade_dinamica
+        self.epoca_envelhecimento = epoca_envelhecimento  # Época do escalonador em que a tarefa começou a envelhecer (None se não está esperando)
+        self.tempo_restante = duracao if tempo_restante is None else tempo_restante
+        self.intervalos_execucao: list[list[int]] = []  # Trechos [inicio, fim) em que a tarefa executou, em ordem
+        self.tempo_executado = 0  # Total de ticks executados (soma dos intervalos)
+        self.lista_eventos = [] if lista_eventos is None else lista_eventos  # Ordenada por inicio
+        self.indice_proximo_evento = indice_proximo_evento  # Cursor em lista_eventos: primeiro evento que ainda pode ocorrer
+        self.evento_io_ativo = evento_io_ativo  # Evento de I/O atualmente em processamento
+        self.tempo_bloqueado_io = 0  # Ticks bloqueada em I/O (bloqueios já encerrados; ver metricas.py)
+        self.tempo_bloqueado_mutex = 0  # Ticks bloqueada aguardando mutex (bloqueios já encerrados)
+        self.inicio_bloqueio: int | None = None  # Tick em que começou o bloqueio atual (None se não está bloqueada)
+        self.nucleos_execucao: list[int] = []  # Núcleo de cada intervalo de execução (só na simulação multinúcleo)
+
+    def registrar_execucao(self, tempo: int, n_ticks: int = 1, nucleo: int | None = None):
+        """
+        Registra que a tarefa executou nos ticks [tempo, tempo + n_ticks), estendendo o último intervalo se for contíguo.
+        Com nucleo (simulação multinúcleo), um intervalo só é estendido se continuar no mesmo núcleo.
+        """
+        if (self.intervalos_execucao and self.intervalos_execucao[-1][1] == tempo
+                and (nucleo is None or self.nucleos_execucao[-1] == nucleo)):
+            self.intervalos_execucao[-1][1] += n_ticks
+        else:
+            self.intervalos_execucao.append([tempo, tempo + n_ticks])
+            if nucleo is not None:
+                self.nucleos_execucao.append(nucleo)
+        self.tempo_executado += n_ticks
+
+    def executou_em(self, tempo: int) -> bool:
+        """Indica se a tarefa executou no tick tempo (busca binária nos intervalos)."""
+        indice = bisect_right(self.intervalos_execucao, tempo, key=lambda intervalo: intervalo[0]) - 1
+        return indice >= 0 and tempo < self.intervalos_execucao[indice][1]
+
+    def ultimo_tick_executado(self) -> int | None:
+        if not self.intervalos_execucao:
+            return None
+        return self.intervalos_execucao[-1][1] - 1
+
+    def ultimos_ticks(self, n: int) -> list[int]:
+        """Os últimos n ticks em que a tarefa executou, em ordem crescente."""
+        ticks = []
+        for inicio, fim in reversed(self.intervalos_execucao):
+            ticks[:0] = range(max(inicio, fim - (n - len(ticks))), fim)
+            if len(ticks) >= n:
+                break
+        return ticks
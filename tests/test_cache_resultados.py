@@ -0,0 +1,40 @@
+# O total do cache é mantido a cada gravação: a pasta só é percorrida na primeira gravação do processo e quando o
+# total passa do limite, e o despejo deixa o cache abaixo do limite.
+
+import cache_resultados
+from cache_resultados import FRACAO_APOS_DESPEJO, CacheResultados
+
+
+def _total_real(cache: CacheResultados) -> int:
+    return sum(tamanho for _, tamanho, _ in cache.entradas())
+
+
+def test_gravacao_nao_percorre_a_pasta(tmp_path, monkeypatch):
+    varreduras = []
+    entradas = CacheResultados.entradas
+    monkeypatch.setattr(CacheResultados, "entradas", lambda self: varreduras.append(1) or entradas(self))
+    for i in range(50):
+        cache = CacheResultados(str(tmp_path), limite_bytes=10 ** 9)  # Uma instância por arquivo, como o lote
+        cache.guardar(f"{i:064x}", {"valor": i}, apelido=f"apelido{i}")
+    assert len(varreduras) == 1
+    assert cache.total_bytes() == _total_real(cache)
+
+
+def test_despejo_respeita_o_limite(tmp_path):
+    limite = 4000
+    for i in range(200):
+        cache = CacheResultados(str(tmp_path), limite_bytes=limite)
+        cache.guardar(f"{i:064x}", {"valor": "x" * 100}, apelido=f"apelido{i}")
+        assert _total_real(cache) <= limite
+        assert cache.total_bytes() == _total_real(cache)
+    assert _total_real(cache) > limite * FRACAO_APOS_DESPEJO - 200
+    assert cache.buscar(f"{199:064x}") == {"valor": "x" * 100}
+
+
+def test_remover_desconta_do_total(tmp_path):
+    cache = CacheResultados(str(tmp_path))
+    cache.guardar("a" * 64, {"valor": 1}, inicial=b"estado")
+    cache.remover("a" * 64)
+    assert cache.total_bytes() == 0
+    cache_resultados._totais.clear()
+    assert cache.total_bytes() == 0
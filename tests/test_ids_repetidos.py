@@ -0,0 +1,60 @@
+# O arquivo de configuração pode repetir o id de uma tarefa: as filas e índices do motor identificam a tarefa
+# pela TCB, então as duas tarefas são escalonadas separadamente, também depois de copiar o estado (histórico).
+
+import pickle
+
+import pytest
+
+import registro
+from escalonador import Escalonador
+from multinucleo import SistemaMultinucleo
+from sistema_operacional import SistemaOperacional
+
+ALGORITMOS = list(Escalonador("fifo").algoritmos_disponiveis)
+
+
+def _linhas(algoritmo: str) -> list[str]:
+    return [
+        f"{algoritmo};2;1",
+        "A;FF0000;0;3;1;IO:01-02",
+        "A;00FF00;1;2;2;ML01:01;MU01:02",
+        "B;0000FF;1;4;3;ML01:01;IO:02-01;MU01:03",
+        "A;FFFF00;1;3;2;IO:01-02",
+    ]
+
+
+def _verificar_fim(so: SistemaOperacional):
+    assert so.simulacao_terminada()
+    tarefas = {id(tarefa): tarefa for tarefa in list(so.tarefas) + list(so.tarefas_finalizadas)}.values()
+    assert len(tarefas) == 4
+    for tarefa in tarefas:
+        assert sum(fim - inicio for inicio, fim in tarefa.intervalos_execucao) == tarefa.duracao
+
+
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_ids_repetidos(algoritmo):
+    with registro.silenciado():
+        so = SistemaOperacional(_linhas(algoritmo), semente=0)
+        so.run_until(3)
+        so = pickle.loads(pickle.dumps(so))
+        so.run_until(100)
+    _verificar_fim(so)
+
+
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_estado_das_tarefas_com_ids_repetidos(algoritmo):
+    with registro.silenciado():
+        so = SistemaOperacional(_linhas(algoritmo), semente=0)
+        while not so.simulacao_terminada() and so.relogio < 100:
+            so.executar_tick()
+            finalizadas = [tarefa for tarefa in so.tarefas if so.get_estado_tarefa(tarefa) == "FINALIZADA"]
+            assert finalizadas == [tarefa for tarefa in so.tarefas if tarefa in so.tarefas_finalizadas]
+    _verificar_fim(so)
+
+
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_ids_repetidos_multinucleo(algoritmo):
+    with registro.silenciado():
+        so = SistemaMultinucleo(_linhas(algoritmo), n_nucleos=2, semente=0)
+        so.run_until(100)
+    _verificar_fim(so)
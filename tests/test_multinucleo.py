@@ -0,0 +1,69 @@
+# Com um único núcleo, SistemaMultinucleo tem de escalonar exatamente como o SistemaOperacional,
+# para todos os algoritmos e com eventos de I/O e mutex (a linha "1 núcleo" da tabela de capacidade é a referência).
+
+import glob
+import os
+
+import pytest
+
+import registro
+from escalonador import Escalonador
+from gerador_carga import ParametrosCarga, linhas_carga
+from multinucleo import SistemaMultinucleo
+from sistema_operacional import SistemaOperacional
+
+ALGORITMOS = list(Escalonador("fifo").algoritmos_disponiveis)
+LIMITE_TICKS = 5000  # Algumas cargas com mutex nunca terminam; as duas simulações param no mesmo tick
+PASTA_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CARGA = ParametrosCarga(n_tarefas=30, quantum=3, alpha=2, taxa_chegada=0.3, densidade_io=0.15, duracao_io_max=4,
+                        n_mutexes=2, fracao_mutex=0.4, contencao="concentrada")
+
+
+def _intervalos(so: SistemaOperacional) -> dict:
+    return {tarefa.id: [list(intervalo) for intervalo in tarefa.intervalos_execucao] for tarefa in so.tarefas}
+
+
+def _comparar(linhas: list[str], semente: int):
+    with registro.silenciado():
+        so = SistemaOperacional(linhas, semente=semente)
+        so.run_until(LIMITE_TICKS)
+        multinucleo = SistemaMultinucleo(linhas, n_nucleos=1, semente=semente)
+        multinucleo.run_until(LIMITE_TICKS)
+    assert _intervalos(multinucleo) == _intervalos(so)
+    assert multinucleo.relogio == so.relogio
+    assert multinucleo.ticks_com_sorteio == so.ticks_com_sorteio
+
+
+@pytest.mark.parametrize("semente", range(6))
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_carga_gerada(algoritmo, semente):
+    _comparar(list(linhas_carga(CARGA._replace(algoritmo=algoritmo), semente)), semente)
+
+
+@pytest.mark.parametrize("algoritmo", ALGORITMOS)
+def test_arquivos_do_repositorio(algoritmo):
+    for caminho in sorted(glob.glob(os.path.join(PASTA_RAIZ, "caso-teste-*.txt")) + glob.glob(os.path.join(PASTA_RAIZ, "config_*.txt"))):
+        with open(caminho) as arquivo:
+            linhas = arquivo.readlines()
+        cabecalho = linhas[0].split(";")
+        if len(cabecalho) < 2:
+            continue  # Arquivo de exemplo com formato inválido
+        cabecalho[0] = algoritmo
+        _comparar([";".join(cabecalho)] + linhas[1:], semente=0)
+
+
+def test_bloqueada_em_mutex_envelhece_na_fila_do_seu_nucleo():
+    # A ingressa no núcleo 1 e bloqueia no mutex de B no tick 1; acorda no tick 3, na fila do núcleo 0. Enquanto esperava,
+    # o núcleo 1 só executou no tick 2 (C) e o núcleo 0 executou B nos ticks 1 e 2: A acorda com prioridade 3 + 1 = 4,
+    # não 5, e no tick 4 perde para B (mesma prioridade dinâmica, maior prioridade estática).
+    linhas = ["priopenv;2;1", "A;FF0000;1;6;3;ML01:01;MU01:02", "B;00FF00;0;5;4;ML01:02;MU01:04", "C;0000FF;2;5;1"]
+    with registro.silenciado():
+        so = SistemaMultinucleo(linhas, n_nucleos=2, semente=0)
+        so.run_until(LIMITE_TICKS)
+    assert so.simulacao_terminada()
+    assert {tarefa.id: tarefa.intervalos_execucao for tarefa in so.tarefas} == {
+        "A": [[5, 11]],
+        "B": [[0, 5]],
+        "C": [[2, 7]],
+    }
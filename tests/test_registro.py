@@ -0,0 +1,37 @@
+# As execuções em processo único (jobs=1) de varredura e monte_carlo silenciam o registro só durante a chamada:
+# a configuração do processo que chamou (impressão e buffer) fica como estava.
+
+import pytest
+
+import registro
+from monte_carlo import monte_carlo
+from varredura import varrer
+
+CONFIG = "srtf;2\nA;FF0000;0;3;1\nB;00FF00;0;3;1\nC;0000FF;1;2;1\n"  # Empate no SRTF: há sorteio
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    caminho = tmp_path / "config.txt"
+    caminho.write_text(CONFIG)
+    yield str(caminho)
+    registro.configurar()
+
+
+def _estado():
+    return registro._imprimir, registro._buffer is not None, dict(registro._limiares)
+
+
+def test_varrer_restaura_registro(config_file):
+    registro.configurar(tamanho_buffer=10)
+    antes = _estado()
+    varrer(config_file, ["fifo", "srtf"], [2], [1], jobs=1, vetorial=False)
+    assert _estado() == antes
+
+
+def test_monte_carlo_restaura_registro(config_file):
+    registro.configurar(tamanho_buffer=10)
+    antes = _estado()
+    resultado = monte_carlo(config_file, list(range(8)), jobs=1)
+    assert resultado["tick_primeiro_sorteio"] is not None  # Passou pelo caminho com sorteio
+    assert _estado() == antes
@@ -0,0 +1,58 @@
+# A solução vetorizada (usada por padrão pela varredura) tem de dar o mesmo resultado que a simulação tick a tick
+# (executar_tick) em cargas geradas de FIFO, RR e SRTF sem eventos, e a mesma linha na tabela da varredura.
+
+import math
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import registro
+from config_handler import read_config
+from gerador_carga import ParametrosCarga, linhas_carga
+from sistema_operacional import SistemaOperacional
+from solucao_vetorial import motivo_nao_qualifica, verificar
+from varredura import metricas_simulacao, metricas_vetoriais
+
+CARGAS = [
+    ParametrosCarga(n_tarefas=60, taxa_chegada=0.3),
+    ParametrosCarga(n_tarefas=60, taxa_chegada=1.5, duracao="exponencial", duracao_media=4.0),
+    ParametrosCarga(n_tarefas=60, chegada="rajadas", taxa_chegada=0.4, tamanho_rajada=6.0, duracao_max=30),
+]
+
+
+def _verificar_carga(linhas: list[str]):
+    if motivo_nao_qualifica(read_config(linhas)) is not None:
+        return False
+    assert verificar(linhas) == []
+    with registro.silenciado():
+        so = SistemaOperacional(linhas)
+        so.run_to_completion()
+    simulada, vetorial = metricas_simulacao(so), metricas_vetoriais(read_config(linhas))
+    assert simulada.keys() == vetorial.keys()
+    for campo, valor in simulada.items():
+        if isinstance(valor, float):
+            assert math.isclose(vetorial[campo], valor), campo
+        else:
+            assert vetorial[campo] == valor, campo
+    return True
+
+
+@pytest.mark.parametrize("indice_carga", range(len(CARGAS)))
+@pytest.mark.parametrize("algoritmo, quantum", [("fifo", 1), ("fifo", 100), ("rr", 1), ("rr", 2), ("rr", 5), ("srtf", 1)])
+def test_vetorial_igual_a_simulacao(algoritmo, quantum, indice_carga):
+    parametros = CARGAS[indice_carga]._replace(algoritmo=algoritmo, quantum=quantum)
+    if algoritmo == "srtf":
+        # Durações bem espalhadas, para que poucas tarefas repitam (ingresso, duração) e a carga se qualifique
+        parametros = parametros._replace(duracao="uniforme", duracao_max=400)
+    resolvidas = 0
+    for semente in range(8):
+        linhas = list(linhas_carga(parametros, semente))
+        resolvidas += _verificar_carga(linhas)
+
+        # A mesma carga com as tarefas fora da ordem de ingresso no arquivo
+        tarefas = linhas[1:]
+        random.Random(semente).shuffle(tarefas)
+        resolvidas += _verificar_carga(linhas[:1] + tarefas)
+    assert resolvidas > 0  # Pelo menos uma carga se qualificou
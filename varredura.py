@@ -0,0 +1,209 @@
+# Varredura de parâmetros do escalonador
+#
+# Simula o mesmo conjunto de tarefas em cada combinação de algoritmo x quantum x alpha e monta uma tabela
+# com métricas agregadas por combinação, para escolher o quantum (ou o alpha) de uma carga sem editar
+# o arquivo e rodar a interface à mão a cada tentativa.
+#
+# O arquivo é lido uma única vez. As tarefas vão serializadas (pickle) para cada processo do pool uma vez,
+# no inicializador; cada combinação só recebe (algoritmo, quantum, alpha) e desserializa uma cópia nova das tarefas.
+# Cargas sem eventos com FIFO, RR ou SRTF são resolvidas por vetores (solucao_vetorial.py, exige NumPy), com o mesmo resultado.
+#
+# Uso:
+#   python varredura.py config_livro_rr.txt --quantums 1-8 --algoritmos rr priopenv --alphas 1 2 --jobs 4
+#   python varredura.py carga.txt --quantums 2 4 8 --formato csv --saida varredura.csv --ordenar-por retorno_medio
+
+import argparse
+import csv
+import json
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import registro
+import solucao_vetorial
+import tabela_texto
+from config_handler import read_config
+from escalonador import Escalonador
+from sistema_operacional import SistemaOperacional
+
+# Os nomes e as definições das métricas são os de metricas.py (SistemaOperacional.get_metricas), os mesmos do lote e do
+# monte_carlo: espera_prontas_media é só a espera na fila de prontas, sem os bloqueios em I/O e mutex
+CAMPOS_METRICAS = ["algoritmo", "quantum", "alpha", "relogio_final", "terminou", "tarefas_concluidas",
+                   "retorno_medio", "retorno_max", "espera_prontas_media", "bloqueado_io_medio", "bloqueado_mutex_medio",
+                   "resposta_media", "trocas_de_contexto", "ticks_ociosos", "utilizacao_cpu", "vazao", "ticks_com_sorteio"]
+
+_tarefas_serializadas: bytes | None = None  # Conjunto de tarefas do processo (ver _iniciar_processo)
+
+
+def _guardar_tarefas(tarefas_serializadas: bytes):
+    global _tarefas_serializadas
+    _tarefas_serializadas = tarefas_serializadas
+
+
+def _iniciar_processo(tarefas_serializadas: bytes):
+    """
+    Inicializador do pool: guarda as tarefas serializadas uma vez por processo e desliga o registro.
+    Só para os processos do pool: desligar muda a configuração do registro de vez, e no processo que chamou
+    varrer basta o registro.silenciado().
+    """
+    _guardar_tarefas(tarefas_serializadas)
+    registro.desligar()
+
+
+def metricas_simulacao(so: SistemaOperacional) -> dict:
+    """Linha da tabela para uma simulação terminada, a partir das métricas incrementais do sistema operacional (em O(1))."""
+    metricas = so.get_metricas()
+    linha = {
+        "algoritmo": so.nome_escalonador,
+        "quantum": so.quantum,
+        "alpha": so.alpha,
+        "relogio_final": so.relogio,
+        "terminou": so.simulacao_terminada(),
+        "vazao": metricas["tarefas_concluidas"] / so.relogio if so.relogio else None,
+        "ticks_com_sorteio": len(so.ticks_com_sorteio),
+    }
+    return {campo: linha[campo] if campo in linha else metricas[campo] for campo in CAMPOS_METRICAS}
+
+
+def metricas_vetoriais(dados_config: dict) -> dict:
+    """As mesmas métricas de metricas_simulacao, a partir da solução vetorizada (todas as tarefas terminam, sem sorteios nem bloqueios)."""
+    resultado = solucao_vetorial.resolver_vetorial(dados_config)
+    n_tarefas = len(resultado["ids"])
+    relogio = resultado["relogio_final"]
+    retornos = resultado["termino"] - resultado["ingresso"]
+    executados = int(resultado["duracao"].sum())
+    return {
+        "algoritmo": dados_config["nome_escalonador"],
+        "quantum": dados_config["quantum"],
+        "alpha": dados_config["alpha"],
+        "relogio_final": relogio,
+        "terminou": True,
+        "tarefas_concluidas": n_tarefas,
+        "retorno_medio": float(retornos.mean()) if n_tarefas else None,
+        "retorno_max": int(retornos.max()) if n_tarefas else None,
+        "espera_prontas_media": float(resultado["espera"].mean()) if n_tarefas else None,
+        "bloqueado_io_medio": 0.0 if n_tarefas else None,
+        "bloqueado_mutex_medio": 0.0 if n_tarefas else None,
+        "resposta_media": float((resultado["primeira_execucao"] - resultado["ingresso"]).mean()) if n_tarefas else None,
+        "trocas_de_contexto": resultado["trocas_de_contexto"],
+        "ticks_ociosos": relogio - executados,
+        "utilizacao_cpu": executados / relogio if relogio else None,
+        "vazao": n_tarefas / relogio if relogio else None,
+        "ticks_com_sorteio": 0,
+    }
+
+
+def _simular_ponto(ponto: tuple[str, int, int], semente: int | None, limite_ticks: int | None, vetorial: bool = True) -> dict:
+    """Simula uma combinação (algoritmo, quantum, alpha) com uma cópia nova das tarefas do processo."""
+    algoritmo, quantum, alpha = ponto
+    dados_config = {
+        "nome_escalonador": algoritmo,
+        "quantum": quantum,
+        "alpha": alpha,
+        "tarefas": pickle.loads(_tarefas_serializadas),
+    }
+    if vetorial and limite_ticks is None and solucao_vetorial.motivo_nao_qualifica(dados_config) is None:
+        return metricas_vetoriais(dados_config)
+    try:
+        so = SistemaOperacional(dados_config, semente=semente)
+        if limite_ticks is None:
+            so.run_to_completion()
+        else:
+            so.run_until(limite_ticks)
+    except Exception as e:
+        return {"algoritmo": algoritmo, "quantum": quantum, "alpha": alpha, "erro": str(e)}
+    return metricas_simulacao(so)
+
+
+def varrer(config_file: str, algoritmos, quantums, alphas, jobs: int = 1, semente: int | None = None,
+           limite_ticks: int | None = None, vetorial: bool = True) -> list[dict]:
+    """
+    Simula as tarefas de config_file em cada combinação de algoritmos x quantums x alphas (o cabeçalho do arquivo
+    é ignorado) e retorna as métricas de cada uma, na ordem das combinações.
+    limite_ticks interrompe simulações que não terminam sozinhas (ex.: tarefas presas em mutex).
+    vetorial=False força a simulação mesmo nas combinações que a solução vetorizada resolveria.
+    """
+    with registro.silenciado():
+        tarefas = read_config(config_file)["tarefas"]
+    tarefas_serializadas = pickle.dumps(tarefas, pickle.HIGHEST_PROTOCOL)
+
+    pontos = list(product(algoritmos, quantums, alphas))
+    sementes = [semente] * len(pontos)
+    limites = [limite_ticks] * len(pontos)
+    vetoriais = [vetorial] * len(pontos)
+    if jobs > 1 and len(pontos) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_iniciar_processo, initargs=(tarefas_serializadas,)) as executor:
+            chunksize = max(1, len(pontos) // (jobs * 4))
+            return list(executor.map(_simular_ponto, pontos, sementes, limites, vetoriais, chunksize=chunksize))
+
+    with registro.silenciado():
+        _guardar_tarefas(tarefas_serializadas)
+        return [_simular_ponto(*argumentos) for argumentos in zip(pontos, sementes, limites, vetoriais)]
+
+
+def escrever_tabela(resultados: list[dict], saida):
+    """Tabela de texto alinhada, uma linha por combinação."""
+    campos = CAMPOS_METRICAS + (["erro"] if any("erro" in resultado for resultado in resultados) else [])
+    tabela_texto.escrever_tabela(campos, [[resultado.get(campo) for campo in campos] for resultado in resultados], saida)
+
+
+def main(argv=None) -> int:
+    algoritmos_disponiveis = list(Escalonador("fifo").algoritmos_disponiveis)
+
+    parser = argparse.ArgumentParser(description="Simula um conjunto de tarefas em cada combinação de algoritmo, quantum e alpha.")
+    parser.add_argument("arquivo", help="arquivo de configuração com as tarefas (o cabeçalho é ignorado)")
+    parser.add_argument("--algoritmos", nargs="+", choices=algoritmos_disponiveis, default=algoritmos_disponiveis)
+    parser.add_argument("--quantums", nargs="+", default=["1-10"], help="valores de quantum; aceita intervalos (ex.: 1-10 16 32)")
+    parser.add_argument("--alphas", nargs="+", default=["1"], help="valores de alpha; aceita intervalos")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="processos em paralelo")
+    parser.add_argument("--semente", type=int, help="semente dos sorteios de desempate")
+    parser.add_argument("--limite-ticks", type=int, help="interrompe cada simulação neste tick")
+    parser.add_argument("--sem-vetorial", action="store_true", help="simula todas as combinações, sem a solução vetorizada")
+    parser.add_argument("--ordenar-por", choices=CAMPOS_METRICAS, help="ordena a tabela por esta métrica")
+    parser.add_argument("--formato", choices=["tabela", "csv", "json"], default="tabela")
+    parser.add_argument("--saida", "-o", help="arquivo de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    try:
+        quantums, alphas = tabela_texto.inteiros(args.quantums), tabela_texto.inteiros(args.alphas)
+    except ValueError:
+        parser.error("--quantums e --alphas aceitam inteiros ou intervalos como 1-10")
+    if any(quantum < 1 for quantum in quantums):
+        parser.error("o quantum deve ser pelo menos 1")
+
+    if not args.sem_vetorial and solucao_vetorial.np is None and set(args.algoritmos) & {"fifo", "rr", "srtf"}:
+        print("NumPy não está instalado: as combinações sem eventos serão simuladas, sem a solução vetorizada "
+              "(pip install numpy)", file=sys.stderr)
+
+    try:
+        resultados = varrer(args.arquivo, args.algoritmos, quantums, alphas, jobs=args.jobs,
+                            semente=args.semente, limite_ticks=args.limite_ticks, vetorial=not args.sem_vetorial)
+    except Exception as e:
+        print(f"Erro ao ler {args.arquivo}: {e}", file=sys.stderr)
+        return 1
+
+    if args.ordenar_por:
+        # Resultados sem a métrica (erro ou nenhuma tarefa concluída) vão para o fim
+        resultados.sort(key=lambda resultado: (resultado.get(args.ordenar_por) is None, resultado.get(args.ordenar_por) or 0))
+
+    saida = open(args.saida, "w", newline="", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        if args.formato == "json":
+            json.dump(resultados, saida, ensure_ascii=False, indent=2)
+            saida.write("\n")
+        elif args.formato == "csv":
+            writer = csv.DictWriter(saida, fieldnames=CAMPOS_METRICAS + ["erro"])
+            writer.writeheader()
+            writer.writerows(resultados)
+        else:
+            escrever_tabela(resultados, saida)
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+    return 1 if any("erro" in resultado for resultado in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())